@@ -0,0 +1,39 @@
+# Benchmark of the batched setters against the per-element wrapping functions
+#
+# usage: python benchmark-setters.py [number of columns]
+
+import sys, time
+import numpy
+from glpk import *
+
+def per_element(lp, n, lb, ub, coef):
+    for j in xrange(n):
+        glp_set_col_bnds(lp, j+1, GLP_DB, lb[j], ub[j])
+    for j in xrange(n):
+        glp_set_col_kind(lp, j+1, GLP_IV)
+    for j in xrange(n):
+        glp_set_obj_coef(lp, j+1, coef[j])
+
+def batched(lp, n, lb, ub, coef):
+    set_col_bounds(lp, None, GLP_DB, lb, ub)
+    set_col_kinds(lp, None, GLP_IV)
+    set_objective(lp, None, coef)
+
+if __name__ == '__main__':
+    n = len(sys.argv) > 1 and int(sys.argv[1]) or 500000
+    lb = numpy.random.rand(n)
+    ub = lb + numpy.random.rand(n)
+    coef = numpy.random.randn(n)
+
+    times = []
+    for name, func, args in (('per-element', per_element, (lb.tolist(), ub.tolist(), coef.tolist())),
+            ('batched', batched, (lb, ub, coef))):
+        lp = glp_create_prob()
+        glp_add_cols(lp, n)
+        start = time.time()
+        func(lp, n, *args)
+        times.append(time.time() - start)
+        assert glp_get_col_ub(lp, n) == ub[-1] and glp_get_obj_coef(lp, n) == coef[-1]
+        glp_delete_prob(lp)
+        print "%-12s %8.3f s for %d columns" % (name, times[-1], n)
+    print "speedup      %8.2fx" % (times[0]/times[1])
@@ -34,7 +34,9 @@ Availability
 Requirements
 ============
 
-There are two requirements. First, GLPK must be installed on your platform. ctypes-glpk detects the existence of GLPK by calling 'glpsol -v'. It uses the corresponding shared library of GLPK to provide the functionality. Second, you need package 'ctypes' installed on your Python, which is a built-in starting from Python 2.5.
+There are two requirements. First, GLPK must be installed on your platform. ctypes-glpk detects the existence of GLPK by calling 'glpsol -v'. It uses the corresponding shared library of GLPK to provide the functionality. Second, you need Python 2.7, which includes package 'ctypes'.
+
+The pythonic helpers at the end of the module (bulk array access, sensitivity analysis, etc.) additionally require NumPy. NumPy is optional: without it only these helpers are unavailable. If SciPy is installed, get_matrix() returns scipy.sparse matrices.
 
 Installation
 ============
@@ -45,6 +47,7 @@ Support
 -------
 
 - Platforms: Win32, Linux, and Mac OS
+- Python: 2.7
 - GLPK: 4.9 to 4.33
 
 How to use
@@ -56,6 +59,39 @@ See the 'sample.c' file for an example of using GLPK in C, and the 'sample.py' f
 Change Log
 ==========
 
+ctypes-glpk-0.3.0 development release
+-------------------------------------
+
+- Python 2.7 is now required (namedtuple, OrderedDict); Python 2.5 and 2.6 are no longer supported
+- Added sensitivity() to compute objective and bound ranging as NumPy arrays
+- Added check_kkt() and kkt_residuals() to run selected KKT checks over bulk-fetched arrays
+- Added ProblemData snapshots and MathProgCache to skip MathProg translation of known model/data pairs
+- Added mpl_read_data() to stream MathProg data from Python/NumPy objects through a pipe
+- Added intopt() to dispatch glp_intopt callbacks to plug-ins, and parallel_intopt() to solve subtrees in worker processes
+- Fixed glp_iocp_cback_func, which passed the tree by value instead of by pointer
+- Added ColumnGeneration, a column generation driver with batched column insertion and purging
+- Added Benders, a Benders decomposition engine with resident subproblem worker processes
+- Added LazyConstraints, a plug-in adding violated rows from a separator at GLP_IROWGEN
+- Added Heuristics, a plug-in running rounding, diving and feasibility pump heuristics at GLP_IHEUR
+- Added start solutions to intopt(), validated, repaired and completed by check_start()
+- Added PseudoCostBranching, a pseudo-cost/strong branching plug-in for GLP_IBRANCH
+- Added NodeSelection, a best-estimate/diving node selection plug-in for GLP_ISELECT
+- Added intopt_stream(), a generator of the incumbents found by a background solve
+- Added SolutionPool, collecting the k best distinct integer solutions of a search
+- Fixed a bug in defining glp_ios_add_row(), which lacked the type argument
+- Added Checkpoint, a plug-in saving the search progress, and resume()
+- Added presolve(), reducing a ProblemData before loading, with a basis-preserving Postsolve
+- Added scale(), computing geometric mean, equilibration or Curtis-Reid scale factors
+- Added analyze_conditioning(), reporting coefficient ranges and suspected big-M values
+- Added get_matrix(), reading the constraint matrix as a SciPy CSC/CSR/COO matrix
+- Added a modeling layer (Model, VarBlock, LinExpr) with array-backed expressions
+- Added RowStream, appending rows from an iterator in fixed-size chunks
+- Added batched setters set_row_bounds(), set_col_bounds(), set_col_kinds() and set_objective()
+- Added delete_rows() and delete_cols(), taking masks or number arrays and returning the remapping
+- Added RollingHorizon, re-solving sliding windows warm on a single problem object
+- Added ResultCache, returning cached results of identical problems and warm
+  starting problems with the same structure, and fingerprint()
+
 ctypes-glpk-0.2.4 release
 -------------------------
 
@@ -94,7 +130,20 @@ ctypes-glpk-0.1.0 development release
 # Importation
 #=============================================================================
 from ctypes import *
-import os, sys
+from collections import namedtuple
+import os, sys, time, hashlib, heapq, threading, Queue
+
+# NumPy is optional, it is only used by the pythonic helpers
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# SciPy is optional as well, get_matrix() returns scipy.sparse matrices with it
+try:
+    import scipy.sparse
+except ImportError:
+    scipy = None
 
 # Common declarations
 c_int_p = POINTER(c_int)
@@ -1398,7 +1447,7 @@ if _version >= (4, 20):
     class glp_tree(Structure):
         _fields_ = [('_tree', c_double),]
         
-    glp_iocp_cback_func = CFUNCTYPE(None, glp_tree, c_void_p)
+    glp_iocp_cback_func = CFUNCTYPE(None, POINTER(glp_tree), c_void_p)
 
     def GLP_IOCP_FIELDS():
         return [ # integer optimizer control parameters
@@ -2109,6 +2158,7 @@ if _version >= (4, 32):
         ('len', c_int, 1),
         ('ind', c_int_p, 1),
         ('val', c_double_p, 1),
+        ('type', c_int, 1),
         ('rhs', c_double, 1),
     )
 
@@ -2237,6 +2287,3639 @@ if _version >= (4, 23):
     )
     
         
+#=============================================================================
+# Bulk array helpers
+#=============================================================================
+# The pythonic helpers below move whole vectors between GLPK and NumPy.
+# Dense vectors are 0-based (entry j-1 belongs to column j), whereas lists of
+# row or column numbers keep GLPK's 1-based numbering.
+
+def _require_numpy():
+    if numpy is None:
+        raise ImportError("This routine requires NumPy, which could not be imported.")
+
+def _int_p(a, offset=0):
+    # pointer to a[offset] of a contiguous numpy.intc array
+    return cast(a.ctypes.data + offset*a.itemsize, c_int_p)
+
+def _double_p(a, offset=0):
+    # pointer to a[offset] of a contiguous numpy.float64 array
+    return cast(a.ctypes.data + offset*a.itemsize, c_double_p)
+
+def _is_integral(x, tol):
+    # which entries of x are within tol of an integer
+    return abs(x - numpy.floor(x + 0.5)) <= tol
+
+# Worker processes created by _fork_map() inherit this from the parent
+_fork_state = None
+
+def _fork_call(chunk):
+    func, state = _fork_state
+    return func(state, chunk)
+
+def _fork_map(func, state, chunks, processes=None):
+    # Evaluate func(state, chunk) for every chunk. With processes > 1 the work
+    # is spread over forked worker processes, which inherit state -- including
+    # GLPK problem pointers -- from the parent instead of having it pickled.
+    global _fork_state
+    if not processes or processes <= 1 or not hasattr(os, 'fork'):
+        return [func(state, chunk) for chunk in chunks]
+    import multiprocessing
+    _fork_state = (func, state)
+    pool = multiprocessing.Pool(processes)
+    try:
+        return pool.map(_fork_call, chunks)
+    finally:
+        pool.close()
+        pool.join()
+        _fork_state = None
+
+if _version >= (4, 16):
+    def _fetch(func, lp, count, dtype=float):
+        # gather func(lp, k) for k = 1..count into an array
+        return numpy.fromiter((func(lp, k) for k in xrange(1, count+1)), dtype, count)
+
+    def _fetch_bounds(lp, m, n):
+        # types and bounds of all m+n variables (rows first), where missing
+        # bounds are reported as -inf/+inf
+        t = numpy.concatenate((_fetch(glp_get_row_type, lp, m, numpy.intc),
+            _fetch(glp_get_col_type, lp, n, numpy.intc)))
+        lb = numpy.concatenate((_fetch(glp_get_row_lb, lp, m), _fetch(glp_get_col_lb, lp, n)))
+        ub = numpy.concatenate((_fetch(glp_get_row_ub, lp, m), _fetch(glp_get_col_ub, lp, n)))
+        lb[(t == GLP_FR) | (t == GLP_UP)] = -numpy.inf
+        ub[(t == GLP_FR) | (t == GLP_LO)] = numpy.inf
+        return t, lb, ub
+
+    def _bnd_type(lb, ub):
+        # GLPK bound type of lb <= x <= ub, missing bounds being -inf/+inf
+        if lb == -numpy.inf:
+            return ub == numpy.inf and GLP_FR or GLP_UP
+        if ub == numpy.inf:
+            return GLP_LO
+        return lb == ub and GLP_FX or GLP_DB
+
+    def _padded(a, dtype, shift=0):
+        # copy of a with a leading pad entry, for GLPK's 1-based arrays
+        out = numpy.empty(len(a)+1, dtype)
+        out[0] = 0
+        out[1:] = a
+        if shift:
+            out[1:] += shift
+        return out
+
+    def _add_cols_csc(lp, indptr, indices, data, cost=None, lb=0.0, ub=float('inf')):
+        # append len(indptr)-1 columns given in CSC form (0-based row indices)
+        # with a single glp_add_cols call, returning the first new number
+        k = len(indptr) - 1
+        if k <= 0:
+            return glp_get_num_cols(lp) + 1
+        first = glp_add_cols(lp, k)
+        indptr = numpy.asarray(indptr).tolist()
+        ind, val = _padded(indices, numpy.intc, 1), _padded(data, float)
+        set_mat_col = glp_set_mat_col
+        for c in xrange(k):
+            s = indptr[c]
+            set_mat_col(lp, first+c, indptr[c+1] - s, _int_p(ind, s), _double_p(val, s))
+        cols = numpy.arange(first, first+k)
+        _set_bounds(_raw_set_col_bnds, lp, cols, k, None, lb, ub)
+        if cost is not None:
+            set_objective(lp, cols, cost)
+        return first
+
+    def _add_rows_csr(lp, indptr, indices, data, lb=-float('inf'), ub=float('inf')):
+        # append len(indptr)-1 rows given in CSR form (0-based column indices)
+        # with a single glp_add_rows call, returning the first new number
+        k = len(indptr) - 1
+        if k <= 0:
+            return glp_get_num_rows(lp) + 1
+        first = glp_add_rows(lp, k)
+        indptr = numpy.asarray(indptr).tolist()
+        ind, val = _padded(indices, numpy.intc, 1), _padded(data, float)
+        set_mat_row = glp_set_mat_row
+        for r in xrange(k):
+            s = indptr[r]
+            set_mat_row(lp, first+r, indptr[r+1] - s, _int_p(ind, s), _double_p(val, s))
+        _set_bounds(_raw_set_row_bnds, lp, numpy.arange(first, first+k), k, None, lb, ub)
+        return first
+
+    def _csc_to_csr(indptr, rows, data, m):
+        # transpose the storage of a CSC matrix with m rows, returning
+        # (indptr, indices, data) of its CSR form with 0-based column indices
+        n = len(indptr) - 1
+        cols = numpy.repeat(numpy.arange(n, dtype=numpy.intc), numpy.diff(indptr))
+        order = numpy.argsort(rows, kind='mergesort')
+        new_indptr = numpy.concatenate(([0], numpy.cumsum(numpy.bincount(rows, minlength=m))))
+        return new_indptr.astype(numpy.intc), cols[order], data[order]
+
+    def _fetch_basic_solution(lp, m, n):
+        # statuses, primal and dual values of all m+n variables (rows first)
+        stat = numpy.concatenate((_fetch(glp_get_row_stat, lp, m, numpy.intc),
+            _fetch(glp_get_col_stat, lp, n, numpy.intc)))
+        prim = numpy.concatenate((_fetch(glp_get_row_prim, lp, m), _fetch(glp_get_col_prim, lp, n)))
+        dual = numpy.concatenate((_fetch(glp_get_row_dual, lp, m), _fetch(glp_get_col_dual, lp, n)))
+        return stat, prim, dual
+
+    def _get_csc(lp, n):
+        # read the constraint matrix column by column straight into buffers
+        # sized by glp_get_num_nz, passing GLPK pointers into them at the
+        # current fill offset; returns (indptr, indices, data) with 0-based
+        # row indices
+        nz = glp_get_num_nz(lp)
+        ind = numpy.empty(nz+1, numpy.intc)
+        val = numpy.empty(nz+1)
+        indptr = numpy.zeros(n+1, numpy.intc)
+        get_mat_col = glp_get_mat_col
+        s = 0
+        for j in xrange(1, n+1):
+            s += get_mat_col(lp, j, _int_p(ind, s), _double_p(val, s))
+            indptr[j] = s
+        return indptr, ind[1:] - 1, val[1:]
+
+    def _get_csr(lp, last, first=1):
+        # row-wise counterpart of _get_csc for rows first..last, returning
+        # (indptr, indices, data) with 0-based column indices
+        nz = glp_get_num_nz(lp)
+        ind = numpy.empty(nz+1, numpy.intc)
+        val = numpy.empty(nz+1)
+        indptr = numpy.zeros(last-first+2, numpy.intc)
+        get_mat_row = glp_get_mat_row
+        s = 0
+        for i in xrange(first, last+1):
+            s += get_mat_row(lp, i, _int_p(ind, s), _double_p(val, s))
+            indptr[i-first+1] = s
+        return indptr, ind[1:s+1] - 1, val[1:s+1]
+
+if _version >= (4, 18):
+    def _quiet_smcp():
+        # simplex parameters with the defaults and no terminal output
+        smcp = glp_smcp()
+        glp_init_smcp(smcp)
+        smcp.msg_lev = GLP_MSG_OFF
+        return smcp
+
+
+#=============================================================================
+# Sensitivity analysis
+#=============================================================================
+
+if _version >= (4, 25):
+    class SensitivityRanges(object):
+        """Objective and bound ranging of an optimal basic solution.
+
+        cost_lo, cost_hi -- range of each objective coefficient (length n)
+            over which the current basis remains optimal
+        row_lo, row_hi -- range over which the active bound of each
+            non-basic row may move before the basis becomes primal
+            infeasible (length m, NaN for basic rows)
+        col_lo, col_hi -- the same for columns (length n)
+        """
+        def __init__(self, m, n, lo, hi, cost_lo, cost_hi):
+            self.row_lo, self.col_lo = lo[:m], lo[m:]
+            self.row_hi, self.col_hi = hi[:m], hi[m:]
+            self.cost_lo, self.cost_hi = cost_lo, cost_hi
+
+    def _sens_ranges(state, ks):
+        # compute the ranging of variables ks (1..m+n) into a len(ks) x 4 array
+        # of (bound_lo, bound_hi, cost_lo, cost_hi)
+        lp, m, n, dir, stat, prim, dual, lb, ub, coef, tol = state
+        inf = numpy.inf
+        # scratch buffers are allocated once and reused for every variable
+        ind = numpy.zeros(1+m+n, numpy.intc)
+        val = numpy.zeros(1+m+n)
+        pind, pval = _int_p(ind), _double_p(val)
+        out = numpy.empty((len(ks), 4))
+        out.fill(numpy.nan)
+        for r, k in enumerate(ks):
+            s = stat[k-1]
+            if s == GLP_BS:
+                if k <= m:
+                    continue
+                # the cost of a basic column may change until some non-basic
+                # reduced cost changes its sign (dual ratio test on its row)
+                c = coef[k-m-1]
+                lim = [None, None]
+                length = glp_eval_tab_row(lp, k, pind, pval)
+                for how in (+1, -1):
+                    side = -how*dir
+                    piv = lpx_dual_ratio_test(lp, length, pind, pval, how, tol)
+                    if piv == 0:
+                        lim[side > 0] = side*inf
+                    else:
+                        q = ind[piv]
+                        lim[side > 0] = c + side*abs(dual[q-1]/val[piv])
+                out[r, 2:] = lim
+                continue
+            if k > m:
+                # the cost of a non-basic column may move away from the
+                # optimum until its reduced cost reaches zero
+                c, d = coef[k-m-1], dual[k-1]
+                if s == GLP_NS:
+                    out[r, 2:] = -inf, inf
+                elif s == GLP_NF:
+                    out[r, 2:] = c, c
+                elif (s == GLP_NL) == (dir > 0):
+                    out[r, 2:] = c - d, inf
+                else:
+                    out[r, 2:] = -inf, c - d
+            # the active bound may move until some basic variable reaches one
+            # of its bounds (primal ratio test on its column)
+            x = prim[k-1]
+            length = glp_eval_tab_col(lp, k, pind, pval)
+            for how in (+1, -1):
+                piv = lpx_prim_ratio_test(lp, length, pind, pval, how, tol)
+                if piv == 0:
+                    step = inf
+                else:
+                    p, alfa = ind[piv], val[piv]
+                    target = ub[p-1] if alfa*how > 0 else lb[p-1]
+                    step = abs((target - prim[p-1])/alfa)
+                out[r, 0 if how < 0 else 1] = x + how*step
+        return out
+
+    def sensitivity(lp, processes=None, tol=1e-9):
+        """Compute objective and bound ranging of the optimal basic solution.
+
+        The ranging is computed for all rows and columns with the simplex
+        tableau routines and returned as a SensitivityRanges object of NumPy
+        arrays. If processes > 1, the variables are split among that many
+        forked worker processes (POSIX only).
+        """
+        _require_numpy()
+        if glp_get_status(lp) != GLP_OPT:
+            raise RuntimeError("sensitivity() requires an optimal basic solution.")
+        if not glp_bf_exists(lp) and glp_factorize(lp) != 0:
+            raise RuntimeError("Unable to factorize the basis matrix.")
+        m, n = glp_get_num_rows(lp), glp_get_num_cols(lp)
+        dir = glp_get_obj_dir(lp) == GLP_MIN and +1 or -1
+        stat, prim, dual = _fetch_basic_solution(lp, m, n)
+        t, lb, ub = _fetch_bounds(lp, m, n)
+        coef = _fetch(glp_get_obj_coef, lp, n)
+        state = (lp, m, n, dir, stat, prim, dual, lb, ub, coef, tol)
+        ks = numpy.arange(1, m+n+1)
+        chunks = numpy.array_split(ks, max(1, processes or 1))
+        out = numpy.concatenate(_fork_map(_sens_ranges, state, chunks, processes))
+        return SensitivityRanges(m, n, out[:, 0], out[:, 1], out[m:, 2], out[m:, 3])
+
+
+#=============================================================================
+# Karush-Kuhn-Tucker checks returned as data
+#=============================================================================
+
+if _version >= (4, 16):
+    # outcome of a single check, indices follow lpx_check_kkt: row numbers
+    # for 'pe', column numbers for 'de' and k = 1..m+n (rows first) otherwise
+    KKTCheck = namedtuple('KKTCheck', 'ae_max ae_ind re_max re_ind quality')
+
+    # outcome of check_kkt(), None for the checks which were not requested
+    KKTResult = namedtuple('KKTResult', 'pe pb de db cs')
+
+    def _kkt_check(ae, re, ind):
+        # summarize absolute/relative errors of the variables numbered ind
+        if len(ae) == 0:
+            return KKTCheck(0.0, 0, 0.0, 0, 'H')
+        a, r = ae.argmax(), re.argmax()
+        re_max = re[r]
+        if re_max <= 1e-9:
+            quality = 'H' # high
+        elif re_max <= 1e-6:
+            quality = 'M' # medium
+        elif re_max <= 1e-3:
+            quality = 'L' # low
+        else:
+            quality = '?' # wrong or infeasible
+        return KKTCheck(ae[a], int(ind[a]), re_max, int(ind[r]), quality)
+
+    def _mat_dot(get_mat, lp, nums, x, size):
+        # sparse dot products of rows/columns nums of the matrix with x
+        ind = numpy.empty(size+1, numpy.intc)
+        val = numpy.empty(size+1)
+        pind, pval = _int_p(ind), _double_p(val)
+        out = numpy.empty(len(nums))
+        for t, k in enumerate(nums):
+            length = get_mat(lp, k, pind, pval)
+            out[t] = numpy.dot(val[1:length+1], x[ind[1:length+1]-1])
+        return out
+
+    def kkt_residuals(lp, rows=None, cols=None):
+        """Compute the residuals of the KKT equality conditions in bulk.
+
+        Returns (pe, de), where pe[i] = (A x)_i - r_i is the primal residual
+        of row i and de[j] = c_j - (A' pi)_j - d_j is the dual residual of
+        column j of the basic solution. If rows or cols are given (arrays of
+        row/column numbers), only these rows or columns are evaluated, which
+        reads just their part of the constraint matrix.
+        """
+        _require_numpy()
+        m, n = glp_get_num_rows(lp), glp_get_num_cols(lp)
+        x = _fetch(glp_get_col_prim, lp, n)
+        pi = _fetch(glp_get_row_dual, lp, m)
+        if rows is None or cols is None:
+            indptr, ri, v = _get_csc(lp, n)
+            ci = numpy.repeat(numpy.arange(n), numpy.diff(indptr))
+        if rows is None:
+            pe = numpy.bincount(ri, v*x[ci], m) - _fetch(glp_get_row_prim, lp, m)
+        else:
+            rows = numpy.asarray(rows, numpy.intc)
+            pe = _mat_dot(glp_get_mat_row, lp, rows, x, n)
+            pe -= [glp_get_row_prim(lp, i) for i in rows]
+        if cols is None:
+            de = _fetch(glp_get_obj_coef, lp, n) - numpy.bincount(ci, v*pi[ri], n)
+            de -= _fetch(glp_get_col_dual, lp, n)
+        else:
+            cols = numpy.asarray(cols, numpy.intc)
+            de = -_mat_dot(glp_get_mat_col, lp, cols, pi, m)
+            de += [glp_get_obj_coef(lp, j) - glp_get_col_dual(lp, j) for j in cols]
+        return pe, de
+
+    def check_kkt(lp, checks=('pe', 'pb', 'de', 'db', 'cs'), sample=None, seed=None):
+        """Check selected Karush-Kuhn-Tucker conditions of the basic solution.
+
+        checks is a subset of 'pe' (primal equalities), 'pb' (primal bounds),
+        'de' (dual equalities), 'db' (dual bounds) and 'cs' (complementary
+        slackness). Only the data needed by these checks is read. If sample
+        is given, the conditions are only checked on that many randomly
+        chosen rows and columns. Returns a KKTResult of KKTCheck tuples.
+        """
+        _require_numpy()
+        m, n = glp_get_num_rows(lp), glp_get_num_cols(lp)
+        if sample is None:
+            rows, cols = None, None
+            ks = numpy.arange(1, m+n+1)
+        else:
+            rng = numpy.random.RandomState(seed)
+            rows = numpy.sort(rng.permutation(m)[:sample]) + 1
+            cols = numpy.sort(rng.permutation(n)[:sample]) + 1
+            ks = numpy.concatenate((rows, cols + m))
+        k0 = ks - 1
+        result = dict.fromkeys(KKTResult._fields)
+        if 'pe' in checks or 'de' in checks:
+            pe, de = kkt_residuals(lp, rows, cols)
+            if rows is None:
+                rows, cols = numpy.arange(1, m+1), numpy.arange(1, n+1)
+        if 'pe' in checks:
+            r = numpy.array([glp_get_row_prim(lp, i) for i in rows])
+            result['pe'] = _kkt_check(abs(pe), abs(pe)/(1.0 + abs(r)), rows)
+        if 'de' in checks:
+            c = numpy.array([glp_get_obj_coef(lp, j) for j in cols])
+            result['de'] = _kkt_check(abs(de), abs(de)/(1.0 + abs(c)), cols)
+        if 'pb' in checks or 'cs' in checks:
+            t, lb, ub = _fetch_bounds(lp, m, n)
+            lb, ub = lb[k0], ub[k0]
+            x = numpy.concatenate((_fetch(glp_get_row_prim, lp, m), _fetch(glp_get_col_prim, lp, n)))[k0]
+        if 'db' in checks or 'cs' in checks:
+            d = numpy.concatenate((_fetch(glp_get_row_dual, lp, m), _fetch(glp_get_col_dual, lp, n)))[k0]
+        if 'pb' in checks:
+            ae = numpy.maximum(numpy.maximum(lb - x, x - ub), 0.0)
+            bnd = numpy.where(x < lb, lb, numpy.where(x > ub, ub, 0.0))
+            result['pb'] = _kkt_check(ae, ae/(1.0 + abs(bnd)), ks)
+        if 'db' in checks:
+            stat = numpy.concatenate((_fetch(glp_get_row_stat, lp, m, numpy.intc),
+                _fetch(glp_get_col_stat, lp, n, numpy.intc)))[k0]
+            dd = d if glp_get_obj_dir(lp) == GLP_MIN else -d
+            ae = numpy.where(stat == GLP_NL, numpy.maximum(-dd, 0.0),
+                numpy.where(stat == GLP_NU, numpy.maximum(dd, 0.0),
+                numpy.where(stat == GLP_NS, 0.0, abs(dd))))
+            c = numpy.concatenate((numpy.zeros(m), _fetch(glp_get_obj_coef, lp, n)))[k0]
+            result['db'] = _kkt_check(ae, ae/(1.0 + abs(c)), ks)
+        if 'cs' in checks:
+            dist = numpy.minimum(abs(x - lb), abs(x - ub))
+            dist[numpy.isinf(dist)] = 1.0 + abs(x[numpy.isinf(dist)])
+            ae = abs(d)*dist
+            result['cs'] = _kkt_check(ae, ae/(1.0 + abs(x)), ks)
+        return KKTResult(**result)
+
+
+#=============================================================================
+# Problem data snapshots
+#=============================================================================
+
+if _version >= (4, 16):
+    class ProblemData(object):
+        """Snapshot of a problem object as NumPy arrays.
+
+        Bounds follow _fetch_bounds (-inf/+inf where missing), the constraint
+        matrix is kept in coordinate form with 0-based row/column indices
+        ia, ja and values ar, sorted by column.
+        """
+        _arrays = ('obj', 'row_type', 'row_lb', 'row_ub', 'col_type', 'col_lb',
+            'col_ub', 'col_kind', 'ia', 'ja', 'ar')
+
+        def __init__(self, **kw):
+            self.name = None
+            self.obj_dir = GLP_MIN
+            self.obj0 = 0.0
+            self.row_names = self.col_names = None
+            for key in self._arrays:
+                setattr(self, key, None)
+            self.__dict__.update(kw)
+
+        def from_prob(cls, lp, names=True):
+            """Read the whole problem object lp into a new ProblemData."""
+            _require_numpy()
+            m, n = glp_get_num_rows(lp), glp_get_num_cols(lp)
+            t, lb, ub = _fetch_bounds(lp, m, n)
+            indptr, ia, ar = _get_csc(lp, n)
+            self = cls(name=glp_get_prob_name(lp), obj_dir=glp_get_obj_dir(lp),
+                obj0=glp_get_obj_coef(lp, 0), obj=_fetch(glp_get_obj_coef, lp, n),
+                row_type=t[:m], row_lb=lb[:m], row_ub=ub[:m],
+                col_type=t[m:], col_lb=lb[m:], col_ub=ub[m:],
+                col_kind=_fetch(glp_get_col_kind, lp, n, numpy.intc),
+                ia=ia, ja=numpy.repeat(numpy.arange(n, dtype=numpy.intc), numpy.diff(indptr)),
+                ar=ar)
+            if names:
+                self.row_names = [glp_get_row_name(lp, i) for i in xrange(1, m+1)]
+                self.col_names = [glp_get_col_name(lp, j) for j in xrange(1, n+1)]
+            return self
+        from_prob = classmethod(from_prob)
+
+        def load(self, lp=None):
+            """Load the snapshot into the empty problem object lp (a new one
+            if lp is None) and return lp."""
+            if lp is None:
+                lp = glp_create_prob()
+            m, n = len(self.row_type), len(self.col_type)
+            if self.name:
+                glp_set_prob_name(lp, self.name)
+            glp_set_obj_dir(lp, self.obj_dir)
+            if m:
+                glp_add_rows(lp, m)
+            if n:
+                glp_add_cols(lp, n)
+            set_row_bounds(lp, None, self.row_type, self.row_lb, self.row_ub)
+            set_col_bounds(lp, None, self.col_type, self.col_lb, self.col_ub)
+            nz = numpy.flatnonzero(self.obj)
+            set_objective(lp, nz + 1, self.obj[nz], self.obj0)
+            set_col_kinds(lp, numpy.flatnonzero(self.col_kind != GLP_CV) + 1, GLP_IV)
+            if self.row_names is not None:
+                for i, s in enumerate(self.row_names):
+                    if s:
+                        glp_set_row_name(lp, i+1, s)
+            if self.col_names is not None:
+                for j, s in enumerate(self.col_names):
+                    if s:
+                        glp_set_col_name(lp, j+1, s)
+            ne = len(self.ar)
+            if ne:
+                # GLPK reads ia[1..ne], hence the leading pad entry
+                ia = numpy.empty(ne+1, numpy.intc)
+                ja = numpy.empty(ne+1, numpy.intc)
+                ar = numpy.empty(ne+1)
+                ia[1:], ja[1:], ar[1:] = self.ia + 1, self.ja + 1, self.ar
+                glp_load_matrix(lp, ne, _int_p(ia), _int_p(ja), _double_p(ar))
+            return lp
+
+        def save(self, file):
+            """Write the snapshot to file in NumPy's binary .npz format."""
+            arrays = dict((key, getattr(self, key)) for key in self._arrays)
+            for key in ('row_names', 'col_names'):
+                if getattr(self, key) is not None:
+                    arrays[key] = numpy.array([s or '' for s in getattr(self, key)], dtype=bytes)
+            numpy.savez(file, name=numpy.array(self.name or '', dtype=bytes),
+                scalars=numpy.array([self.obj_dir, self.obj0]), **arrays)
+
+        def read(cls, file):
+            """Read a snapshot written by save()."""
+            _require_numpy()
+            f = numpy.load(file)
+            self = cls(name=f['name'].item() or None, obj_dir=int(f['scalars'][0]),
+                obj0=float(f['scalars'][1]))
+            for key in cls._arrays:
+                setattr(self, key, f[key])
+            for key in ('row_names', 'col_names'):
+                if key in f.files:
+                    setattr(self, key, f[key].tolist())
+            return self
+        read = classmethod(read)
+
+
+#=============================================================================
+# MathProg translator cache
+#=============================================================================
+
+if _version >= (4, 33):
+    class MathProgCache(object):
+        """Cache of problems built from GNU MathProg models.
+
+        Problems are keyed by the hashes of the model and data files and kept
+        as ProblemData snapshots, in memory (the maxsize most recently used
+        ones) and, if directory is given, as .npz files. A hit rebuilds the
+        problem from the snapshot without running the translator.
+
+        GLPK's translator cannot reuse a translated model with other data,
+        so a miss translates the model again; only the hashing of unchanged
+        model files is skipped. Since hits have no translator workspace,
+        glp_mpl_postsolve is not available for cached problems.
+        """
+        def __init__(self, directory=None, maxsize=64):
+            _require_numpy()
+            from collections import OrderedDict
+            self.directory = directory
+            self.maxsize = maxsize
+            self.hits = self.misses = 0
+            self._mem = OrderedDict()
+            self._hashes = {}
+
+        def _file_hash(self, fname):
+            # file contents are only hashed again when size or mtime changed
+            st = os.stat(fname)
+            stamp = (st.st_size, st.st_mtime)
+            cached = self._hashes.get(fname)
+            if cached is not None and cached[0] == stamp:
+                return cached[1]
+            h = hashlib.sha1()
+            f = open(fname, 'rb')
+            try:
+                for block in iter(lambda: f.read(1 << 20), ''):
+                    h.update(block)
+            finally:
+                f.close()
+            self._hashes[fname] = (stamp, h.hexdigest())
+            return h.hexdigest()
+
+        def _remember(self, key, data):
+            self._mem[key] = data
+            while len(self._mem) > self.maxsize:
+                self._mem.popitem(last=False)
+
+        def lookup(self, key):
+            """Return the cached ProblemData for key, or None."""
+            data = self._mem.pop(key, None)
+            if data is None and self.directory is not None:
+                path = os.path.join(self.directory, key + '.npz')
+                if os.path.exists(path):
+                    data = ProblemData.read(path)
+            if data is not None:
+                self._remember(key, data)
+            return data
+
+        def build(self, model, data=None, lp=None):
+            """Return a problem object for the model file and optional data
+            file, loaded into lp if given (it must be empty)."""
+            key = self._file_hash(model) + (data and '-' + self._file_hash(data) or '')
+            snapshot = self.lookup(key)
+            if snapshot is not None:
+                self.hits += 1
+                return snapshot.load(lp)
+            self.misses += 1
+            tran = glp_mpl_alloc_wksp()
+            try:
+                if glp_mpl_read_model(tran, model, data is not None) != 0:
+                    raise RuntimeError("Error translating model section of " + model)
+                if data is not None and glp_mpl_read_data(tran, data) != 0:
+                    raise RuntimeError("Error translating data section of " + data)
+                if glp_mpl_generate(tran, None) != 0:
+                    raise RuntimeError("Error generating model " + model)
+                if lp is None:
+                    lp = glp_create_prob()
+                glp_mpl_build_prob(tran, lp)
+            finally:
+                glp_mpl_free_wksp(tran)
+            snapshot = ProblemData.from_prob(lp)
+            self._remember(key, snapshot)
+            if self.directory is not None:
+                path = os.path.join(self.directory, key + '.npz')
+                f = open(path + '.tmp', 'wb')
+                try:
+                    snapshot.save(f)
+                finally:
+                    f.close()
+                os.rename(path + '.tmp', path)
+            return lp
+
+
+#=============================================================================
+# In-memory MathProg data
+#=============================================================================
+
+if _version >= (4, 33):
+    import re as _re
+    _mpl_plain = _re.compile(r'^[A-Za-z0-9_.+\-]+$')
+
+    def _mpl_symbol(x):
+        # format a set element or parameter index as a MathProg symbol
+        if isinstance(x, basestring):
+            if _mpl_plain.match(x):
+                return x
+            return "'" + x.replace("'", "''") + "'"
+        if isinstance(x, float):
+            return repr(x)
+        return str(x)
+
+    def _mpl_key(k):
+        if isinstance(k, tuple):
+            return ' '.join([_mpl_symbol(x) for x in k])
+        return _mpl_symbol(k)
+
+    def _mpl_value(v):
+        # NaN stands for the parameter's default value
+        if v != v:
+            return '.'
+        return _mpl_symbol(v)
+
+    def _mpl_data_chunks(sets, params, chunk_size):
+        # generate the data section piece by piece, chunk_size items at a time
+        yield 'data;\n'
+        for name, elems in sets.items():
+            yield 'set %s :=' % name
+            buf = []
+            for e in elems:
+                if isinstance(e, tuple):
+                    buf.append('(' + ','.join([_mpl_symbol(x) for x in e]) + ')')
+                else:
+                    buf.append(_mpl_symbol(e))
+                if len(buf) >= chunk_size:
+                    yield '\n' + ' '.join(buf)
+                    buf = []
+            yield '\n' + ' '.join(buf) + ';\n'
+        for name, value in params.items():
+            if numpy is not None and isinstance(value, numpy.ndarray):
+                if value.ndim == 0:
+                    if value == value:
+                        yield 'param %s := %s;\n' % (name, _mpl_value(value.item()))
+                elif value.ndim == 2:
+                    # tabular format, indices run from 1 in both dimensions
+                    yield 'param %s : %s :=\n' % (name, ' '.join(map(str, xrange(1, value.shape[1]+1))))
+                    step = max(1, chunk_size // max(1, value.shape[1]))
+                    for i0 in xrange(0, value.shape[0], step):
+                        block = value[i0:i0+step]
+                        yield ''.join(['%d %s\n' % (i0+r+1, ' '.join(map(_mpl_value, row)))
+                            for r, row in enumerate(block.tolist())])
+                    yield ';\n'
+                else:
+                    # one line per entry, indices run from 1 in every dimension
+                    yield 'param %s :=\n' % name
+                    flat = value.ravel()
+                    for k0 in xrange(0, flat.size, chunk_size):
+                        idx = numpy.array(numpy.unravel_index(numpy.arange(k0, min(k0+chunk_size, flat.size)),
+                            value.shape)).T + 1
+                        yield ''.join(['%s %s\n' % (' '.join(map(str, ix)), _mpl_value(v))
+                            for ix, v in zip(idx.tolist(), flat[k0:k0+chunk_size].tolist())])
+                    yield ';\n'
+            elif isinstance(value, dict):
+                yield 'param %s :=\n' % name
+                buf = []
+                for k, v in value.items():
+                    buf.append('%s %s\n' % (_mpl_key(k), _mpl_value(v)))
+                    if len(buf) >= chunk_size:
+                        yield ''.join(buf)
+                        buf = []
+                yield ''.join(buf) + ';\n'
+            elif value == value:
+                # a NaN scalar is left out, taking its default value
+                yield 'param %s := %s;\n' % (name, _mpl_value(value))
+        yield 'end;\n'
+
+    def mpl_data_text(sets=None, params=None):
+        """Return the MathProg data section for sets and params as a string
+        (see mpl_read_data)."""
+        return ''.join(_mpl_data_chunks(sets or {}, params or {}, 4096))
+
+    def mpl_read_data(tran, sets=None, params=None, chunk_size=4096):
+        """Translate a data section given as Python/NumPy data.
+
+        sets maps set names to iterables of elements (tuples for n-tuples).
+        params maps parameter names to scalars, dicts {index: value} (tuples
+        for multiple subscripts) or NumPy arrays indexed from 1 in every
+        dimension; NaN entries take the parameter's default value.
+
+        The data section is generated in chunks of chunk_size items and fed to
+        glp_mpl_read_data through a pipe by a writer thread, so large tables
+        are never formatted as a whole. Where /dev/fd is not available, a
+        temporary file is used instead. Returns glp_mpl_read_data's code.
+        """
+        chunks = _mpl_data_chunks(sets or {}, params or {}, chunk_size)
+        if not os.path.isdir('/dev/fd'):
+            import tempfile
+            fd, fname = tempfile.mkstemp('.dat')
+            f = os.fdopen(fd, 'w')
+            try:
+                for chunk in chunks:
+                    f.write(chunk)
+                f.close()
+                return glp_mpl_read_data(tran, fname)
+            finally:
+                f.close()
+                os.remove(fname)
+
+        r, w = os.pipe()
+        error = []
+        def writer():
+            f = os.fdopen(w, 'w')
+            try:
+                try:
+                    for chunk in chunks:
+                        f.write(chunk)
+                finally:
+                    f.close()
+            except (IOError, OSError):
+                # GLPK stopped reading early, e.g. on a syntax error
+                pass
+            except Exception:
+                # a value that cannot be formatted, raised again below
+                error.append(sys.exc_info())
+        thread = threading.Thread(target=writer)
+        thread.daemon = True
+        thread.start()
+        try:
+            # ctypes releases the GIL while GLPK reads from the pipe
+            ret = glp_mpl_read_data(tran, '/dev/fd/%d' % r)
+        finally:
+            os.close(r)
+            thread.join()
+        if error:
+            raise error[0][0], error[0][1], error[0][2]
+        return ret
+
+
+#=============================================================================
+# Branch-and-cut callback plug-ins
+#=============================================================================
+
+if _version >= (4, 20):
+    class _MIPStart(object):
+        # plug-in providing a start solution at the first GLP_IHEUR call
+        reasons = (GLP_IHEUR,)
+
+        def __init__(self, x):
+            self.x = _padded(x, float)
+            self.accepted = None
+
+        def __call__(self, tree, reason):
+            if self.accepted is None:
+                self.accepted = glp_ios_heur_sol(tree, _double_p(self.x)) == 0
+
+    def _complete_start(lp, x, tm_lim):
+        # complete a partial start by solving a sub-MIP with the given
+        # columns fixed, returning the full solution or None
+        if _version < (4, 33):
+            raise ValueError("Partial start solutions require GLPK 4.33 or later.")
+        sub = glp_create_prob()
+        try:
+            glp_copy_prob(sub, lp, GLP_OFF)
+            for j in numpy.flatnonzero(~numpy.isnan(x)).tolist():
+                glp_set_col_bnds(sub, j+1, GLP_FX, x[j], x[j])
+            smcp = _quiet_smcp()
+            if glp_simplex(sub, smcp) != 0 or glp_get_status(sub) != GLP_OPT:
+                return None
+            iocp = glp_iocp()
+            glp_init_iocp(iocp)
+            iocp.msg_lev = GLP_MSG_OFF
+            iocp.tm_lim = tm_lim
+            glp_intopt(sub, iocp)
+            if glp_mip_status(sub) not in (GLP_OPT, GLP_FEAS):
+                return None
+            return _fetch(glp_mip_col_val, sub, glp_get_num_cols(sub))
+        finally:
+            glp_delete_prob(sub)
+
+    def check_start(lp, start, repair=True, tm_lim=10000):
+        """Validate a start solution for the MIP problem lp.
+
+        start holds a value per column, NaN for columns without one. With
+        repair, values are clipped to the column bounds and integer columns
+        rounded. Partial starts are completed by solving a sub-MIP with the
+        given columns fixed, for at most tm_lim milliseconds. Returns the
+        complete start solution, or None if no feasible one was obtained.
+        """
+        _require_numpy()
+        model = HeuristicModel(lp)
+        x = numpy.array(start, float)
+        if x.shape != (model.n,):
+            raise ValueError("The start solution must have one value per column.")
+        given = ~numpy.isnan(x)
+        if repair:
+            x[given] = model.round(x)[given]
+        if not given.all():
+            x = _complete_start(lp, x, tm_lim)
+            if x is None:
+                return None
+        if not model.feasible(x):
+            return None
+        return x
+
+    def intopt(lp, parm=None, plugins=(), start=None, repair=True):
+        """Solve MIP problem with glp_intopt, dispatching callbacks to plug-ins.
+
+        A plug-in is a callable plugin(tree, reason) with an attribute
+        reasons, the tuple of GLP_I* reason codes it wants to handle. Plug-ins
+        are called in the given order, followed by parm.cb_func if it is set.
+        An exception raised by a plug-in terminates the search and is
+        re-raised once glp_intopt has returned. parm itself is not modified.
+
+        start is an optional start solution (see check_start), provided to
+        the solver with glp_ios_heur_sol at the first GLP_IHEUR call so that
+        pruning starts immediately. ValueError is raised if it is infeasible.
+        """
+        local = glp_iocp()
+        if parm is None:
+            glp_init_iocp(local)
+        else:
+            memmove(byref(local), byref(parm), sizeof(glp_iocp))
+        if start is not None:
+            x = check_start(lp, start, repair)
+            if x is None:
+                raise ValueError("The start solution is not feasible.")
+            plugins = [_MIPStart(x)] + list(plugins)
+        # read the user callback from parm: local.cb_func shares the memory
+        # of local, which is overwritten with the dispatcher below
+        user_func = parm.cb_func if parm is not None else None
+        user_info = local.cb_info
+        handlers = {}
+        for plugin in plugins:
+            for reason in plugin.reasons:
+                handlers.setdefault(reason, []).append(plugin)
+        error = []
+
+        def callback(tree, info):
+            if error:
+                return
+            try:
+                reason = glp_ios_reason(tree)
+                for plugin in handlers.get(reason, ()):
+                    plugin(tree, reason)
+                if user_func:
+                    user_func(tree, user_info)
+            except Exception:
+                error.append(sys.exc_info())
+                glp_ios_terminate(tree)
+
+        # keep a reference to the C callback until glp_intopt returns
+        cb_func = glp_iocp_cback_func(callback)
+        local.cb_func = cb_func
+        ret = glp_intopt(lp, local)
+        if error:
+            raise error[0][0], error[0][1], error[0][2]
+        return ret
+
+
+#=============================================================================
+# Parallel branch-and-bound
+#=============================================================================
+
+if _version >= (4, 33):
+    # result of a MIP solved outside of the problem object: status (GLP_OPT,
+    # GLP_FEAS or GLP_NOFEAS), objective value and column values (0-based)
+    MIPResult = namedtuple('MIPResult', 'status obj x')
+
+    def _apply_fixings(lp, fixings):
+        # apply (j, lb, ub) bound changes, returning the ones undoing them
+        undo = []
+        for j, lb, ub in fixings:
+            t = glp_get_col_type(lp, j)
+            undo.append((j, t, glp_get_col_lb(lp, j), glp_get_col_ub(lp, j)))
+            glp_set_col_bnds(lp, j, _bnd_type(lb, ub), lb != -numpy.inf and lb or 0.0,
+                ub != numpy.inf and ub or 0.0)
+        return undo
+
+    class _SharedIncumbent(object):
+        # Plug-in exchanging incumbents between the worker processes of
+        # parallel_intopt() through a shared array [valid, obj, x_1..x_n].
+        reasons = (GLP_IHEUR, GLP_IBINGO)
+
+        def __init__(self, shared, lock, n, sense, is_int):
+            self.shared, self.lock, self.n = shared, lock, n
+            self.sense, self.is_int = sense, is_int
+            self.own = numpy.inf # own incumbent (times sense)
+            self.injected = numpy.inf
+            self.x = numpy.zeros(n+1)
+            self.buf = numpy.frombuffer(shared.get_obj())
+
+        def best(self):
+            # objective of the shared incumbent times sense, or +inf
+            if not self.buf[0]:
+                return numpy.inf
+            return self.sense*self.buf[1]
+
+        def __call__(self, tree, reason):
+            best = self.best()
+            if reason == GLP_IBINGO:
+                prob = glp_ios_get_prob(tree)
+                obj = glp_get_obj_val(prob)
+                self.own = min(self.own, self.sense*obj)
+                if self.sense*obj < best:
+                    x = _fetch(glp_get_col_prim, prob, self.n)
+                    self.lock.acquire()
+                    try:
+                        if self.sense*obj < self.best():
+                            self.buf[2:] = x
+                            self.buf[1] = obj
+                            self.buf[0] = 1
+                    finally:
+                        self.lock.release()
+            elif best < min(self.own, self.injected):
+                # glp_ios_heur_sol only checks that the integer columns are
+                # exactly integral, not the bounds of this subtree, so the
+                # incumbent of another one is accepted and GLPK prunes the
+                # nodes which cannot improve on it
+                x = self.buf[2:]
+                self.x[1:] = numpy.where(self.is_int, numpy.floor(x + 0.5), x)
+                if glp_ios_heur_sol(tree, _double_p(self.x)) == 0:
+                    self.injected = best
+
+    def _solve_subtree(state, fixings):
+        lp, n, parm, smcp, shared, lock = state
+        sense = glp_get_obj_dir(lp) == GLP_MIN and +1 or -1
+        sub = glp_create_prob()
+        try:
+            glp_copy_prob(sub, lp, GLP_OFF)
+            _apply_fixings(sub, fixings)
+            glp_simplex(sub, smcp)
+            if glp_get_status(sub) == GLP_NOFEAS:
+                return GLP_NOFEAS, None, None
+            if glp_get_status(sub) != GLP_OPT:
+                # unbounded or unsolved relaxation, the subtree is not searched
+                return GLP_UNDEF, None, None
+            is_int = _fetch(glp_get_col_kind, sub, n, numpy.intc) != GLP_CV
+            plugin = _SharedIncumbent(shared, lock, n, sense, is_int)
+            ret = intopt(sub, parm, [plugin])
+            status = glp_mip_status(sub)
+            if status not in (GLP_OPT, GLP_FEAS):
+                return ret == 0 and GLP_NOFEAS or GLP_UNDEF, None, None
+            if ret != 0:
+                status = GLP_FEAS
+            return status, glp_mip_obj_val(sub), _fetch(glp_mip_col_val, sub, n)
+        finally:
+            glp_delete_prob(sub)
+
+    def parallel_intopt(lp, parm=None, depth=3, processes=None, smcp=None):
+        """Solve MIP problem by distributing subtrees over worker processes.
+
+        The LP relaxation is branched on its most fractional integer column
+        down to the given depth, solving the open nodes in the parent
+        process. Each remaining node becomes a copy of lp with the branching
+        bounds set by glp_set_col_bnds and is solved with glp_intopt in one
+        of processes forked workers (POSIX only). Incumbents are shared
+        through shared memory: a worker injects a better one with
+        glp_ios_heur_sol, its integer columns rounded, so that GLPK prunes
+        the subproblems which cannot improve on it. Nodes whose relaxation
+        is unbounded or not solved are not searched, and the result is then
+        at best GLP_FEAS.
+
+        The problem object lp is not modified; returns a MIPResult.
+        """
+        _require_numpy()
+        import multiprocessing
+        n = glp_get_num_cols(lp)
+        sense = glp_get_obj_dir(lp) == GLP_MIN and +1 or -1
+        if parm is None:
+            parm = glp_iocp()
+            glp_init_iocp(parm)
+        if smcp is None:
+            smcp = _quiet_smcp()
+        is_int = _fetch(glp_get_col_kind, lp, n, numpy.intc) != GLP_CV
+        best = MIPResult(GLP_NOFEAS, None, None)
+        complete = True
+
+        # branch the root in the parent, reusing one copy of the problem
+        work = glp_create_prob()
+        try:
+            glp_copy_prob(work, lp, GLP_OFF)
+            t, lb0, ub0 = _fetch_bounds(work, 0, n)
+            open_nodes, leaves = [[]], []
+            for level in xrange(depth + 1):
+                children = []
+                for fixings in open_nodes:
+                    undo = _apply_fixings(work, fixings)
+                    glp_simplex(work, smcp)
+                    if glp_get_status(work) == GLP_OPT:
+                        x = _fetch(glp_get_col_prim, work, n)
+                        frac = numpy.where(is_int, abs(x - numpy.floor(x + 0.5)), 0.0)
+                        j = frac.argmax()
+                        if frac[j] <= parm.tol_int:
+                            obj = glp_get_obj_val(work)
+                            if best.obj is None or sense*obj < sense*best.obj:
+                                best = MIPResult(GLP_OPT, obj, numpy.where(is_int, numpy.floor(x + 0.5), x))
+                        elif level == depth:
+                            leaves.append(fixings)
+                        else:
+                            lb, ub = lb0.copy(), ub0.copy()
+                            for k, l, u in fixings:
+                                lb[k-1], ub[k-1] = l, u
+                            children.append(fixings + [(j+1, lb[j], numpy.floor(x[j]))])
+                            children.append(fixings + [(j+1, numpy.ceil(x[j]), ub[j])])
+                    elif glp_get_status(work) != GLP_NOFEAS:
+                        complete = False
+                    for j, t, l, u in reversed(undo):
+                        glp_set_col_bnds(work, j, t, l, u)
+                open_nodes = children
+        finally:
+            glp_delete_prob(work)
+
+        # solve the subtrees, sharing the best incumbent
+        shared = multiprocessing.Array('d', n+2)
+        lock = multiprocessing.Lock()
+        if best.obj is not None:
+            buf = numpy.frombuffer(shared.get_obj())
+            buf[0], buf[1], buf[2:] = 1, best.obj, best.x
+        state = (lp, n, parm, smcp, shared, lock)
+        for status, obj, x in _fork_map(_solve_subtree, state, leaves, processes):
+            if status == GLP_FEAS or status == GLP_UNDEF:
+                complete = False
+            if obj is not None and (best.obj is None or sense*obj < sense*best.obj):
+                best = MIPResult(status, obj, x)
+        if best.obj is None:
+            return MIPResult(complete and GLP_NOFEAS or GLP_UNDEF, None, None)
+        return MIPResult(complete and GLP_OPT or GLP_FEAS, best.obj, best.x)
+
+
+#=============================================================================
+# Column generation
+#=============================================================================
+
+if _version >= (4, 18):
+    class ColumnGeneration(object):
+        """Column generation driver for a master LP problem.
+
+        pricing(duals, cg) is called with the row duals of the master (a NumPy
+        array) after every solve and returns None when no attractive column
+        is left, or a batch of columns (cost, indptr, indices, data[, lb, ub])
+        in CSC form with 0-based row indices (bounds default to x >= 0). The
+        batch is appended with one glp_add_cols call and the master is
+        re-solved from the retained basis.
+
+        Every purge_every iterations, generated columns which have been
+        non-basic with a non-attractive reduced cost for purge_age
+        consecutive purges are removed with one glp_del_cols call. The
+        columns the master started with are never removed.
+        """
+        def __init__(self, lp, pricing, smcp=None, purge_every=0, purge_age=3, tol=1e-9):
+            _require_numpy()
+            self.lp, self.pricing = lp, pricing
+            self.purge_every, self.purge_age, self.tol = purge_every, purge_age, tol
+            if smcp is None:
+                smcp = _quiet_smcp()
+            self.smcp = smcp
+            self.n0 = glp_get_num_cols(lp)
+            self.age = numpy.zeros(0, int) # of the generated columns
+            self.iterations = 0
+
+        def duals(self):
+            """Return the row duals of the master."""
+            return _fetch(glp_get_row_dual, self.lp, glp_get_num_rows(self.lp))
+
+        def add_columns(self, cost, indptr, indices, data, lb=0.0, ub=float('inf')):
+            """Append a batch of columns in CSC form, returning the number of
+            the first one."""
+            first = _add_cols_csc(self.lp, indptr, indices, data, cost, lb, ub)
+            self.age = numpy.concatenate((self.age, numpy.zeros(len(indptr) - 1, int)))
+            return first
+
+        def purge(self):
+            """Remove generated columns which stayed non-attractive for
+            purge_age purges, returning how many were removed."""
+            lp, n0 = self.lp, self.n0
+            n = glp_get_num_cols(lp)
+            if n == n0:
+                return 0
+            sense = glp_get_obj_dir(lp) == GLP_MIN and +1 or -1
+            js = xrange(n0+1, n+1)
+            d = sense*numpy.array([glp_get_col_dual(lp, j) for j in js])
+            basic = numpy.array([glp_get_col_stat(lp, j) == GLP_BS for j in js])
+            idle = ~basic & (d > self.tol)
+            self.age = numpy.where(idle, self.age + 1, 0)
+            drop = numpy.flatnonzero(self.age >= self.purge_age)
+            if len(drop):
+                delete_cols(lp, drop + n0 + 1)
+                self.age = numpy.delete(self.age, drop)
+            return len(drop)
+
+        def solve(self, max_iter=None):
+            """Alternate master solves and pricing until pricing returns no
+            columns, returning glp_simplex's code of the last solve."""
+            while True:
+                ret = glp_simplex(self.lp, self.smcp)
+                if ret != 0 or glp_get_status(self.lp) != GLP_OPT:
+                    return ret
+                if max_iter is not None and self.iterations >= max_iter:
+                    return ret
+                batch = self.pricing(self.duals(), self)
+                if not batch or len(batch[1]) <= 1:
+                    return ret
+                self.iterations += 1
+                self.add_columns(*batch)
+                if self.purge_every and self.iterations % self.purge_every == 0:
+                    self.purge()
+
+
+#=============================================================================
+# Benders decomposition
+#=============================================================================
+
+if _version >= (4, 33):
+    def _benders_setup(sub, link, nm):
+        # per-subproblem state: the rows linked to master columns, their
+        # original bounds and the coefficients of T in coordinate form
+        r, c, v = [numpy.asarray(a) for a in link]
+        ur, inv = numpy.unique(r, return_inverse=True)
+        rows = (ur + 1).tolist()
+        t, lb, ub = _fetch_bounds(sub, glp_get_num_rows(sub), 0)
+        return dict(lp=sub, elastic=None, rows=rows, inv=inv, c=numpy.asarray(c, int),
+            v=numpy.asarray(v, float), types=t[ur].tolist(), lb=lb[ur], ub=ub[ur], nm=nm)
+
+    def _benders_shift(lp, sp, shift):
+        # set the linked rows' bounds to their original values minus T x
+        lb = numpy.where(numpy.isinf(sp['lb']), 0.0, sp['lb'] - shift).tolist()
+        ub = numpy.where(numpy.isinf(sp['ub']), 0.0, sp['ub'] - shift).tolist()
+        for i, t, l, u in zip(sp['rows'], sp['types'], lb, ub):
+            glp_set_row_bnds(lp, i, t, l, u)
+
+    def _benders_elastic(sp):
+        # phase-1 copy of a subproblem: zero objective and one pair of
+        # artificial columns per linked row, each with cost 1
+        e = glp_create_prob()
+        glp_copy_prob(e, sp['lp'], GLP_OFF)
+        for j in xrange(0, glp_get_num_cols(e) + 1):
+            glp_set_obj_coef(e, j, 0.0)
+        k = len(sp['rows'])
+        rows = numpy.repeat(numpy.asarray(sp['rows']) - 1, 2)
+        data = numpy.tile([1.0, -1.0], k)
+        _add_cols_csc(e, numpy.arange(2*k + 1), rows, data, 1.0)
+        return e
+
+    def _benders_eval(subs, ks, x, smcp):
+        # solve subproblems ks at master point x, returning their cuts as
+        # (k, feasible, value, ind, val) where ind are 0-based master columns
+        cuts = []
+        for k in ks:
+            sp = subs[k]
+            shift = numpy.bincount(sp['inv'], sp['v']*x[sp['c']], len(sp['rows']))
+            lp = sp['lp']
+            _benders_shift(lp, sp, shift)
+            glp_simplex(lp, smcp)
+            status = glp_get_status(lp)
+            feasible = status == GLP_OPT
+            if not feasible:
+                if status != GLP_NOFEAS:
+                    raise RuntimeError("Benders subproblem %d could not be solved (status %d)." % (k, status))
+                if sp['elastic'] is None:
+                    sp['elastic'] = _benders_elastic(sp)
+                lp = sp['elastic']
+                _benders_shift(lp, sp, shift)
+                glp_simplex(lp, smcp)
+                status = glp_get_status(lp)
+                if status != GLP_OPT:
+                    raise RuntimeError("The phase-1 problem of Benders subproblem %d could not be "
+                        "solved (status %d)." % (k, status))
+            pi = _fetch(glp_get_row_dual, lp, glp_get_num_rows(lp))[numpy.asarray(sp['rows']) - 1]
+            g = numpy.bincount(sp['c'], pi[sp['inv']]*sp['v'], sp['nm'])
+            ind = numpy.flatnonzero(g)
+            cuts.append((k, feasible, glp_get_obj_val(lp), ind, g[ind]))
+        return cuts
+
+    def _benders_worker(conn, subs, ks, smcp):
+        # resident worker process: evaluate its subproblems for every master
+        # point received until None arrives
+        while True:
+            x = conn.recv()
+            if x is None:
+                break
+            try:
+                conn.send(_benders_eval(subs, ks, x, smcp))
+            except Exception, e:
+                conn.send(e)
+        conn.close()
+
+    class _BendersCuts(object):
+        # plug-in adding violated Benders cuts at integer feasible node LPs
+        reasons = (GLP_IROWGEN,)
+
+        def __init__(self, engine, is_int, tol_int):
+            self.engine, self.is_int, self.tol_int = engine, is_int, tol_int
+
+        def __call__(self, tree, reason):
+            prob = glp_ios_get_prob(tree)
+            x = _fetch(glp_get_col_prim, prob, len(self.is_int))
+            xi = x[self.is_int]
+            if not _is_integral(xi, self.tol_int).all():
+                return
+            self.engine._add_cuts(prob, x)
+
+    class Benders(object):
+        """Benders decomposition engine.
+
+        Solves min c'x + sum_k Q_k(x) over the master MIP problem master,
+        where Q_k(x) is the optimal value of the LP minimization problem
+        subproblems[k] whose rows i have their bounds shifted by -(T_k x)_i.
+        links[k] = (rows, cols, vals) gives T_k in coordinate form with
+        0-based subproblem row and master column indices. The engine adds a
+        column theta_k >= theta_lb with cost 1 to the master per subproblem.
+
+        With processes > 1 the subproblems are distributed over resident
+        forked worker processes (POSIX only), which keep them warm between
+        master iterations and only update the bounds of the linked rows.
+        Optimality cuts use the subproblems' row duals; feasibility cuts
+        use the duals of a phase-1 copy with artificial columns on the
+        linked rows. Call close() to stop the workers.
+        """
+        def __init__(self, master, subproblems, links, processes=None, theta_lb=0.0, tol=1e-6, smcp=None):
+            _require_numpy()
+            self.master, self.tol = master, tol
+            self.nm = glp_get_num_cols(master)
+            self.K = len(subproblems)
+            if smcp is None:
+                smcp = _quiet_smcp()
+            self.smcp = smcp
+            self.theta = _add_cols_csc(master, numpy.zeros(self.K + 1, int), [], [], 1.0, theta_lb) - 1
+            self.iterations = 0
+            subs = [_benders_setup(sub, link, self.nm) for sub, link in zip(subproblems, links)]
+            self._subs, self._workers = subs, []
+            if processes and processes > 1 and hasattr(os, 'fork'):
+                import multiprocessing
+                for p in xrange(min(processes, self.K)):
+                    ks = range(p, self.K, processes)
+                    parent, child = multiprocessing.Pipe()
+                    proc = multiprocessing.Process(target=_benders_worker, args=(child, subs, ks, smcp))
+                    proc.daemon = True
+                    proc.start()
+                    child.close()
+                    self._workers.append((proc, parent))
+
+        def close(self):
+            """Stop the worker processes."""
+            for proc, conn in self._workers:
+                conn.send(None)
+                proc.join()
+            self._workers = []
+
+        def evaluate(self, x):
+            """Solve all subproblems at the master column values x (0-based,
+            without the theta columns) and return their cuts as a list of
+            (k, feasible, value, ind, val) sorted by k."""
+            x = numpy.asarray(x, float)[:self.nm]
+            if not self._workers:
+                return _benders_eval(self._subs, xrange(self.K), x, self.smcp)
+            for proc, conn in self._workers:
+                conn.send(x)
+            cuts = []
+            for proc, conn in self._workers:
+                result = conn.recv()
+                if isinstance(result, Exception):
+                    raise result
+                cuts.extend(result)
+            cuts.sort(key=lambda cut: cut[0])
+            return cuts
+
+        def _add_cuts(self, lp, x):
+            # add the cuts violated at x (all columns, 0-based) to lp,
+            # returning how many were added
+            indptr, indices, data, lb = [0], [], [], []
+            for k, feasible, value, ind, val in self.evaluate(x):
+                rhs = value + numpy.dot(val, x[ind])
+                if feasible:
+                    if x[self.theta + k] >= value - self.tol*(1.0 + abs(value)):
+                        continue
+                    ind, val = numpy.append(ind, self.theta + k), numpy.append(val, 1.0)
+                elif value <= self.tol:
+                    continue
+                indices.append(ind)
+                data.append(val)
+                lb.append(rhs)
+                indptr.append(indptr[-1] + len(ind))
+            if len(lb):
+                _add_rows_csr(lp, indptr, numpy.concatenate(indices), numpy.concatenate(data), lb)
+            return len(lb)
+
+        def solve(self, parm=None, lazy=False, max_rounds=1000):
+            """Solve the decomposed problem, adding cuts either in rounds of
+            master re-solves or, if lazy, at GLP_IROWGEN callbacks of a
+            single glp_intopt run. The solution is left in the master;
+            returns the code of the last glp_simplex or glp_intopt call."""
+            master = self.master
+            n = glp_get_num_cols(master)
+            is_int = _fetch(glp_get_col_kind, master, n, numpy.intc) != GLP_CV
+            if parm is None:
+                parm = glp_iocp()
+                glp_init_iocp(parm)
+            while self.iterations < max_rounds:
+                self.iterations += 1
+                ret = glp_simplex(master, self.smcp)
+                if ret != 0 or glp_get_status(master) != GLP_OPT:
+                    return ret
+                if not is_int.any():
+                    x = _fetch(glp_get_col_prim, master, n)
+                else:
+                    if lazy:
+                        return intopt(master, parm, [_BendersCuts(self, is_int, parm.tol_int)])
+                    ret = glp_intopt(master, parm)
+                    if ret != 0 or glp_mip_status(master) not in (GLP_OPT, GLP_FEAS):
+                        return ret
+                    x = _fetch(glp_mip_col_val, master, n)
+                if not self._add_cuts(master, x):
+                    return ret
+            return ret
+
+
+#=============================================================================
+# Lazy constraints
+#=============================================================================
+
+if _version >= (4, 20):
+    def _csr_select(indptr, indices, data, keep):
+        # rows of a CSR matrix selected by the boolean mask keep
+        indptr = numpy.asarray(indptr)
+        lengths = numpy.diff(indptr)
+        mask = numpy.repeat(keep, lengths)
+        new_indptr = numpy.concatenate(([0], numpy.cumsum(lengths[keep])))
+        return new_indptr, numpy.asarray(indices)[mask], numpy.asarray(data)[mask]
+
+    def _csr_activity(indptr, indices, data, x):
+        # row activities of a CSR matrix at x
+        k = len(indptr) - 1
+        rowid = numpy.repeat(numpy.arange(k), numpy.diff(indptr))
+        return numpy.bincount(rowid, numpy.asarray(data)*x[numpy.asarray(indices, int)], k)
+
+    class LazyConstraints(object):
+        """Plug-in for intopt() adding lazy constraints at GLP_IROWGEN.
+
+        separator(x) receives the column values of the current node LP
+        solution as a NumPy array and returns None or a batch of rows
+        (indptr, indices, data, lb, ub) in CSR form with 0-based column
+        indices, where lb/ub are the row bounds (-inf/+inf if missing). Only
+        the rows violated by more than tol are added to the current
+        subproblem, with one glp_add_rows call. If integral_only is set,
+        the separator is only called for integer feasible solutions.
+        """
+        reasons = (GLP_IROWGEN,)
+
+        def __init__(self, separator, tol=1e-6, integral_only=False, tol_int=1e-5):
+            _require_numpy()
+            self.separator, self.tol = separator, tol
+            self.integral_only, self.tol_int = integral_only, tol_int
+            self.is_int = None
+            self.calls = self.added = 0
+
+        def __call__(self, tree, reason):
+            prob = glp_ios_get_prob(tree)
+            n = glp_get_num_cols(prob)
+            x = _fetch(glp_get_col_prim, prob, n)
+            if self.integral_only:
+                if self.is_int is None:
+                    self.is_int = _fetch(glp_get_col_kind, prob, n, numpy.intc) != GLP_CV
+                xi = x[self.is_int]
+                if not _is_integral(xi, self.tol_int).all():
+                    return
+            self.calls += 1
+            rows = self.separator(x)
+            if rows is None or len(rows[0]) <= 1:
+                return
+            indptr, indices, data, lb, ub = rows
+            k = len(indptr) - 1
+            lb, ub = numpy.zeros(k) + lb, numpy.zeros(k) + ub
+            act = _csr_activity(indptr, indices, data, x)
+            keep = (act < lb - self.tol*(1.0 + abs(lb))) | (act > ub + self.tol*(1.0 + abs(ub)))
+            if keep.any():
+                indptr, indices, data = _csr_select(indptr, indices, data, keep)
+                _add_rows_csr(prob, indptr, indices, data, lb[keep], ub[keep])
+                self.added += int(keep.sum())
+
+
+#=============================================================================
+# Primal heuristics
+#=============================================================================
+
+if _version >= (4, 20):
+    class HeuristicModel(object):
+        """Data of the original problem shared by the primal heuristics: the
+        constraint matrix in CSR (indptr, indices, data) and CSC (cindptr,
+        cindices, cdata) form, bounds with -inf/+inf for missing ones, the
+        integrality mask is_int, objective obj, obj0 and sense (+1 for
+        minimization, -1 for maximization)."""
+        def __init__(self, lp, tol=1e-6, tol_int=1e-5):
+            self.lp, self.tol, self.tol_int = lp, tol, tol_int
+            self.m, self.n = m, n = glp_get_num_rows(lp), glp_get_num_cols(lp)
+            t, lb, ub = _fetch_bounds(lp, m, n)
+            self.row_lb, self.row_ub, self.col_lb, self.col_ub = lb[:m], ub[:m], lb[m:], ub[m:]
+            self.is_int = _fetch(glp_get_col_kind, lp, n, numpy.intc) != GLP_CV
+            self.obj = _fetch(glp_get_obj_coef, lp, n)
+            self.obj0 = glp_get_obj_coef(lp, 0)
+            self.sense = glp_get_obj_dir(lp) == GLP_MIN and +1 or -1
+            self.cindptr, self.cindices, self.cdata = _get_csc(lp, n)
+            self.indptr, self.indices, self.data = _csc_to_csr(self.cindptr, self.cindices, self.cdata, m)
+
+        def activity(self, x):
+            """Return the row activities A x."""
+            return _csr_activity(self.indptr, self.indices, self.data, x)
+
+        def violation(self, x):
+            """Return the total bound and integrality violation of x."""
+            r = self.activity(x)
+            v = numpy.maximum(self.row_lb - r, 0.0).sum() + numpy.maximum(r - self.row_ub, 0.0).sum()
+            v += numpy.maximum(self.col_lb - x, 0.0).sum() + numpy.maximum(x - self.col_ub, 0.0).sum()
+            xi = x[self.is_int]
+            return v + abs(xi - numpy.floor(xi + 0.5)).sum()
+
+        def feasible(self, x):
+            """Check whether x is a feasible solution within tolerances."""
+            if ((x < self.col_lb - self.tol) | (x > self.col_ub + self.tol)).any():
+                return False
+            xi = x[self.is_int]
+            if not _is_integral(xi, self.tol_int).all():
+                return False
+            r = self.activity(x)
+            return not ((r < self.row_lb - self.tol*(1.0 + abs(self.row_lb))) |
+                (r > self.row_ub + self.tol*(1.0 + abs(self.row_ub)))).any()
+
+        def round(self, x):
+            """Round the integer columns of x to the nearest integers within
+            the column bounds."""
+            y = numpy.where(self.is_int, numpy.floor(x + 0.5), x)
+            return numpy.minimum(numpy.maximum(y, self.col_lb), self.col_ub)
+
+    def simple_rounding(x, model):
+        """Heuristic rounding every integer column to the nearest integer."""
+        return model.round(x)
+
+    def diving_rounding(x, model):
+        """Heuristic fixing fractional integer columns one by one, the least
+        fractional first, in the direction which reduces the row violation
+        the most, updating the row activities incrementally."""
+        x = numpy.minimum(numpy.maximum(x, model.col_lb), model.col_ub)
+        r = model.activity(x)
+        frac = abs(x - numpy.floor(x + 0.5))
+        cand = numpy.flatnonzero(model.is_int & (frac > model.tol_int))
+        lo, hi = model.row_lb, model.row_ub
+        for j in cand[numpy.argsort(frac[cand])].tolist():
+            s, e = model.cindptr[j], model.cindptr[j+1]
+            rows, a = model.cindices[s:e], model.cdata[s:e]
+            best = None
+            for v in (numpy.floor(x[j]), numpy.ceil(x[j])):
+                if v < model.col_lb[j] or v > model.col_ub[j]:
+                    continue
+                rr = r[rows] + a*(v - x[j])
+                viol = (numpy.maximum(lo[rows] - rr, 0.0) + numpy.maximum(rr - hi[rows], 0.0)).sum()
+                score = (viol, model.sense*model.obj[j]*v)
+                if best is None or score < best[0]:
+                    best = (score, v, rr)
+            if best is None:
+                return None
+            x[j] = best[1]
+            r[rows] = best[2]
+        return x
+
+if _version >= (4, 33):
+    class FeasibilityPump(object):
+        """Feasibility pump heuristic: alternates rounding with LP solves
+        minimizing the L1 distance to the rounded point over the integer
+        columns, on a private copy of the problem, for at most max_iter
+        iterations per call."""
+        def __init__(self, max_iter=20, flips=5, seed=None):
+            self.max_iter, self.flips = max_iter, flips
+            self.rng = numpy.random.RandomState(seed)
+            self.lp = None
+
+        def __call__(self, x, model):
+            if self.lp is None:
+                self.lp = glp_create_prob()
+                glp_copy_prob(self.lp, model.lp, GLP_OFF)
+                self.smcp = _quiet_smcp()
+                glp_set_obj_dir(self.lp, GLP_MIN)
+                glp_set_obj_coef(self.lp, 0, 0.0)
+            lp, ints = self.lp, numpy.flatnonzero(model.is_int)
+            last = None
+            for it in xrange(self.max_iter):
+                y = model.round(x)
+                if model.feasible(y):
+                    return y
+                if last is not None and (y[ints] == last[ints]).all():
+                    # cycling: flip the integer columns farthest from y
+                    far = ints[numpy.argsort(-abs(x[ints] - y[ints]))[:self.flips]]
+                    step = numpy.where(x[far] > y[far], 1.0, -1.0)
+                    step[self.rng.rand(len(far)) < 0.5] *= -1
+                    y[far] = numpy.minimum(numpy.maximum(y[far] + step, model.col_lb[far]), model.col_ub[far])
+                last = y
+                # distance to y: +x_j at the lower bound, -x_j at the upper
+                # bound, ignoring integer columns strictly inside their bounds
+                c = numpy.zeros(model.n)
+                c[ints] = numpy.where(y[ints] <= model.col_lb[ints], 1.0,
+                    numpy.where(y[ints] >= model.col_ub[ints], -1.0, 0.0))
+                for j, v in enumerate(c.tolist()):
+                    glp_set_obj_coef(lp, j+1, v)
+                if glp_simplex(lp, self.smcp) != 0 or glp_get_status(lp) != GLP_OPT:
+                    return None
+                x = _fetch(glp_get_col_prim, lp, model.n)
+            return None
+
+        def __del__(self):
+            if self.lp is not None:
+                glp_delete_prob(self.lp)
+
+if _version >= (4, 20):
+    class Heuristics(object):
+        """Plug-in for intopt() running primal heuristics at GLP_IHEUR.
+
+        lp is the problem passed to intopt(). Each heuristic is a callable
+        heur(x, model) receiving the column values of the node LP solution
+        and a HeuristicModel, and returning a candidate solution or None.
+        Candidates are checked against the cached constraint matrix and
+        submitted with glp_ios_heur_sol if they improve on the incumbent.
+        A heuristic runs at every freq-th GLP_IHEUR call, at most max_calls
+        times and until it has used max_time seconds in total.
+        """
+        reasons = (GLP_IHEUR, GLP_IBINGO)
+
+        def __init__(self, lp, heuristics=(), tol=1e-6, tol_int=1e-5):
+            _require_numpy()
+            self.model = HeuristicModel(lp, tol, tol_int)
+            self.best = numpy.inf # incumbent objective times sense
+            self.heuristics = []
+            self.ncalls = 0
+            for heur in heuristics:
+                self.add(heur)
+
+        def add(self, heur, freq=1, max_calls=None, max_time=None):
+            """Register a heuristic with its frequency and effort limits."""
+            self.heuristics.append(dict(func=heur, freq=freq, max_calls=max_calls,
+                max_time=max_time, calls=0, time=0.0, found=0))
+
+        def __call__(self, tree, reason):
+            model = self.model
+            prob = glp_ios_get_prob(tree)
+            if reason == GLP_IBINGO:
+                self.best = min(self.best, model.sense*glp_get_obj_val(prob))
+                return
+            self.ncalls += 1
+            x = _fetch(glp_get_col_prim, prob, model.n)
+            for h in self.heuristics:
+                if self.ncalls % h['freq'] or (h['max_calls'] is not None and h['calls'] >= h['max_calls']) \
+                        or (h['max_time'] is not None and h['time'] >= h['max_time']):
+                    continue
+                start = time.time()
+                y = h['func'](x.copy(), model)
+                h['calls'] += 1
+                h['time'] += time.time() - start
+                if y is None or not model.feasible(y):
+                    continue
+                obj = model.sense*(numpy.dot(model.obj, y) + model.obj0)
+                if obj < self.best:
+                    buf = _padded(y, float)
+                    if glp_ios_heur_sol(tree, _double_p(buf)) == 0:
+                        self.best = obj
+                        h['found'] += 1
+
+
+#=============================================================================
+# Branching plug-ins
+#=============================================================================
+
+if _version >= (4, 33):
+    def _tree_size(tree):
+        # (active, current, total) subproblem counts of the tree
+        a_cnt, n_cnt, t_cnt = c_int(), c_int(), c_int()
+        glp_ios_tree_size(tree, byref(a_cnt), byref(n_cnt), byref(t_cnt))
+        return a_cnt.value, n_cnt.value, t_cnt.value
+
+    class PseudoCostBranching(object):
+        """Plug-in for intopt() choosing the branching variable at GLP_IBRANCH
+        by pseudo-costs, with strong branching at shallow levels.
+
+        Pseudo-costs (objective degradation per unit change, per column and
+        direction) are kept in NumPy arrays and learned from the LP bounds of
+        child subproblems. At levels up to strong_depth, the strong_cands
+        best candidates are evaluated by re-solving the subproblem LP with
+        at most strong_iters dual simplex iterations on a scratch copy,
+        infeasible children counting as pruned. Only children solved to
+        optimality update the pseudo-costs. The child
+        with the smaller estimated degradation is explored first. tree_size
+        holds glp_ios_tree_size's (a_cnt, n_cnt, t_cnt) of the last call.
+        """
+        reasons = (GLP_IBRANCH,)
+
+        def __init__(self, lp, strong_depth=3, strong_cands=8, strong_iters=50, tol_int=1e-5):
+            _require_numpy()
+            n = glp_get_num_cols(lp)
+            self.sense = glp_get_obj_dir(lp) == GLP_MIN and +1 or -1
+            self.is_int = _fetch(glp_get_col_kind, lp, n, numpy.intc) != GLP_CV
+            self.sum_up, self.sum_dn = numpy.zeros(n), numpy.zeros(n)
+            self.cnt_up, self.cnt_dn = numpy.zeros(n, int), numpy.zeros(n, int)
+            self.strong_depth, self.strong_cands = strong_depth, strong_cands
+            self.strong_iters, self.tol_int = strong_iters, tol_int
+            self.smcp = _quiet_smcp()
+            self.smcp.meth = GLP_DUAL
+            self.smcp.it_lim = strong_iters
+            self.pending = {} # node -> (j, x_j, objective, children seen)
+            self.m = glp_get_num_rows(lp)
+            self.scratch = None
+            self.tree_size = (0, 0, 0)
+
+        def pseudo_costs(self):
+            """Return the (down, up) pseudo-costs per column; columns without
+            observations get the average of the observed ones (or 1)."""
+            pc = []
+            for s, c in ((self.sum_dn, self.cnt_dn), (self.sum_up, self.cnt_up)):
+                seen = c > 0
+                avg = (s[seen]/c[seen]).mean() if seen.any() else 1.0
+                pc.append(numpy.where(seen, s/numpy.maximum(c, 1), avg))
+            return pc
+
+        def _update(self, j, up, dist, gain):
+            if dist > 0:
+                if up:
+                    self.sum_up[j] += gain/dist
+                    self.cnt_up[j] += 1
+                else:
+                    self.sum_dn[j] += gain/dist
+                    self.cnt_dn[j] += 1
+
+        def _learn(self, tree, prob, p, obj):
+            # learn from the objective change between p and its parent
+            q = glp_ios_up_node(tree, p)
+            info = self.pending.get(q)
+            if info is None:
+                return
+            j, xj, parent_obj, seen = info
+            up = glp_get_col_lb(prob, j+1) >= numpy.ceil(xj) - self.tol_int
+            dist = numpy.ceil(xj) - xj if up else xj - numpy.floor(xj)
+            self._update(j, up, dist, max(self.sense*(obj - parent_obj), 0.0))
+            if seen:
+                del self.pending[q]
+            else:
+                self.pending[q] = (j, xj, parent_obj, True)
+
+        def _copy(self, prob):
+            # scratch copy of prob: while prob has only the rows of the
+            # original problem, the copy is kept and only its bounds are
+            # updated; cut rows make a fresh copy necessary
+            m, n = glp_get_num_rows(prob), len(self.is_int)
+            lp = self.scratch
+            if lp is None:
+                lp = self.scratch = glp_create_prob()
+            elif m == self.m and glp_get_num_rows(lp) == m:
+                t, lb, ub = _fetch_bounds(prob, m, n)
+                set_row_bounds(lp, None, t[:m], lb[:m], ub[:m])
+                set_col_bounds(lp, None, t[m:], lb[m:], ub[m:])
+                return lp
+            glp_erase_prob(lp)
+            glp_copy_prob(lp, prob, GLP_OFF)
+            return lp
+
+        def _strong(self, prob, cands, x, obj, est):
+            # degradations (down, up) of the candidates by dual simplex solves
+            # from the optimal basis of prob; infeasible children get +inf.
+            # A solve stopped by the iteration limit gives an estimate that
+            # is not learned from, est is kept where the solve failed
+            lp = self._copy(prob)
+            m, n = glp_get_num_rows(prob), len(self.is_int)
+            row_stat = _fetch(glp_get_row_stat, prob, m, numpy.intc).tolist()
+            col_stat = _fetch(glp_get_col_stat, prob, n, numpy.intc).tolist()
+            gains = est.copy()
+            for r, j in enumerate(cands.tolist()):
+                t, lb, ub = glp_get_col_type(lp, j+1), glp_get_col_lb(lp, j+1), glp_get_col_ub(lp, j+1)
+                lo = lb if t in (GLP_LO, GLP_DB, GLP_FX) else -numpy.inf
+                hi = ub if t in (GLP_UP, GLP_DB, GLP_FX) else numpy.inf
+                for c, (l, u) in enumerate(((lo, numpy.floor(x[j])), (numpy.ceil(x[j]), hi))):
+                    for i in xrange(m):
+                        glp_set_row_stat(lp, i+1, row_stat[i])
+                    for k in xrange(n):
+                        glp_set_col_stat(lp, k+1, col_stat[k])
+                    glp_set_col_bnds(lp, j+1, _bnd_type(l, u),
+                        l if l != -numpy.inf else 0.0, u if u != numpy.inf else 0.0)
+                    ret = glp_simplex(lp, self.smcp)
+                    status = glp_get_status(lp)
+                    if ret == 0 and status == GLP_NOFEAS:
+                        gains[r, c] = numpy.inf
+                    elif ret == 0 and status == GLP_OPT:
+                        gains[r, c] = max(self.sense*(glp_get_obj_val(lp) - obj), 0.0)
+                        f = x[j] - numpy.floor(x[j])
+                        self._update(j, c == 1, 1.0 - f if c else f, gains[r, c])
+                    elif ret == GLP_EITLIM:
+                        gains[r, c] = max(self.sense*(glp_get_obj_val(lp) - obj), 0.0)
+                glp_set_col_bnds(lp, j+1, t, lb, ub)
+            return gains
+
+        def _prune(self, tree):
+            # drop the entries of nodes without active children, i.e. whose
+            # children were fathomed or removed; GLPK reuses node numbers
+            live = set()
+            p = glp_ios_next_node(tree, 0)
+            while p:
+                live.add(glp_ios_up_node(tree, p))
+                p = glp_ios_next_node(tree, p)
+            for q in [q for q in self.pending if q not in live]:
+                del self.pending[q]
+
+        def __call__(self, tree, reason):
+            self.tree_size = _tree_size(tree)
+            prob = glp_ios_get_prob(tree)
+            p = glp_ios_curr_node(tree)
+            obj = glp_get_obj_val(prob)
+            self._learn(tree, prob, p, obj)
+            if len(self.pending) > 2*self.tree_size[0] + 2:
+                self._prune(tree)
+            x = _fetch(glp_get_col_prim, prob, len(self.is_int))
+            f = x - numpy.floor(x)
+            frac = self.is_int & ~_is_integral(x, self.tol_int)
+            cands = numpy.array([j for j in numpy.flatnonzero(frac).tolist()
+                if glp_ios_can_branch(tree, j+1)], int)
+            if len(cands) == 0:
+                # GLPK branches on its own
+                self.pending.pop(p, None)
+                return
+            pc_dn, pc_up = self.pseudo_costs()
+            gains = numpy.column_stack((pc_dn[cands]*f[cands], pc_up[cands]*(1.0 - f[cands])))
+            if glp_ios_node_level(tree, p) <= self.strong_depth:
+                order = numpy.argsort(-numpy.maximum(gains, 1e-6).prod(axis=1))
+                top = order[:self.strong_cands]
+                gains[top] = self._strong(prob, cands[top], x, obj, gains[top])
+            score = numpy.maximum(gains, 1e-6).prod(axis=1)
+            r = score.argmax()
+            j = int(cands[r])
+            self.pending[p] = (j, x[j], obj, False)
+            sel = GLP_UP_BRNCH if gains[r, 1] < gains[r, 0] else GLP_DN_BRNCH
+            glp_ios_branch_upon(tree, j+1, sel)
+
+        def __del__(self):
+            if self.scratch is not None:
+                glp_delete_prob(self.scratch)
+
+
+#=============================================================================
+# Node selection plug-ins
+#=============================================================================
+
+if _version >= (4, 33):
+    class NodeSelection(object):
+        """Plug-in for intopt() selecting subproblems at GLP_ISELECT by a
+        hybrid of best-estimate search and depth-first diving.
+
+        The active list is indexed by a heap keyed by the estimated optimum
+        of each subproblem, its parent LP objective plus the pseudo-cost
+        degradation of the fractional columns (recorded at GLP_IBRANCH; unit
+        pseudo-costs unless branching is a PseudoCostBranching plug-in).
+        Only subproblems appended to the active list since the previous
+        selection are visited; the index is rebuilt when the incumbent
+        changes, as GLPK then prunes the tree, or when it lost track of the
+        active list. After every best-estimate pick, up to dive selections
+        continue depth-first from the tail of the active list; more than
+        max_active active subproblems force depth-first selection until the
+        list shrinks.
+        """
+        reasons = (GLP_IBRANCH, GLP_ISELECT)
+
+        def __init__(self, lp, branching=None, dive=3, max_active=None, tol_int=1e-5):
+            _require_numpy()
+            n = glp_get_num_cols(lp)
+            self.sense = glp_get_obj_dir(lp) == GLP_MIN and +1 or -1
+            self.is_int = _fetch(glp_get_col_kind, lp, n, numpy.intc) != GLP_CV
+            self.branching, self.dive = branching, dive
+            self.max_active, self.tol_int = max_active, tol_int
+            self.estimate = {} # branched node -> estimate inherited by its children
+            self.active = {} # active node -> stamp of its heap entry
+            self.heap = []
+            self.stamp = 0
+            self.dives = 0
+            self.incumbent = None
+            self.rebuilds = 0
+
+        def _estimate(self, tree):
+            # objective estimate of the best integer solution below the current node
+            prob = glp_ios_get_prob(tree)
+            x = _fetch(glp_get_col_prim, prob, len(self.is_int))
+            f = x - numpy.floor(x)
+            frac = self.is_int & ~_is_integral(x, self.tol_int)
+            if self.branching is None:
+                pc_dn = pc_up = numpy.ones(len(x))
+            else:
+                pc_dn, pc_up = self.branching.pseudo_costs()
+            f = f[frac]
+            cost = numpy.minimum(pc_dn[frac]*f, pc_up[frac]*(1.0 - f)).sum()
+            self.estimate[glp_ios_curr_node(tree)] = glp_get_obj_val(prob) + self.sense*cost
+
+        def _push(self, tree, p):
+            key = self.estimate.get(glp_ios_up_node(tree, p))
+            if key is None:
+                key = glp_ios_node_bound(tree, p)
+            self.stamp += 1
+            self.active[p] = self.stamp
+            heapq.heappush(self.heap, (self.sense*key, self.stamp, p))
+
+        def _rebuild(self, tree):
+            self.rebuilds += 1
+            self.active, self.heap = {}, []
+            p = glp_ios_next_node(tree, 0)
+            while p:
+                self._push(tree, p)
+                p = glp_ios_next_node(tree, p)
+
+        def _discover(self, tree):
+            # new subproblems are appended to the active list: walk back from
+            # its tail to the first one already indexed
+            new = []
+            p = glp_ios_prev_node(tree, 0)
+            while p and p not in self.active:
+                new.append(p)
+                p = glp_ios_prev_node(tree, p)
+            for p in reversed(new):
+                self._push(tree, p)
+
+        def _select(self, tree):
+            a_cnt = _tree_size(tree)[0]
+            prob = glp_ios_get_prob(tree)
+            incumbent = glp_mip_obj_val(prob) if glp_mip_status(prob) == GLP_FEAS else None
+            if incumbent != self.incumbent:
+                self.incumbent = incumbent
+                self._rebuild(tree)
+            else:
+                self._discover(tree)
+                if len(self.active) != a_cnt:
+                    self._rebuild(tree)
+            if self.dives < self.dive or (self.max_active and a_cnt > self.max_active):
+                self.dives += 1
+                p = glp_ios_prev_node(tree, 0)
+            else:
+                self.dives = 0
+                while True:
+                    key, stamp, p = heapq.heappop(self.heap)
+                    if self.active.get(p) == stamp:
+                        break
+            del self.active[p]
+            glp_ios_select_node(tree, p)
+
+        def __call__(self, tree, reason):
+            if reason == GLP_IBRANCH:
+                self._estimate(tree)
+            else:
+                self._select(tree)
+
+
+#=============================================================================
+# Anytime MIP solving
+#=============================================================================
+
+if _version >= (4, 33):
+    # improved incumbent reported by intopt_stream(): objective value, relative
+    # MIP gap, active/current/total subproblem counts, seconds since the
+    # start of the solve and column values (0-based)
+    IncumbentEvent = namedtuple('IncumbentEvent', 'obj gap a_cnt n_cnt t_cnt time x')
+
+    def _incumbent_obj(prob):
+        # objective value of the incumbent of prob, None if there is none.
+        # GLPK records incumbents found by its own heuristics and passed to
+        # glp_ios_heur_sol without a GLP_IBINGO call, so plug-ins following
+        # them compare this value at every call
+        if glp_mip_status(prob) in (GLP_FEAS, GLP_OPT):
+            return glp_mip_obj_val(prob)
+        return None
+
+    class _IncumbentStream(object):
+        # Plug-in queuing an IncumbentEvent whenever the incumbent changed
+        # since its last call, and terminating the search at the first call
+        # after stop is set.
+        reasons = (GLP_IROWGEN, GLP_IBINGO, GLP_IHEUR, GLP_ICUTGEN,
+            GLP_IBRANCH, GLP_ISELECT, GLP_IPREPRO)
+
+        def __init__(self, n, events):
+            self.n, self.events = n, events
+            self.start = time.time()
+            self.stop = False
+            self.obj = None
+            self.gap, self.tree_size = numpy.inf, (0, 0, 0)
+
+        def __call__(self, tree, reason):
+            if self.stop:
+                glp_ios_terminate(tree)
+                return
+            self.gap, self.tree_size = glp_ios_mip_gap(tree), _tree_size(tree)
+            self.report(glp_ios_get_prob(tree))
+
+        def report(self, prob):
+            obj = _incumbent_obj(prob)
+            if obj is not None and obj != self.obj:
+                self.obj = obj
+                a_cnt, n_cnt, t_cnt = self.tree_size
+                self.events.put(IncumbentEvent(obj, self.gap, a_cnt, n_cnt, t_cnt,
+                    time.time() - self.start, _fetch(glp_mip_col_val, prob, self.n)))
+
+    def intopt_stream(lp, parm=None, plugins=(), start=None):
+        """Solve MIP problem with intopt() in a worker thread, yielding an
+        IncumbentEvent for every improved integer solution as it is found.
+
+        Leaving the loop early (break, or closing the generator) terminates
+        the search with glp_ios_terminate; the best solution found so far
+        stays in lp. An exception raised by the solve is re-raised by the
+        generator. glp_intopt runs without the GIL, so the consuming thread
+        stays responsive between events.
+        """
+        events = Queue.Queue()
+        stream = _IncumbentStream(glp_get_num_cols(lp), events)
+        error = []
+        def worker():
+            try:
+                intopt(lp, parm, list(plugins) + [stream], start)
+                # an incumbent found after the last callback
+                if glp_mip_status(lp) == GLP_OPT:
+                    stream.gap = 0.0
+                stream.report(lp)
+            except Exception:
+                error.append(sys.exc_info())
+            events.put(None)
+        thread = threading.Thread(target=worker)
+        thread.daemon = True
+        thread.start()
+        try:
+            while True:
+                event = events.get()
+                if event is None:
+                    break
+                yield event
+        finally:
+            stream.stop = True
+            thread.join()
+        if error:
+            raise error[0][0], error[0][1], error[0][2]
+
+
+#=============================================================================
+# Solution pool
+#=============================================================================
+
+if _version >= (4, 33):
+    class SolutionPool(object):
+        """Plug-in for intopt() collecting the k best distinct integer
+        solutions met during the search.
+
+        Every incumbent is captured, whether GLPK records it at GLP_IBINGO or
+        from a heuristic or start solution, which happens without a
+        GLP_IBINGO call: the incumbent is compared at every callback.
+        Solutions are identified by a SHA-1 digest of their rounded integer
+        columns, so a solution seen twice is stored once; when more than k
+        are kept, the worst one is evicted together with its digest.
+        solutions() returns the (obj, x) pairs best first.
+
+        With fill set, the pool also takes the integer feasible subproblem
+        solutions at GLP_IROWGEN, before GLPK records them, and rejects each
+        with a no-good cut so that the search continues past it instead of
+        pruning with it. GLPK raises GLP_IBINGO right after GLP_IROWGEN for
+        such a subproblem and accepts glp_ios_add_row at GLP_ICUTGEN only,
+        so this cut is added to the subproblem as a row; the no-good cuts of
+        incumbents captured otherwise are passed to glp_ios_add_row at the
+        next GLP_ICUTGEN. Once k solutions are pooled, subproblems unable to
+        improve on the worst of them are cut off there as well, with an
+        objective row. The search is then the enumeration of the k best
+        solutions, except that incumbents found by GLPK's own heuristics
+        still prune it. fill requires all integer columns to be binary.
+        """
+        def __init__(self, lp, k=10, fill=False, tol_int=1e-5, tol_obj=1e-7):
+            _require_numpy()
+            n = glp_get_num_cols(lp)
+            self.k, self.fill = k, fill
+            self.tol_int, self.tol_obj = tol_int, tol_obj
+            self.sense = glp_get_obj_dir(lp) == GLP_MIN and +1 or -1
+            self.is_int = _fetch(glp_get_col_kind, lp, n, numpy.intc) != GLP_CV
+            if fill:
+                t, lb, ub = _fetch_bounds(lp, 0, n)
+                if ((lb < 0) | (ub > 1))[self.is_int].any():
+                    raise ValueError("fill requires all integer columns to be binary.")
+                # objective row used for cutoffs, with a leading pad entry
+                coef = _fetch(glp_get_obj_coef, lp, n)
+                nz = numpy.flatnonzero(coef)
+                self.ind = numpy.concatenate(([0], nz + 1)).astype(numpy.intc)
+                self.val = numpy.concatenate(([0.0], coef[nz]))
+            self.reasons = (GLP_IROWGEN, GLP_IBINGO, GLP_IHEUR, GLP_ICUTGEN,
+                GLP_IBRANCH, GLP_ISELECT, GLP_IPREPRO)
+            self.heap = [] # (-sense*obj, count, digest, x): the worst solution first
+            self.seen = set() # digests of the pooled solutions
+            self.count = 0
+            self.obj = None # of the last incumbent captured
+            self.nogoods = [] # solutions to cut off at the next GLP_ICUTGEN
+
+        def __len__(self):
+            return len(self.heap)
+
+        def worst(self):
+            """Objective value of the worst pooled solution times the
+            objective sense, or +inf while the pool is not full."""
+            if len(self.heap) < self.k:
+                return numpy.inf
+            return -self.heap[0][0]
+
+        def add(self, obj, x):
+            """Offer solution x with objective value obj to the pool, return
+            whether it was kept."""
+            x = numpy.array(x, float)
+            key = hashlib.sha1(numpy.floor(x[self.is_int] + 0.5).astype(numpy.int64).tobytes()).digest()
+            if key in self.seen:
+                return False
+            if self.sense*obj >= self.worst():
+                return False
+            self.count += 1
+            heapq.heappush(self.heap, (-self.sense*obj, self.count, key, x))
+            self.seen.add(key)
+            if len(self.heap) > self.k:
+                self.seen.discard(heapq.heappop(self.heap)[2])
+            return True
+
+        def solutions(self):
+            """Return the pooled (obj, x) pairs, best first."""
+            return [(-self.sense*item[0], item[3]) for item in sorted(self.heap, reverse=True)]
+
+        def _nogood(self, x):
+            # no-good cut excluding the binary assignment of x:
+            # sum of x_j over the zeros - sum over the ones >= 1 - #ones,
+            # as 0-based columns, coefficients and right-hand side
+            cols = numpy.flatnonzero(self.is_int)
+            ones = numpy.floor(x[cols] + 0.5) > 0.5
+            return cols, numpy.where(ones, -1.0, 1.0), 1.0 - ones.sum()
+
+        def _capture(self, prob):
+            # pool the incumbent of prob if it changed since the last call
+            obj = _incumbent_obj(prob)
+            if obj is None or obj == self.obj:
+                return
+            self.obj = obj
+            x = _fetch(glp_mip_col_val, prob, len(self.is_int))
+            if self.add(obj, x) and self.fill:
+                self.nogoods.append(x)
+
+        def __call__(self, tree, reason):
+            prob = glp_ios_get_prob(tree)
+            self._capture(prob)
+            if not self.fill:
+                return
+            obj = glp_get_obj_val(prob)
+            if reason == GLP_ICUTGEN:
+                for x in self.nogoods:
+                    cols, data, rhs = self._nogood(x)
+                    glp_ios_add_row(tree, None, 0, 0, len(cols), _int_p(_padded(cols, numpy.intc, 1)),
+                        _double_p(_padded(data, float)), GLP_LO, rhs)
+                self.nogoods = []
+                if len(self.heap) < self.k:
+                    return
+                cutoff = self.worst() - self.tol_obj*(1.0 + abs(self.worst()))
+                if self.sense*obj > cutoff:
+                    rhs = self.sense*cutoff - glp_get_obj_coef(prob, 0)
+                    glp_ios_add_row(tree, None, 0, 0, len(self.ind) - 1, _int_p(self.ind),
+                        _double_p(self.val), self.sense > 0 and GLP_UP or GLP_LO, rhs)
+            elif reason == GLP_IROWGEN:
+                x = _fetch(glp_get_col_prim, prob, len(self.is_int))
+                if _is_integral(x[self.is_int], self.tol_int).all():
+                    self.add(obj, x)
+                    cols, data, rhs = self._nogood(x)
+                    _add_rows_csr(prob, [0, len(cols)], cols, data, rhs)
+
+
+#=============================================================================
+# Checkpoint and resume
+#=============================================================================
+
+if _version >= (4, 33):
+    def _replace(path, write, mode='wb'):
+        # write(f) to path + '.tmp', then rename it to path atomically
+        f = open(path + '.tmp', mode)
+        try:
+            write(f)
+        finally:
+            f.close()
+        os.rename(path + '.tmp', path)
+
+    class Checkpoint(object):
+        """Plug-in for intopt() saving the search progress every interval
+        seconds, for resume() to restart from after an interruption.
+
+        Two files are written, each atomically:
+        - path + '.mip', the incumbent in the plain text format of
+          glp_write_mip, readable by glp_read_mip;
+        - path + '.npz', the rows appended to the problem by the end of the
+          root node (cuts, lazy constraints), the root LP basis of the
+          problem with these rows and the last MIP gap and tree size.
+        Only root rows are kept, as rows added deeper in the tree may be
+        valid in their subtree only. For the same reason the saved basis is
+        the final one of the root LP, not that of the last node solved,
+        which belongs to the bounds and rows of that node. Incumbents are
+        taken from glp_mip_*_val, where GLPK stores them with the integer
+        columns rounded, whenever the incumbent objective changed since the
+        last call: GLPK records heuristic and start solutions without a
+        GLP_IBINGO call. Call write() for a final checkpoint.
+        """
+        reasons = (GLP_IROWGEN, GLP_IBINGO, GLP_IHEUR, GLP_ICUTGEN,
+            GLP_IBRANCH, GLP_ISELECT, GLP_IPREPRO)
+
+        def __init__(self, lp, path, interval=600.0):
+            _require_numpy()
+            self.lp = lp
+            self.m, self.n = glp_get_num_rows(lp), glp_get_num_cols(lp)
+            self.path, self.interval = path, interval
+            self.last = time.time()
+            self.obj = self.x = self.row_x = None
+            self.cuts = self.stat = None
+            self.gap, self.tree_size = numpy.inf, (0, 0, 0)
+            self.dirty = False
+
+        def _capture(self, prob):
+            # take the incumbent of prob if it changed since the last call
+            obj = _incumbent_obj(prob)
+            if obj is not None and obj != self.obj:
+                self.obj = obj
+                self.x = _fetch(glp_mip_col_val, prob, self.n)
+                self.row_x = _fetch(glp_mip_row_val, prob, self.m)
+                self.dirty = True
+
+        def __call__(self, tree, reason):
+            prob = glp_ios_get_prob(tree)
+            self._capture(prob)
+            if reason == GLP_IBRANCH and self.stat is None and \
+                    glp_ios_node_level(tree, glp_ios_curr_node(tree)) == 0:
+                mm = glp_get_num_rows(prob)
+                t, lb, ub = _fetch_bounds(prob, mm, 0)
+                self.cuts = _get_csr(prob, mm, self.m+1) + (lb[self.m:], ub[self.m:])
+                self.stat = numpy.concatenate((_fetch(glp_get_row_stat, prob, mm, numpy.intc),
+                    _fetch(glp_get_col_stat, prob, self.n, numpy.intc)))
+                self.dirty = True
+            if self.dirty and time.time() - self.last >= self.interval:
+                self.gap = glp_ios_mip_gap(tree)
+                self.tree_size = _tree_size(tree)
+                self.write()
+
+        def _write_mip(self, f):
+            # same layout as glp_write_mip
+            if _version >= (4, 57):
+                # "s mip m n f obj", then "i i value" per row and "j j value"
+                # per column, ended by "e o f"
+                f.write('s mip %d %d f %.15g\n' % (self.m, self.n, self.obj))
+                for i, v in enumerate(self.row_x.tolist()):
+                    f.write('i %d %.15g\n' % (i+1, v))
+                for j, v in enumerate(self.x.tolist()):
+                    f.write('j %d %.15g\n' % (j+1, v))
+                f.write('e o f\n')
+                return
+            # "m n", "status obj", then the row and column values, one per line
+            f.write('%d %d\n' % (self.m, self.n))
+            f.write('%d %.15g\n' % (GLP_FEAS, self.obj))
+            for v in self.row_x.tolist() + self.x.tolist():
+                f.write('%.15g\n' % v)
+
+        def _write_npz(self, f):
+            arrays = {}
+            if self.stat is not None:
+                indptr, indices, data, lb, ub = self.cuts
+                arrays.update(cut_indptr=indptr, cut_indices=indices, cut_data=data,
+                    cut_lb=lb, cut_ub=ub, stat=self.stat)
+            numpy.savez(f, size=numpy.array([self.m, self.n]), gap=numpy.array(self.gap),
+                tree_size=numpy.array(self.tree_size), **arrays)
+
+        def write(self):
+            """Write the checkpoint files now."""
+            self._capture(self.lp)
+            if self.x is not None:
+                _replace(self.path + '.mip', self._write_mip, 'w')
+            _replace(self.path + '.npz', self._write_npz)
+            self.last = time.time()
+            self.dirty = False
+
+    def resume(lp, path, parm=None, plugins=(), smcp=None):
+        """Solve MIP problem with intopt() from the checkpoint written by a
+        Checkpoint plug-in to path.
+
+        The saved root rows are appended to lp and the root LP is
+        re-optimized from the saved basis; the saved incumbent is given as
+        start solution, so that pruning starts immediately. The appended
+        rows are valid inequalities, and can be removed with glp_del_rows
+        once the solve is over. Returns the value returned by intopt().
+        """
+        _require_numpy()
+        m, n = glp_get_num_rows(lp), glp_get_num_cols(lp)
+        f = numpy.load(path + '.npz')
+        if f['size'].tolist() != [m, n]:
+            raise ValueError("The checkpoint does not match the problem size.")
+        start = None
+        if os.path.exists(path + '.mip'):
+            # read before appending rows, as the file holds m row values
+            if glp_read_mip(lp, path + '.mip') != 0:
+                raise IOError("Cannot read the incumbent from %s.mip" % path)
+            start = _fetch(glp_mip_col_val, lp, n)
+        if 'stat' in f.files:
+            _add_rows_csr(lp, f['cut_indptr'], f['cut_indices'], f['cut_data'],
+                f['cut_lb'], f['cut_ub'])
+            stat = f['stat'].tolist()
+            mm = len(stat) - n
+            for i in xrange(1, mm+1):
+                glp_set_row_stat(lp, i, stat[i-1])
+            for j in xrange(1, n+1):
+                glp_set_col_stat(lp, j, stat[mm+j-1])
+        if smcp is None:
+            smcp = _quiet_smcp()
+        ret = glp_simplex(lp, smcp)
+        if ret != 0:
+            return ret
+        return intopt(lp, parm, plugins, start)
+
+
+#=============================================================================
+# Presolve
+#=============================================================================
+
+if _version >= (4, 16):
+    def _bnd_types(lb, ub):
+        # vectorized _bnd_type
+        return numpy.where(lb == -numpy.inf, numpy.where(ub == numpy.inf, GLP_FR, GLP_UP),
+            numpy.where(ub == numpy.inf, GLP_LO, numpy.where(lb == ub, GLP_FX, GLP_DB))).astype(numpy.intc)
+
+    def _activity_bounds(I, J, A, lb, ub, m):
+        # finite parts and numbers of infinite terms of the minimum and
+        # maximum row activities over the column bounds lb, ub
+        lo = numpy.where(A > 0, lb[J], ub[J])*A
+        hi = numpy.where(A > 0, ub[J], lb[J])*A
+        lo_inf, hi_inf = numpy.isinf(lo), numpy.isinf(hi)
+        return (numpy.bincount(I, numpy.where(lo_inf, 0.0, lo), m), numpy.bincount(I, lo_inf, m),
+            numpy.bincount(I, numpy.where(hi_inf, 0.0, hi), m), numpy.bincount(I, hi_inf, m),
+            lo, hi, lo_inf, hi_inf)
+
+    class Postsolve(object):
+        """Map from the solutions of a problem reduced by presolve() back to
+        the original problem.
+
+        rows and cols are the (0-based) original numbers of the rows and
+        columns kept in the reduced problem, in order.
+        """
+        def __init__(self, **kw):
+            self.__dict__.update(kw)
+
+        def restore(self, x, y=None, stat=None):
+            """Return (x, y, stat) for the original problem, given the column
+            values x, the row duals y and the statuses stat (rows first) of a
+            basic solution of the reduced problem; y and stat are optional
+            and come back as None if missing.
+
+            A removed row whose singleton bound on a column is active takes
+            over the reduced cost of the column as its dual, and becomes
+            nonbasic in place of the column. Other removed rows are basic
+            with a zero dual, removed columns nonbasic at their value.
+            Columns nonbasic at a bound the original problem does not have
+            (a tightened integer bound) become nonbasic at the original
+            bound they are at, or basic.
+            """
+            m, n = self.m, len(self.fixed)
+            mr = len(self.rows)
+            X = self.fixed.copy()
+            X[self.cols] = x
+            # columns held at a bound taken from a removed singleton row
+            tol = self.tol*(1.0 + abs(X))
+            at_lb = (self.lb_src >= 0) & (abs(X - self.col_lb) <= tol)
+            at_ub = (self.ub_src >= 0) & (abs(X - self.col_ub) <= tol)
+            if stat is not None:
+                cstat = numpy.zeros(n, numpy.intc)
+                cstat[self.cols] = stat[mr:]
+                kept = cstat != 0
+                at_lb &= ~kept | (cstat == GLP_NL) | (cstat == GLP_NS)
+                at_ub &= ~kept | (cstat == GLP_NU) | (cstat == GLP_NS)
+            Y = d = None
+            if y is not None:
+                Y = numpy.zeros(m)
+                Y[self.rows] = y
+                d = self.obj - numpy.bincount(self.ja, self.ar*Y[self.ia], n)
+                both = at_lb & at_ub
+                at_lb[both] = self.sense*d[both] >= 0
+                at_ub[both] = ~at_lb[both]
+            else:
+                at_ub &= ~at_lb
+            j = numpy.concatenate((numpy.flatnonzero(at_lb), numpy.flatnonzero(at_ub)))
+            i = numpy.concatenate((self.lb_src[at_lb], self.ub_src[at_ub]))
+            a = self.single_a[i]
+            if Y is not None:
+                Y[i] = d[j]/a
+            S = None
+            if stat is not None:
+                S = numpy.zeros(m+n, numpy.intc)
+                S[:m] = GLP_BS
+                S[self.rows] = stat[:mr]
+                S[m:] = self.fixed_stat
+                S[m+self.cols] = stat[mr:]
+                c = S[m:]
+                on_lb = abs(X - self.orig_lb) <= tol
+                on_ub = abs(X - self.orig_ub) <= tol
+                nb = (c == GLP_NL) | (c == GLP_NU) | (c == GLP_NS)
+                c[nb] = numpy.select([on_lb & on_ub, on_lb, on_ub],
+                    [GLP_NS, GLP_NL, GLP_NU], GLP_BS)[nb]
+                S[m+j] = GLP_BS
+                lower = (a > 0) == numpy.concatenate((numpy.ones(at_lb.sum(), bool),
+                    numpy.zeros(at_ub.sum(), bool)))
+                S[i] = numpy.where(self.row_type[i] == GLP_FX, GLP_NS,
+                    numpy.where(lower, GLP_NL, GLP_NU))
+            return X, Y, S
+
+        def solution(self, lp):
+            """Restore the basic solution of the reduced problem object lp,
+            see restore()."""
+            mr, nr = len(self.rows), len(self.cols)
+            stat, prim, dual = _fetch_basic_solution(lp, mr, nr)
+            return self.restore(prim[mr:], dual[:mr], stat)
+
+        def warm_start(self, lp, stat):
+            """Set the statuses stat (rows first, as returned by restore())
+            as the basis of the original problem object lp."""
+            stat = numpy.asarray(stat).tolist()
+            for i in xrange(self.m):
+                glp_set_row_stat(lp, i+1, stat[i])
+            for j in xrange(len(stat) - self.m):
+                glp_set_col_stat(lp, j+1, stat[self.m+j])
+
+    def presolve(data, lp=None, max_pass=20, tol=1e-9, mip=False):
+        """Reduce the problem held by the ProblemData data before it is
+        loaded, and return (lp, postsolve): the reduced problem loaded into
+        lp (a new problem object if None) and a Postsolve mapping its
+        solutions back to the original problem.
+
+        Each pass removes empty rows, singleton rows (turned into column
+        bounds), fixed columns (substituted into the row bounds and the
+        objective constant), dominated columns (fixed at the bound their
+        objective coefficient pushes them to when no row limits that move)
+        and rows made redundant by the bounds of their columns. Unlike the
+        presolver of glp_simplex, the basis can be restored. ValueError is
+        raised if the problem is found to be infeasible.
+
+        If mip is true, the bounds of integer columns are also rounded and
+        tightened from the row activity bounds. This keeps the integer
+        solutions but changes the LP relaxation, so only pass it when the
+        reduced problem is solved as a MIP. Otherwise integer columns are
+        reduced like continuous ones, and the restored basic solution is
+        that of the LP relaxation of data.
+        """
+        _require_numpy()
+        m, n = len(data.row_type), len(data.col_type)
+        sense = data.obj_dir == GLP_MIN and +1 or -1
+        nz = data.ar != 0
+        ia, ja, ar = data.ia[nz], data.ja[nz], data.ar[nz]
+        row_lb, row_ub = numpy.array(data.row_lb, float), numpy.array(data.row_ub, float)
+        col_lb, col_ub = numpy.array(data.col_lb, float), numpy.array(data.col_ub, float)
+        is_int = (data.col_kind != GLP_CV) if mip else numpy.zeros(n, bool)
+        cost = sense*data.obj
+        row_alive, col_alive = numpy.ones(m, bool), numpy.ones(n, bool)
+        fixed, fixed_stat = numpy.zeros(n), numpy.zeros(n, numpy.intc)
+        lb_src, ub_src = numpy.zeros(n, int) - 1, numpy.zeros(n, int) - 1
+        single_a = numpy.zeros(m)
+        obj0 = data.obj0
+
+        def infeasible(what, k):
+            names = data.row_names if what == 'row' else data.col_names
+            name = names and names[k] or '#%d' % (k+1)
+            raise ValueError("The problem is infeasible (%s %s)." % (what, name))
+
+        def fix(cols, values, stat, I, J, A):
+            # remove columns at the given values, moving them to the row bounds
+            fixed[cols], fixed_stat[cols] = values, stat
+            col_alive[cols] = False
+            k = numpy.zeros(n, bool)
+            k[cols] = True
+            k = k[J]
+            shift = numpy.bincount(I[k], A[k]*fixed[J[k]], m)
+            row_lb[:] -= shift
+            row_ub[:] -= shift
+            return float(numpy.dot(data.obj[cols], values))
+
+        for k in xrange(max_pass):
+            changed = False
+            live = row_alive[ia] & col_alive[ja]
+            I, J, A = ia[live], ja[live], ar[live]
+            count = numpy.bincount(I, minlength=m)
+
+            # empty rows
+            empty = row_alive & (count == 0)
+            bad = empty & ((row_lb > tol) | (row_ub < -tol))
+            if bad.any():
+                infeasible('row', numpy.flatnonzero(bad)[0])
+            row_alive[empty] = False
+
+            # singleton rows, turned into bounds of their column
+            single = (row_alive & (count == 1))[I]
+            if single.any():
+                si, sj, sa = I[single], J[single], A[single]
+                lo, hi = row_lb[si]/sa, row_ub[si]/sa
+                lo, hi = numpy.where(sa > 0, lo, hi), numpy.where(sa > 0, hi, lo)
+                raw_lo, raw_hi = lo.copy(), hi.copy()
+                r = is_int[sj]
+                lo[r], hi[r] = numpy.ceil(lo[r] - tol), numpy.floor(hi[r] + tol)
+                single_a[si] = sa
+                for bound, src, new, raw, sign in ((col_lb, lb_src, lo, raw_lo, +1),
+                        (col_ub, ub_src, hi, raw_hi, -1)):
+                    # the tightest new bound of each column wins
+                    order = numpy.lexsort((sign*new, sj))
+                    last = numpy.ones(len(order), bool)
+                    last[:-1] = sj[order][1:] != sj[order][:-1]
+                    best = order[last]
+                    best = best[sign*(new[best] - bound[sj[best]]) > tol*(1.0 + abs(new[best]))]
+                    bound[sj[best]] = new[best]
+                    # a rounded bound is not the one of the row
+                    src[sj[best]] = numpy.where(new[best] == raw[best], si[best], -1)
+                row_alive[si] = False
+                changed = True
+            bad = col_alive & (col_lb > col_ub + tol*(1.0 + abs(col_lb)))
+            if bad.any():
+                infeasible('column', numpy.flatnonzero(bad)[0])
+
+            # fixed columns
+            cols = numpy.flatnonzero(col_alive & (col_ub - col_lb <= tol*(1.0 + abs(col_lb))))
+            if len(cols):
+                obj0 += fix(cols, col_lb[cols], GLP_NS, I, J, A)
+                changed = True
+
+            # dominated columns: no row limits the move the objective asks for
+            live = row_alive[I] & col_alive[J]
+            I, J, A = I[live], J[live], A[live]
+            up_limited = numpy.where(A > 0, row_ub[I] < numpy.inf, row_lb[I] > -numpy.inf)
+            dn_limited = numpy.where(A > 0, row_lb[I] > -numpy.inf, row_ub[I] < numpy.inf)
+            up_free = numpy.bincount(J, up_limited, n) == 0
+            dn_free = numpy.bincount(J, dn_limited, n) == 0
+            to_lb = col_alive & dn_free & (cost >= 0) & (col_lb > -numpy.inf)
+            to_ub = col_alive & up_free & (cost <= 0) & (col_ub < numpy.inf) & ~to_lb
+            free = col_alive & dn_free & up_free & (cost == 0) & ~to_lb & ~to_ub
+            for mask, value, stat in ((to_lb, col_lb, GLP_NL), (to_ub, col_ub, GLP_NU),
+                    (free, numpy.zeros(n), GLP_NF)):
+                cols = numpy.flatnonzero(mask)
+                if len(cols):
+                    obj0 += fix(cols, value[cols], stat, I, J, A)
+                    changed = True
+
+            # redundant rows and integer bound tightening from activity bounds
+            live = row_alive[I] & col_alive[J]
+            I, J, A = I[live], J[live], A[live]
+            lo_fin, lo_cnt, hi_fin, hi_cnt, lo, hi, lo_inf, hi_inf = \
+                _activity_bounds(I, J, A, col_lb, col_ub, m)
+            lo_act = numpy.where(lo_cnt > 0, -numpy.inf, lo_fin)
+            hi_act = numpy.where(hi_cnt > 0, numpy.inf, hi_fin)
+            bad = row_alive & ((lo_act > row_ub + tol*(1.0 + abs(row_ub))) |
+                (hi_act < row_lb - tol*(1.0 + abs(row_lb))))
+            if bad.any():
+                infeasible('row', numpy.flatnonzero(bad)[0])
+            redundant = row_alive & (lo_act >= row_lb - tol*(1.0 + abs(row_lb))) & \
+                (hi_act <= row_ub + tol*(1.0 + abs(row_ub)))
+            if redundant.any():
+                row_alive[redundant] = False
+                changed = True
+            r = is_int[J] & ~redundant[I]
+            if r.any():
+                I, J, A = I[r], J[r], A[r]
+                lo, hi, lo_inf, hi_inf = lo[r], hi[r], lo_inf[r], hi_inf[r]
+                # activity bounds of the other terms of the row
+                lo_rest = numpy.where(lo_inf, numpy.where(lo_cnt[I] == 1, lo_fin[I], -numpy.inf),
+                    numpy.where(lo_cnt[I] == 0, lo_fin[I] - numpy.where(lo_inf, 0.0, lo), -numpy.inf))
+                hi_rest = numpy.where(hi_inf, numpy.where(hi_cnt[I] == 1, hi_fin[I], numpy.inf),
+                    numpy.where(hi_cnt[I] == 0, hi_fin[I] - numpy.where(hi_inf, 0.0, hi), numpy.inf))
+                a_ub = (row_ub[I] - lo_rest)/A
+                a_lb = (row_lb[I] - hi_rest)/A
+                new_ub = numpy.floor(numpy.where(A > 0, a_ub, a_lb) + tol)
+                new_lb = numpy.ceil(numpy.where(A > 0, a_lb, a_ub) - tol)
+                new_ub[numpy.isnan(new_ub)] = numpy.inf
+                new_lb[numpy.isnan(new_lb)] = -numpy.inf
+                old_lb, old_ub = col_lb.copy(), col_ub.copy()
+                numpy.minimum.at(col_ub, J, new_ub)
+                numpy.maximum.at(col_lb, J, new_lb)
+                # these bounds no longer come from singleton rows
+                ub_src[col_ub < old_ub] = -1
+                lb_src[col_lb > old_lb] = -1
+                if (col_ub < old_ub).any() or (col_lb > old_lb).any():
+                    changed = True
+            if not changed:
+                break
+
+        rows, cols = numpy.flatnonzero(row_alive), numpy.flatnonzero(col_alive)
+        row_map, col_map = numpy.zeros(m, numpy.intc) - 1, numpy.zeros(n, numpy.intc) - 1
+        row_map[rows] = numpy.arange(len(rows))
+        col_map[cols] = numpy.arange(len(cols))
+        live = row_alive[ia] & col_alive[ja]
+        rlb, rub, clb, cub = row_lb[rows], row_ub[rows], col_lb[cols], col_ub[cols]
+        reduced = ProblemData(name=data.name, obj_dir=data.obj_dir, obj0=obj0,
+            obj=data.obj[cols], row_type=_bnd_types(rlb, rub), row_lb=rlb, row_ub=rub,
+            col_type=_bnd_types(clb, cub), col_lb=clb, col_ub=cub,
+            col_kind=data.col_kind[cols], ia=row_map[ia[live]], ja=col_map[ja[live]], ar=ar[live])
+        if data.row_names is not None:
+            reduced.row_names = [data.row_names[i] for i in rows.tolist()]
+        if data.col_names is not None:
+            reduced.col_names = [data.col_names[j] for j in cols.tolist()]
+        fixed[cols] = numpy.nan
+        postsolve = Postsolve(m=m, rows=rows, cols=cols, sense=sense, tol=max(tol, 1e-7),
+            obj=data.obj, ia=ia, ja=ja, ar=ar, row_type=data.row_type,
+            col_lb=col_lb, col_ub=col_ub, orig_lb=data.col_lb, orig_ub=data.col_ub,
+            lb_src=lb_src, ub_src=ub_src, single_a=single_a,
+            fixed=fixed, fixed_stat=fixed_stat, reduced=reduced)
+        return reduced.load(lp), postsolve
+
+
+#=============================================================================
+# Scaling
+#=============================================================================
+
+if _version >= (4, 18):
+    # magnitude statistics of a (scaled) constraint matrix: smallest and
+    # largest absolute value, their ratio, and the largest such ratio within
+    # a row and within a column
+    ScalingStats = namedtuple('ScalingStats', 'min_abs max_abs ratio row_ratio col_ratio')
+
+    def _extremes(index, values, count):
+        # per-group minimum and maximum of values, 1.0 for empty groups
+        lo, hi = numpy.zeros(count) + numpy.inf, numpy.zeros(count)
+        numpy.minimum.at(lo, index, values)
+        numpy.maximum.at(hi, index, values)
+        empty = hi == 0
+        lo[empty], hi[empty] = 1.0, 1.0
+        return lo, hi
+
+    def scaling_stats(indptr, rows, data, m, r=None, s=None):
+        """Return the ScalingStats of the matrix given in CSC form (0-based
+        row indices) with m rows, scaled by the row factors r and column
+        factors s if given."""
+        _require_numpy()
+        n = len(indptr) - 1
+        cols = numpy.repeat(numpy.arange(n), numpy.diff(indptr))
+        a = abs(numpy.asarray(data, float))
+        if r is not None:
+            a = a*numpy.asarray(r)[rows]
+        if s is not None:
+            a = a*numpy.asarray(s)[cols]
+        keep = a != 0
+        rows, cols, a = numpy.asarray(rows)[keep], cols[keep], a[keep]
+        if not len(a):
+            return ScalingStats(1.0, 1.0, 1.0, 1.0, 1.0)
+        row_lo, row_hi = _extremes(rows, a, m)
+        col_lo, col_hi = _extremes(cols, a, n)
+        return ScalingStats(float(a.min()), float(a.max()), float(a.max()/a.min()),
+            float((row_hi/row_lo).max()), float((col_hi/col_lo).max()))
+
+    def _curtis_reid(rows, cols, a, m, n, iters, tol):
+        # least squares fit of log2|a_ij| + rho_i + gamma_j = 0, solved by
+        # conjugate gradients on the normal equations with a diagonal
+        # preconditioner
+        la = numpy.log2(a)
+        nr = numpy.bincount(rows, minlength=m).astype(float)
+        nc = numpy.bincount(cols, minlength=n).astype(float)
+        diag = numpy.concatenate((nr, nc))
+        diag[diag == 0] = 1.0
+        def matvec(v):
+            rho, gamma = v[:m], v[m:]
+            return numpy.concatenate((nr*rho + numpy.bincount(rows, gamma[cols], m),
+                nc*gamma + numpy.bincount(cols, rho[rows], n)))
+        b = -numpy.concatenate((numpy.bincount(rows, la, m), numpy.bincount(cols, la, n)))
+        v = numpy.zeros(m+n)
+        res = b.copy()
+        z = res/diag
+        p = z.copy()
+        rz = numpy.dot(res, z)
+        bnorm = numpy.sqrt(numpy.dot(b, b)) or 1.0
+        for k in xrange(iters):
+            if numpy.sqrt(numpy.dot(res, res)) <= tol*bnorm:
+                break
+            q = matvec(p)
+            alpha = rz/numpy.dot(p, q)
+            v += alpha*p
+            res -= alpha*q
+            z = res/diag
+            rz, rz_old = numpy.dot(res, z), rz
+            p = z + (rz/rz_old)*p
+        return numpy.exp2(v[:m]), numpy.exp2(v[m:])
+
+    def scale_factors(indptr, rows, data, m, method='gm', passes=15, round2=True, tol=1e-6):
+        """Compute scale factors (r, s) for the rows and columns of the
+        matrix given in CSC form (0-based row indices) with m rows, so that
+        the scaled matrix is diag(r)*A*diag(s).
+
+        method is 'gm' (passes rounds of geometric mean scaling), 'eq'
+        (equilibration, the largest magnitude of each row and column
+        becoming 1) or 'cr' (Curtis-Reid least squares scaling, with at
+        most passes conjugate gradient iterations per row and column). With
+        round2, factors are rounded to powers of two, scaling then being
+        exact in floating point. Empty rows and columns get factor 1.
+        """
+        _require_numpy()
+        n = len(indptr) - 1
+        cols = numpy.repeat(numpy.arange(n), numpy.diff(indptr))
+        a = abs(numpy.asarray(data, float))
+        keep = a != 0
+        rows, cols, a = numpy.asarray(rows)[keep], cols[keep], a[keep]
+        r, s = numpy.ones(m), numpy.ones(n)
+        if method == 'gm':
+            for k in xrange(passes):
+                lo, hi = _extremes(rows, a*s[cols], m)
+                r = 1.0/numpy.sqrt(lo*hi)
+                lo, hi = _extremes(cols, a*r[rows], n)
+                s = 1.0/numpy.sqrt(lo*hi)
+        elif method == 'eq':
+            lo, hi = _extremes(rows, a, m)
+            r = 1.0/hi
+            lo, hi = _extremes(cols, a*r[rows], n)
+            s = 1.0/hi
+        elif method == 'cr':
+            r, s = _curtis_reid(rows, cols, a, m, n, passes*(m+n), tol)
+        else:
+            raise ValueError("Unknown scaling method %r." % (method,))
+        if round2:
+            r, s = numpy.exp2(numpy.round(numpy.log2(r))), numpy.exp2(numpy.round(numpy.log2(s)))
+        return r, s
+
+    def scale(lp, method='gm', passes=15, round2=True, data=None):
+        """Scale problem object lp with scale_factors() and apply the factors
+        with glp_set_rii/glp_set_sjj, returning the ScalingStats of the
+        matrix before (with the factors in place until then) and after.
+
+        data is an optional ProblemData of lp, saving reading the matrix
+        back from GLPK.
+        """
+        _require_numpy()
+        m, n = glp_get_num_rows(lp), glp_get_num_cols(lp)
+        if data is None:
+            indptr, rows, values = _get_csc(lp, n)
+        else:
+            indptr = numpy.concatenate(([0], numpy.cumsum(numpy.bincount(data.ja, minlength=n))))
+            rows, values = data.ia, data.ar
+        before = scaling_stats(indptr, rows, values, m,
+            _fetch(glp_get_rii, lp, m), _fetch(glp_get_sjj, lp, n))
+        r, s = scale_factors(indptr, rows, values, m, method, passes, round2)
+        set_rii, set_sjj = glp_set_rii, glp_set_sjj
+        for i, v in enumerate(r.tolist()):
+            set_rii(lp, i+1, v)
+        for j, v in enumerate(s.tolist()):
+            set_sjj(lp, j+1, v)
+        return before, scaling_stats(indptr, rows, values, m, r, s)
+
+
+#=============================================================================
+# Conditioning analysis
+#=============================================================================
+
+if _version >= (4, 16):
+    def _decades(values):
+        # histogram of the nonzero magnitudes by power of ten, as a list of
+        # (exponent, count) pairs
+        a = abs(numpy.asarray(values, float))
+        a = a[(a != 0) & ~numpy.isinf(a)]
+        if not len(a):
+            return []
+        e = numpy.floor(numpy.log10(a)).astype(int)
+        counts = numpy.bincount(e - e.min())
+        return [(k + int(e.min()), int(c)) for k, c in enumerate(counts.tolist()) if c]
+
+    class ConditioningReport(object):
+        """Numerical conditioning of a problem, as computed by
+        analyze_conditioning().
+
+        histograms maps 'matrix', 'objective' and 'bounds' to the (exponent,
+        count) pairs of the magnitudes of the coefficients, objective
+        coefficients and finite row/column bounds by power of ten.
+        row_range and col_range are the ratios of the largest to smallest
+        magnitude in each row and column (1 when empty); worst_rows and
+        worst_cols are the (name or number, ratio) pairs of the top ones.
+        big_m holds (row, column, value) triples of the suspected big-M
+        coefficients, big_bounds the (row or column, value) pairs of the
+        suspiciously large bounds.
+        """
+        def __init__(self, **kw):
+            self.__dict__.update(kw)
+
+        def __str__(self):
+            lines = ['coefficient range [%.3g, %.3g], ratio %.3g' % (self.min_abs,
+                self.max_abs, self.max_abs/self.min_abs)]
+            for key in ('matrix', 'objective', 'bounds'):
+                lines.append('%-9s %s' % (key, ' '.join('1e%+d:%d' % p for p in self.histograms[key])))
+            for what, worst in (('row', self.worst_rows), ('column', self.worst_cols)):
+                for name, ratio in worst:
+                    lines.append('%s %s: range %.3g' % (what, name, ratio))
+            for row, col, value in self.big_m:
+                lines.append('big-M %.3g in row %s, column %s' % (value, row, col))
+            for name, value in self.big_bounds:
+                lines.append('large bound %.3g on %s' % (value, name))
+            return '\n'.join(lines)
+
+    def analyze_conditioning(lp, top=10, big_m=1e6, data=None):
+        """Analyze the magnitudes of the coefficients of problem object lp
+        and return a ConditioningReport.
+
+        Rows and columns are named by their name or, if unnamed, their
+        number. A coefficient is a suspected big-M if its magnitude is at
+        least big_m and it multiplies a binary column, or if it exceeds the
+        smallest magnitude of its row by a factor of big_m or more. At most
+        top worst rows, columns and big-M entries are reported. data is an
+        optional ProblemData of lp, saving reading the problem back.
+        """
+        _require_numpy()
+        if data is None:
+            data = ProblemData.from_prob(lp, names=False)
+        m, n = len(data.row_type), len(data.col_type)
+        keep = data.ar != 0
+        ia, ja, a = data.ia[keep], data.ja[keep], abs(data.ar[keep])
+        row_lo, row_hi = numpy.zeros(m) + numpy.inf, numpy.zeros(m)
+        col_lo, col_hi = numpy.zeros(n) + numpy.inf, numpy.zeros(n)
+        numpy.minimum.at(row_lo, ia, a)
+        numpy.maximum.at(row_hi, ia, a)
+        numpy.minimum.at(col_lo, ja, a)
+        numpy.maximum.at(col_hi, ja, a)
+        row_range = numpy.where(row_hi > 0, row_hi/numpy.where(row_hi > 0, row_lo, 1.0), 1.0)
+        col_range = numpy.where(col_hi > 0, col_hi/numpy.where(col_hi > 0, col_lo, 1.0), 1.0)
+
+        def row_name(i):
+            name = data.row_names and data.row_names[i] or glp_get_row_name(lp, i+1)
+            return name or i+1
+        def col_name(j):
+            name = data.col_names and data.col_names[j] or glp_get_col_name(lp, j+1)
+            return name or j+1
+        def worst(ranges, name):
+            order = numpy.argsort(-ranges, kind='mergesort')[:top]
+            return [(name(k), float(ranges[k])) for k in order.tolist() if ranges[k] > 1.0]
+
+        binary = (data.col_kind != GLP_CV) & (data.col_lb == 0) & (data.col_ub == 1)
+        suspect = ((a >= big_m) & binary[ja]) | (a >= big_m*row_lo[ia])
+        order = numpy.flatnonzero(suspect)
+        order = order[numpy.argsort(-a[order], kind='mergesort')][:top]
+        bounds = numpy.concatenate((data.row_lb, data.row_ub, data.col_lb, data.col_ub))
+        finite = bounds[~numpy.isinf(bounds)]
+        big = numpy.flatnonzero(~numpy.isinf(bounds) & (abs(bounds) >= big_m))
+        big = big[numpy.argsort(-abs(bounds[big]), kind='mergesort')][:top]
+        big_bounds = []
+        for k in big.tolist():
+            name = row_name(k % m) if k < 2*m else col_name((k - 2*m) % n)
+            big_bounds.append((name, float(bounds[k])))
+        return ConditioningReport(
+            min_abs=float(a.min()) if len(a) else 1.0, max_abs=float(a.max()) if len(a) else 1.0,
+            histograms={'matrix': _decades(a), 'objective': _decades(data.obj),
+                'bounds': _decades(finite)},
+            row_range=row_range, col_range=col_range,
+            worst_rows=worst(row_range, row_name), worst_cols=worst(col_range, col_name),
+            big_m=[(row_name(ia[k]), col_name(ja[k]), float(a[k])) for k in order.tolist()],
+            big_bounds=big_bounds)
+
+
+#=============================================================================
+# Sparse matrix readback
+#=============================================================================
+
+if _version >= (4, 16):
+    def get_matrix(lp, fmt='csc'):
+        """Read the constraint matrix of problem object lp in one pass.
+
+        fmt is 'csc' (read column by column), 'csr' (row by row) or 'coo'.
+        The index and value buffers are sized with glp_get_num_nz and filled
+        in place by GLPK. Returns a scipy.sparse matrix of that format if
+        SciPy is available, otherwise the NumPy arrays (indptr, indices,
+        data) for 'csc'/'csr' and (row, col, data) for 'coo', all indices
+        being 0-based.
+        """
+        _require_numpy()
+        m, n = glp_get_num_rows(lp), glp_get_num_cols(lp)
+        if fmt == 'csr':
+            indptr, indices, data = _get_csr(lp, m)
+            if scipy is not None:
+                return scipy.sparse.csr_matrix((data, indices, indptr), shape=(m, n))
+            return indptr, indices, data
+        if fmt not in ('csc', 'coo'):
+            raise ValueError("Unknown matrix format %r." % (fmt,))
+        indptr, indices, data = _get_csc(lp, n)
+        if fmt == 'csc':
+            if scipy is not None:
+                return scipy.sparse.csc_matrix((data, indices, indptr), shape=(m, n))
+            return indptr, indices, data
+        cols = numpy.repeat(numpy.arange(n, dtype=numpy.intc), numpy.diff(indptr))
+        if scipy is not None:
+            return scipy.sparse.coo_matrix((data, (indices, cols)), shape=(m, n))
+        return indices, cols, data
+
+
+#=============================================================================
+# Modeling layer
+#=============================================================================
+
+if _version >= (4, 16):
+    class _Terms(object):
+        # growable (expression index, column, coefficient) arrays, doubled in
+        # capacity as needed so that appending is amortized O(1) per term
+        def __init__(self, capacity=16):
+            self.idx = numpy.empty(capacity, numpy.intc)
+            self.col = numpy.empty(capacity, numpy.intc)
+            self.val = numpy.empty(capacity)
+            self.size = 0
+
+        def extend(self, idx, col, val):
+            k = len(col)
+            if self.size + k > len(self.val):
+                capacity = max(2*len(self.val), self.size + k)
+                for key in ('idx', 'col', 'val'):
+                    old = getattr(self, key)
+                    new = numpy.empty(capacity, old.dtype)
+                    new[:self.size] = old[:self.size]
+                    setattr(self, key, new)
+            s = slice(self.size, self.size + k)
+            self.idx[s], self.col[s], self.val[s] = idx, col, val
+            self.size += k
+
+        def arrays(self):
+            s = self.size
+            return self.idx[:s], self.col[:s], self.val[:s]
+
+        def copy(self):
+            other = _Terms(max(self.size, 16))
+            other.extend(*self.arrays())
+            return other
+
+    def _coo(a):
+        # (row, col, value) arrays of the nonzeros of a dense or scipy matrix
+        if hasattr(a, 'tocoo'):
+            a = a.tocoo()
+            return a.row, a.col, a.data, a.shape
+        a = numpy.asarray(a, float)
+        r, c = numpy.nonzero(a)
+        return r, c, a[r, c], a.shape
+
+    class LinExpr(object):
+        """Array of linear expressions of the shape shape, each one a sum of
+        coefficient*column terms plus a constant.
+
+        Terms are kept in growable arrays: e += f extends them in place. The
+        arithmetic operators work elementwise, broadcasting single
+        expressions and NumPy-compatible numbers; dot() multiplies a 1-D
+        expression array by a matrix. Comparisons
+        with <=, >= and == give Constraint objects for Model.add().
+        """
+        __array_priority__ = 100
+        __array_ufunc__ = None
+
+        def __init__(self, shape=(), terms=None, const=None):
+            self.shape = tuple(shape)
+            self.size = int(numpy.prod(self.shape))
+            self.terms = terms or _Terms()
+            self.const = numpy.zeros(self.size) if const is None else const
+
+        def _lift(self, other):
+            # other as a LinExpr (a copy if it is one already)
+            if isinstance(other, VarBlock):
+                return other.expr()
+            if isinstance(other, LinExpr):
+                return LinExpr(other.shape, other.terms.copy(), other.const.copy())
+            c = numpy.broadcast_to(numpy.asarray(other, float), self.shape)
+            return LinExpr(self.shape, None, c.ravel().copy())
+
+        def _broadcast(self, size, shape):
+            # the scalar self repeated size times
+            idx, col, val = self.terms.arrays()
+            terms = _Terms(max(size*len(col), 16))
+            terms.extend(numpy.repeat(numpy.arange(size), len(col)),
+                numpy.tile(col, size), numpy.tile(val, size))
+            return LinExpr(shape, terms, numpy.repeat(self.const, size))
+
+        def __iadd__(self, other):
+            other = self._lift(other)
+            if other.size != self.size:
+                if other.size == 1:
+                    other = other._broadcast(self.size, self.shape)
+                else:
+                    raise ValueError("Cannot add expressions of shapes %r and %r." %
+                        (self.shape, other.shape))
+            self.terms.extend(*other.terms.arrays())
+            self.const += other.const
+            return self
+
+        def __add__(self, other):
+            other = self._lift(other)
+            if self.size == 1 and other.size > 1:
+                return self._broadcast(other.size, other.shape).__iadd__(other)
+            return self._lift(self).__iadd__(other)
+
+        __radd__ = __add__
+
+        def __neg__(self):
+            return self*-1.0
+
+        def __sub__(self, other):
+            return self + (-self._lift(other))
+
+        def __isub__(self, other):
+            return self.__iadd__(-self._lift(other))
+
+        def __rsub__(self, other):
+            return (-self) + other
+
+        def __mul__(self, other):
+            a = numpy.asarray(other, float)
+            shape = numpy.broadcast(numpy.empty(self.shape, bool), a).shape
+            if shape != self.shape:
+                if self.size != 1:
+                    raise ValueError("Cannot multiply expressions of shape %r by an array of shape %r." %
+                        (self.shape, a.shape))
+                return self._broadcast(int(numpy.prod(shape)), shape)*a
+            a = numpy.broadcast_to(a, shape).ravel()
+            idx, col, val = self.terms.arrays()
+            terms = _Terms(max(len(col), 16))
+            terms.extend(idx, col, val*a[idx])
+            return LinExpr(self.shape, terms, self.const*a)
+
+        __rmul__ = __mul__
+
+        def sum(self):
+            """Return the sum of all the expressions of the array."""
+            idx, col, val = self.terms.arrays()
+            terms = _Terms(max(len(col), 16))
+            terms.extend(numpy.zeros(len(col), numpy.intc), col, val)
+            return LinExpr((), terms, numpy.array([self.const.sum()]))
+
+        def dot(self, a):
+            """Return the 1-D expression array self times matrix a (dense or
+            scipy.sparse), i.e. expression k is sum_j self[j]*a[j, k]. If a
+            is a 1-D array, the result is a single expression."""
+            if not hasattr(a, 'tocoo') and numpy.ndim(a) == 1:
+                e = self.dot(numpy.reshape(a, (-1, 1)))
+                e.shape = ()
+                return e
+            r, c, v, shape = _coo(a)
+            if self.shape != (shape[0],):
+                raise ValueError("Shapes %r and %r are not aligned." % (self.shape, shape))
+            # pair every term of expression j with every nonzero in row j of a
+            idx, col, val = self.terms.arrays()
+            order = numpy.argsort(idx, kind='mergesort')
+            idx, col, val = idx[order], col[order], val[order]
+            start = numpy.searchsorted(idx, r)
+            count = numpy.searchsorted(idx, r, 'right') - start
+            pos = numpy.repeat(start - numpy.concatenate(([0], numpy.cumsum(count)[:-1])), count) + \
+                numpy.arange(count.sum())
+            terms = _Terms(max(len(pos), 16))
+            terms.extend(numpy.repeat(c, count), col[pos], val[pos]*numpy.repeat(v, count))
+            const = numpy.bincount(c, self.const[r]*v, shape[1]) if len(c) else numpy.zeros(shape[1])
+            return LinExpr((shape[1],), terms, const)
+
+        def rdot(self, a):
+            """Return matrix a times the 1-D expression array self."""
+            if not hasattr(a, 'tocoo') and numpy.ndim(a) == 1:
+                return self.dot(a)
+            r, c, v, shape = _coo(a)
+            return self.dot(_Transposed(r, c, v, shape))
+
+        def __le__(self, rhs):
+            return Constraint(self - rhs, -numpy.inf, 0.0)
+
+        def __ge__(self, rhs):
+            return Constraint(self - rhs, 0.0, numpy.inf)
+
+        def __eq__(self, rhs):
+            return Constraint(self - rhs, 0.0, 0.0)
+
+        __hash__ = None
+
+    class _Transposed(object):
+        # transpose of a matrix in (row, col, value) form, for _coo()
+        def __init__(self, r, c, v, shape):
+            self.row, self.col, self.data, self.shape = c, r, v, (shape[1], shape[0])
+
+        def tocoo(self):
+            return self
+
+    class VarBlock(object):
+        """Array of model columns of the shape of cols, the array of their
+        0-based column numbers. Indexing gives a sub-block; arithmetic turns
+        the block into a LinExpr."""
+        __array_priority__ = 100
+        __array_ufunc__ = None
+
+        def __init__(self, cols):
+            self.cols = cols
+            self.shape = cols.shape
+
+        def __getitem__(self, key):
+            return VarBlock(self.cols[key])
+
+        def __len__(self):
+            return len(self.cols)
+
+        def expr(self):
+            """Return the block as a LinExpr."""
+            size = self.cols.size
+            terms = _Terms(max(size, 16))
+            terms.extend(numpy.arange(size), self.cols.ravel(), numpy.ones(size))
+            return LinExpr(self.shape, terms)
+
+        def __getattr__(self, name):
+            # arithmetic, comparisons and sum/dot are those of the expression
+            if name in ('sum', 'dot', 'rdot'):
+                return getattr(self.expr(), name)
+            raise AttributeError(name)
+
+        def __add__(self, other): return self.expr() + other
+        def __radd__(self, other): return self.expr() + other
+        def __sub__(self, other): return self.expr() - other
+        def __rsub__(self, other): return other - self.expr()
+        def __mul__(self, other): return self.expr()*other
+        def __rmul__(self, other): return self.expr()*other
+        def __neg__(self): return -self.expr()
+        def __le__(self, rhs): return self.expr() <= rhs
+        def __ge__(self, rhs): return self.expr() >= rhs
+        def __eq__(self, rhs): return self.expr() == rhs
+        __hash__ = None
+
+    class Constraint(object):
+        """Rows lb <= expr <= ub for the expressions of a LinExpr."""
+        def __init__(self, expr, lb, ub):
+            self.expr, self.lb, self.ub = expr, lb, ub
+
+    class Model(object):
+        """Linear (or mixed integer) model built from variable blocks and
+        array-valued expressions, emitted to a problem object by build().
+
+        Columns and rows are accumulated in NumPy arrays; build() loads the
+        whole constraint matrix with a single glp_load_matrix call.
+        """
+        def __init__(self, name=None):
+            self.name = name
+            self.obj_dir = GLP_MIN
+            self.objective = None
+            self.n = self.m = 0
+            self.col_lb, self.col_ub, self.col_kind, self.col_names = [], [], [], []
+            self.row_lb, self.row_ub, self.row_names = [], [], []
+            self.rows = _Terms()
+
+        def add_vars(self, shape=(), lb=0.0, ub=float('inf'), kind=GLP_CV, name=None):
+            """Add a block of columns of the given shape, with bounds lb, ub
+            (-inf/+inf if missing) and kind GLP_CV, GLP_IV or GLP_BV, which
+            may be arrays. Columns are named name[i,j,...] if name is given.
+            Returns the VarBlock."""
+            if not isinstance(shape, tuple):
+                shape = (shape,)
+            size = int(numpy.prod(shape))
+            cols = numpy.arange(self.n, self.n + size, dtype=numpy.intc).reshape(shape)
+            kind = numpy.broadcast_to(numpy.asarray(kind, numpy.intc), shape).ravel()
+            # binary columns are integer columns in [0, 1]
+            bv = kind == GLP_BV
+            for key, value, bv_value in (('col_lb', lb, 0.0), ('col_ub', ub, 1.0)):
+                value = numpy.broadcast_to(numpy.asarray(value, float), shape).ravel()
+                getattr(self, key).append(numpy.where(bv, bv_value, value))
+            self.col_kind.append(numpy.where(bv, GLP_IV, kind).astype(numpy.intc))
+            if name is None:
+                self.col_names.append([None]*size)
+            elif shape == ():
+                self.col_names.append([name])
+            else:
+                self.col_names.append(['%s[%s]' % (name, ','.join(map(str, k)))
+                    for k in numpy.ndindex(*shape)])
+            self.n += size
+            return VarBlock(cols)
+
+        def add(self, constraint, name=None):
+            """Add the rows of constraint, named name[i,j,...] if name is
+            given. Returns the 0-based numbers of the new rows."""
+            expr = constraint.expr
+            if isinstance(expr, VarBlock):
+                expr = expr.expr()
+            idx, col, val = expr.terms.arrays()
+            self.rows.extend(idx + self.m, col, val)
+            for key, value in (('row_lb', constraint.lb), ('row_ub', constraint.ub)):
+                bound = numpy.broadcast_to(numpy.asarray(value, float), expr.shape).ravel()
+                getattr(self, key).append(bound - expr.const)
+            if name is None:
+                self.row_names.append([None]*expr.size)
+            elif expr.shape == ():
+                self.row_names.append([name])
+            else:
+                self.row_names.append(['%s[%s]' % (name, ','.join(map(str, k)))
+                    for k in numpy.ndindex(*expr.shape)])
+            rows = numpy.arange(self.m, self.m + expr.size).reshape(expr.shape)
+            self.m += expr.size
+            return rows
+
+        def minimize(self, expr):
+            """Set the objective function to minimize."""
+            self.obj_dir, self.objective = GLP_MIN, expr
+
+        def maximize(self, expr):
+            """Set the objective function to maximize."""
+            self.obj_dir, self.objective = GLP_MAX, expr
+
+        def build(self, lp=None):
+            """Emit the model into the empty problem object lp (a new one if
+            lp is None) and return lp. Duplicate terms are summed."""
+            if lp is None:
+                lp = glp_create_prob()
+            m, n = self.m, self.n
+            if self.name:
+                glp_set_prob_name(lp, self.name)
+            glp_set_obj_dir(lp, self.obj_dir)
+            concat = lambda chunks, dtype: numpy.concatenate(chunks) if chunks else numpy.zeros(0, dtype)
+            if n:
+                glp_add_cols(lp, n)
+                set_col_bounds(lp, None, None, concat(self.col_lb, float), concat(self.col_ub, float))
+                set_col_kinds(lp, numpy.flatnonzero(concat(self.col_kind, numpy.intc) != GLP_CV) + 1, GLP_IV)
+            if m:
+                glp_add_rows(lp, m)
+                set_row_bounds(lp, None, None, concat(self.row_lb, float), concat(self.row_ub, float))
+            for names, set_name in ((self.col_names, glp_set_col_name), (self.row_names, glp_set_row_name)):
+                k = 0
+                for chunk in names:
+                    for s in chunk:
+                        k += 1
+                        if s:
+                            set_name(lp, k, s)
+            if self.objective is not None:
+                expr = self.objective
+                if isinstance(expr, VarBlock):
+                    expr = expr.expr()
+                if expr.size != 1:
+                    expr = expr.sum()
+                idx, col, val = expr.terms.arrays()
+                coef = numpy.bincount(col, val, n)
+                nz = numpy.flatnonzero(coef)
+                set_objective(lp, nz + 1, coef[nz], float(expr.const[0]))
+            # sum duplicate (row, column) terms, dropping zeros
+            idx, col, val = self.rows.arrays()
+            if not len(val):
+                return lp
+            key, inverse = numpy.unique(idx.astype(numpy.int64)*n + col, return_inverse=True)
+            val = numpy.bincount(inverse, val, len(key))
+            nz = val != 0
+            key, val = key[nz], val[nz]
+            ia, ja = _padded(key // n, numpy.intc, 1), _padded(key % n, numpy.intc, 1)
+            glp_load_matrix(lp, len(val), _int_p(ia), _int_p(ja), _double_p(_padded(val, float)))
+            return lp
+
+        def value(self, lp, item, mip=False):
+            """Return the values of the VarBlock or LinExpr item in the basic
+            (or, with mip set, MIP) solution of the built problem lp."""
+            x = _fetch(mip and glp_mip_col_val or glp_get_col_prim, lp, self.n)
+            if isinstance(item, VarBlock):
+                return x[item.cols]
+            idx, col, val = item.terms.arrays()
+            return (numpy.bincount(idx, val*x[col], item.size) + item.const).reshape(item.shape)
+
+
+#=============================================================================
+# Streaming row builder
+#=============================================================================
+
+if _version >= (4, 16):
+    class RowStream(object):
+        """Append rows to problem object lp from an iterator, chunk_size
+        rows at a time.
+
+        Each row is a triple (bounds, indices, values): bounds is a pair
+        (lb, ub) where None or -inf/+inf marks a missing bound, indices are
+        GLPK (1-based) column numbers and values the matching coefficients.
+        Rows are copied into typed buffers that are reused from chunk to
+        chunk, and each full chunk is flushed with one glp_add_rows call,
+        so memory stays proportional to the chunk size. Call flush() (or
+        use extend()) to write out the last partial chunk.
+        """
+        def __init__(self, lp, chunk_size=4096, nz_hint=16):
+            _require_numpy()
+            self.lp, self.chunk_size = lp, chunk_size
+            self.lb, self.ub = numpy.empty(chunk_size), numpy.empty(chunk_size)
+            self.indptr = numpy.zeros(chunk_size+1, numpy.intc)
+            # GLPK reads ind/val from offset 1: keep a leading pad entry
+            self.ind = numpy.empty(chunk_size*nz_hint+1, numpy.intc)
+            self.val = numpy.empty(chunk_size*nz_hint+1)
+            self.count = 0 # rows in the current chunk
+            self.added = 0 # rows flushed so far
+
+        def append(self, bounds, indices, values):
+            """Buffer one row, flushing the chunk when it is full."""
+            k, s = self.count, self.indptr[self.count]
+            lb, ub = bounds
+            self.lb[k] = -numpy.inf if lb is None else lb
+            self.ub[k] = numpy.inf if ub is None else ub
+            indices = numpy.asarray(indices, numpy.intc)
+            e = s + len(indices)
+            if e + 1 > len(self.val):
+                capacity = max(2*len(self.val), e + 1)
+                for key in ('ind', 'val'):
+                    old = getattr(self, key)
+                    new = numpy.empty(capacity, old.dtype)
+                    new[:s+1] = old[:s+1]
+                    setattr(self, key, new)
+            self.ind[s+1:e+1] = indices
+            self.val[s+1:e+1] = values
+            self.indptr[k+1] = e
+            self.count += 1
+            if self.count == self.chunk_size:
+                self.flush()
+
+        def extend(self, rows):
+            """Append all the rows of the iterable rows and flush; return the
+            number of rows added to the problem so far."""
+            append = self.append
+            for bounds, indices, values in rows:
+                append(bounds, indices, values)
+            self.flush()
+            return self.added
+
+        def flush(self):
+            """Write the buffered rows to the problem."""
+            k = self.count
+            if not k:
+                return
+            lp = self.lp
+            first = glp_add_rows(lp, k)
+            indptr = self.indptr[:k+1].tolist()
+            ind, val = self.ind, self.val
+            set_mat_row = glp_set_mat_row
+            for r in xrange(k):
+                s = indptr[r]
+                set_mat_row(lp, first+r, indptr[r+1] - s, _int_p(ind, s), _double_p(val, s))
+            _set_bounds(_raw_set_row_bnds, lp, numpy.arange(first, first+k), k, None,
+                self.lb[:k], self.ub[:k])
+            self.count = 0
+            self.added += k
+
+
+#=============================================================================
+# Batched setters
+#=============================================================================
+
+if _version >= (4, 16):
+    def _rawfunc(name, result, *argtypes):
+        # prototype without parameter flags, cheaper to call in tight loops
+        return CFUNCTYPE(result, *argtypes)((name, _glpk_lib))
+
+    _raw_set_row_bnds = _rawfunc(_glp+'set_row_bnds', None,
+        POINTER(glp_prob), c_int, c_int, c_double, c_double)
+    _raw_set_col_bnds = _rawfunc(_glp+'set_col_bnds', None,
+        POINTER(glp_prob), c_int, c_int, c_double, c_double)
+    _raw_set_col_kind = _rawfunc(_glp+'set_col_kind', None, POINTER(glp_prob), c_int, c_int)
+    _raw_set_obj_coef = _rawfunc(_glp+'set_obj_coef', None, POINTER(glp_prob), c_int, c_double)
+
+    def _batch(idx, count, *arrays):
+        # idx as a list of GLPK numbers (all count if None), then each array
+        # broadcast to its length as a list
+        if idx is None:
+            idx = range(1, count+1)
+        else:
+            idx = numpy.asarray(idx, int).ravel().tolist()
+        k = len(idx)
+        return [idx] + [numpy.broadcast_to(a, (k,)).tolist() for a in arrays]
+
+    def _set_bounds(func, lp, idx, count, types, lb, ub):
+        lb, ub = numpy.asarray(lb, float), numpy.asarray(ub, float)
+        if types is None:
+            types = _bnd_types(*numpy.broadcast_arrays(lb, ub))
+        # GLPK ignores the missing bounds, but they must be finite numbers
+        lb, ub = numpy.where(numpy.isinf(lb), 0.0, lb), numpy.where(numpy.isinf(ub), 0.0, ub)
+        idx, types, lb, ub = _batch(idx, count, numpy.asarray(types, numpy.intc), lb, ub)
+        for r in xrange(len(idx)):
+            func(lp, idx[r], types[r], lb[r], ub[r])
+
+    def set_row_bounds(lp, idx, types, lb, ub):
+        """Set the types and bounds of rows idx (GLPK numbers, all rows if
+        None) from arrays or scalars broadcast to their number. If types is
+        None, it is derived from lb, ub where missing bounds are -inf/+inf."""
+        _require_numpy()
+        _set_bounds(_raw_set_row_bnds, lp, idx, glp_get_num_rows(lp), types, lb, ub)
+
+    def set_col_bounds(lp, idx, types, lb, ub):
+        """Set the types and bounds of columns idx, see set_row_bounds()."""
+        _require_numpy()
+        _set_bounds(_raw_set_col_bnds, lp, idx, glp_get_num_cols(lp), types, lb, ub)
+
+    def set_col_kinds(lp, idx, kinds):
+        """Set the kinds of columns idx (GLPK numbers, all columns if None)."""
+        _require_numpy()
+        idx, kinds = _batch(idx, glp_get_num_cols(lp), numpy.asarray(kinds, numpy.intc))
+        func = _raw_set_col_kind
+        for r in xrange(len(idx)):
+            func(lp, idx[r], kinds[r])
+
+    def set_objective(lp, idx, coef, const=None):
+        """Set the objective coefficients of columns idx (GLPK numbers, all
+        columns if None) and, if given, the constant term."""
+        _require_numpy()
+        idx, coef = _batch(idx, glp_get_num_cols(lp), numpy.asarray(coef, float))
+        func = _raw_set_obj_coef
+        for r in xrange(len(idx)):
+            func(lp, idx[r], coef[r])
+        if const is not None:
+            func(lp, 0, const)
+
+
+#=============================================================================
+# Batch deletion
+#=============================================================================
+
+if _version >= (4, 16):
+    def _delete(func, lp, count, which, what):
+        which = numpy.asarray(which)
+        if which.dtype == bool:
+            if len(which) != count:
+                raise ValueError("The mask must have one entry per %s." % what)
+            num = numpy.flatnonzero(which) + 1
+        else:
+            num = numpy.unique(which.astype(int))
+            if len(num) and (num[0] < 1 or num[-1] > count):
+                raise ValueError("The %s numbers must be in 1..%d." % (what, count))
+        keep = numpy.ones(count+1, bool)
+        keep[0] = False
+        keep[num] = False
+        remap = numpy.zeros(count+1, numpy.intc)
+        remap[keep] = numpy.arange(1, count - len(num) + 1)
+        if len(num):
+            func(lp, len(num), _int_p(_padded(num, numpy.intc)))
+        return remap
+
+    def delete_rows(lp, which):
+        """Delete rows of problem object lp with a single glp_del_rows call.
+
+        which is a boolean mask with one entry per row, or an array of GLPK
+        row numbers (duplicates allowed). Returns the remapping array of
+        length m+1: entry i is the new number of old row i, 0 if it was
+        deleted (entry 0 is always 0). Row-indexed data held aside can be
+        compacted with data[remap[1:] > 0].
+        """
+        _require_numpy()
+        return _delete(glp_del_rows, lp, glp_get_num_rows(lp), which, 'row')
+
+    def delete_cols(lp, which):
+        """Delete columns of problem object lp with a single glp_del_cols
+        call, see delete_rows()."""
+        _require_numpy()
+        return _delete(glp_del_cols, lp, glp_get_num_cols(lp), which, 'column')
+
+
+#=============================================================================
+# Rolling horizon
+#=============================================================================
+
+if _version >= (4, 31):
+    def _nonbasic_stats(t, x, lb, ub):
+        # nonbasic statuses for variables of types t at values x
+        near_lb = abs(x - numpy.where(numpy.isinf(lb), 0.0, lb)) <= \
+            abs(x - numpy.where(numpy.isinf(ub), 0.0, ub))
+        return numpy.select([t == GLP_FR, t == GLP_FX, t == GLP_LO, t == GLP_UP, near_lb],
+            [GLP_NF, GLP_NS, GLP_NL, GLP_NU, GLP_NL], GLP_NU).astype(numpy.intc)
+
+    class RollingHorizon(object):
+        """Rolling-horizon driver keeping one problem object across windows.
+
+        Rows and columns are tagged with the period that added them.
+        expire() drops all those of the periods up to a given one with one
+        glp_del_rows and one glp_del_cols call; add_cols()/add_rows() append
+        a new period in bulk. The statuses of the retained rows and columns
+        are kept by GLPK, so solve() only repairs the number of basic
+        variables before re-solving warm; if GLPK still rejects the basis,
+        glp_adv_basis provides a fresh one (counted in cold_starts).
+        """
+        def __init__(self, lp=None, smcp=None):
+            _require_numpy()
+            self.lp = glp_create_prob() if lp is None else lp
+            if smcp is None:
+                smcp = _quiet_smcp()
+            self.smcp = smcp
+            self.row_tag = numpy.zeros(glp_get_num_rows(self.lp), int) - 1
+            self.col_tag = numpy.zeros(glp_get_num_cols(self.lp), int) - 1
+            self.solves = self.cold_starts = 0
+
+        def add_cols(self, period, count, obj=0.0, lb=0.0, ub=float('inf'), kind=GLP_CV):
+            """Append count columns of period, with objective coefficients,
+            bounds (-inf/+inf if missing) and kinds given as arrays or
+            scalars. Returns their GLPK numbers."""
+            lp = self.lp
+            nums = numpy.arange(glp_add_cols(lp, count), glp_get_num_cols(lp) + 1)
+            set_col_bounds(lp, nums, None, lb, ub)
+            set_objective(lp, nums, obj)
+            kind = numpy.broadcast_to(numpy.asarray(kind, numpy.intc), (count,))
+            set_col_kinds(lp, nums[kind != GLP_CV], kind[kind != GLP_CV])
+            self.col_tag = numpy.concatenate((self.col_tag, numpy.zeros(count, int) + period))
+            return nums
+
+        def add_rows(self, period, indptr, indices, data, lb=-float('inf'), ub=float('inf')):
+            """Append the rows of period given in CSR form with GLPK column
+            numbers in indices, and bounds lb, ub (-inf/+inf if missing).
+            Returns their GLPK numbers."""
+            first = _add_rows_csr(self.lp, indptr, numpy.asarray(indices) - 1, data, lb, ub)
+            count = len(indptr) - 1
+            self.row_tag = numpy.concatenate((self.row_tag, numpy.zeros(count, int) + period))
+            return numpy.arange(first, first + count)
+
+        def rows(self, period):
+            """Return the GLPK numbers of the rows of period."""
+            return numpy.flatnonzero(self.row_tag == period) + 1
+
+        def cols(self, period):
+            """Return the GLPK numbers of the columns of period."""
+            return numpy.flatnonzero(self.col_tag == period) + 1
+
+        def expire(self, period):
+            """Delete the rows and columns of all periods up to period (not
+            the untagged ones the problem object came with). Returns the row
+            and column remappings, see delete_rows()."""
+            rows, cols = self.row_tag <= period, self.col_tag <= period
+            rows &= self.row_tag >= 0
+            cols &= self.col_tag >= 0
+            row_remap = delete_rows(self.lp, rows)
+            col_remap = delete_cols(self.lp, cols)
+            self.row_tag, self.col_tag = self.row_tag[~rows], self.col_tag[~cols]
+            return row_remap, col_remap
+
+        def _repair(self):
+            # make the number of basic variables equal to the number of rows
+            lp = self.lp
+            m, n = glp_get_num_rows(lp), glp_get_num_cols(lp)
+            t, lb, ub = _fetch_bounds(lp, m, n)
+            stat = numpy.concatenate((_fetch(glp_get_row_stat, lp, m, numpy.intc),
+                _fetch(glp_get_col_stat, lp, n, numpy.intc)))
+            excess = int((stat == GLP_BS).sum()) - m
+            if excess < 0:
+                # newest nonbasic rows become basic
+                change = numpy.flatnonzero(stat[:m] != GLP_BS)[::-1][:-excess]
+                stat[change] = GLP_BS
+            elif excess > 0:
+                # basic columns closest to a bound leave the basis first
+                x = numpy.concatenate((_fetch(glp_get_row_prim, lp, m), _fetch(glp_get_col_prim, lp, n)))
+                dist = numpy.minimum(abs(x - lb), abs(x - ub))
+                order = numpy.flatnonzero(stat == GLP_BS)
+                order = order[numpy.lexsort((dist[order], order < m))]
+                change = order[:excess]
+                stat[change] = _nonbasic_stats(t[change], x[change], lb[change], ub[change])
+            else:
+                return
+            for k, s in zip(change.tolist(), stat[change].tolist()):
+                if k < m:
+                    glp_set_row_stat(lp, k+1, s)
+                else:
+                    glp_set_col_stat(lp, k-m+1, s)
+
+        def solve(self, iocp=None):
+            """Re-solve the LP relaxation warm from the retained basis and,
+            if iocp is given and there are integer columns, the MIP with
+            intopt(). Returns the code of the last solver call."""
+            lp = self.lp
+            self.solves += 1
+            self._repair()
+            ret = glp_simplex(lp, self.smcp)
+            if ret in (GLP_EBADB, GLP_ESING, GLP_ECOND):
+                self.cold_starts += 1
+                glp_adv_basis(lp, 0)
+                ret = glp_simplex(lp, self.smcp)
+            if ret == 0 and iocp is not None and glp_get_num_int(lp):
+                ret = intopt(lp, iocp)
+            return ret
+
+
+#=============================================================================
+# Result cache
+#=============================================================================
+
+if _version >= (4, 31):
+    CachedResult = namedtuple('CachedResult', 'status obj stat prim dual mip_status mip_obj x')
+
+    def _digest(*arrays):
+        # sha1 of the arrays in a fixed dtype and byte order, each prefixed
+        # by its length so that concatenations cannot collide
+        h = hashlib.sha1()
+        for a, dtype in arrays:
+            a = numpy.ascontiguousarray(a, dtype).ravel()
+            h.update(numpy.array([len(a)], '<i8').tobytes())
+            h.update(a.tobytes())
+        return h.hexdigest()
+
+    def fingerprint(data):
+        """Return the canonical fingerprint (structure, values) of the
+        ProblemData data as two SHA-1 hex digests.
+
+        structure covers the dimensions, the sparsity pattern of the matrix
+        and the column kinds; values covers everything else that defines
+        the problem: the coefficients, bound types and bounds, objective
+        and its direction. Names and the order of the matrix entries are
+        ignored, and -0.0 is taken as 0.0.
+        """
+        m, n = len(data.row_type), len(data.col_type)
+        order = numpy.lexsort((data.ia, data.ja))
+        structure = _digest((numpy.array([m, n]), '<i8'), (data.ia[order], '<i4'),
+            (data.ja[order], '<i4'), (data.col_kind != GLP_CV, '<i1'))
+        f = lambda a: numpy.asarray(a, float) + 0.0
+        values = _digest((numpy.array([data.obj_dir]), '<i4'), (f([data.obj0]), '<f8'),
+            (f(data.obj), '<f8'), (f(data.ar)[order], '<f8'),
+            (data.row_type, '<i4'), (f(data.row_lb), '<f8'), (f(data.row_ub), '<f8'),
+            (data.col_type, '<i4'), (f(data.col_lb), '<f8'), (f(data.col_ub), '<f8'))
+        return structure, values
+
+    class ResultCache(object):
+        """Cache of solver results keyed by problem fingerprints.
+
+        Results are CachedResult tuples: the basic solution status, objective
+        value, statuses, primal and dual values of all m+n variables (rows
+        first) and, if the problem was solved as a MIP, its status, objective
+        value and column values (None otherwise). The maxsize most recently
+        used ones are kept in memory and, if directory is given, up to
+        maxfiles as .npz files, the least recently used being removed first.
+
+        solve() returns the stored result of an identical problem without
+        solving it. A problem with the same structure but other data is
+        re-solved warm from the basis of the most recent such result.
+        """
+        def __init__(self, directory=None, maxsize=256, maxfiles=None):
+            _require_numpy()
+            from collections import OrderedDict
+            self.directory = directory
+            self.maxsize = maxsize
+            self.maxfiles = maxfiles
+            self.hits = self.warm = self.misses = 0
+            self._mem = OrderedDict()
+            self._latest = {}
+
+        def _path(self, key):
+            return os.path.join(self.directory, '%s-%s.npz' % key)
+
+        def _remember(self, key, result):
+            self._mem[key] = result
+            self._latest[key[0]] = key
+            while len(self._mem) > self.maxsize:
+                old = self._mem.popitem(last=False)[0]
+                if self._latest.get(old[0]) == old:
+                    del self._latest[old[0]]
+
+        def _read(self, path):
+            f = numpy.load(path)
+            status, obj = f['status'].tolist(), float(f['obj'])
+            if 'x' in f.files:
+                mip = int(f['mip_status']), float(f['mip_obj']), f['x']
+            else:
+                mip = None, None, None
+            return CachedResult(status, obj, f['stat'], f['prim'], f['dual'], *mip)
+
+        def _write(self, key, r):
+            arrays = dict(status=numpy.array(r.status), obj=numpy.array(r.obj),
+                stat=r.stat, prim=r.prim, dual=r.dual)
+            if r.x is not None:
+                arrays.update(mip_status=numpy.array(r.mip_status),
+                    mip_obj=numpy.array(r.mip_obj), x=r.x)
+            path = self._path(key)
+            f = open(path + '.tmp', 'wb')
+            try:
+                numpy.savez(f, **arrays)
+            finally:
+                f.close()
+            os.rename(path + '.tmp', path)
+            if self.maxfiles is not None:
+                files = [os.path.join(self.directory, s) for s in os.listdir(self.directory)
+                    if s.endswith('.npz')]
+                files.sort(key=os.path.getmtime)
+                for s in files[:max(len(files) - self.maxfiles, 0)]:
+                    os.remove(s)
+
+        def lookup(self, key):
+            """Return the result cached for the fingerprint key, or None."""
+            result = self._mem.pop(key, None)
+            if result is None and self.directory is not None:
+                path = self._path(key)
+                if os.path.exists(path):
+                    result = self._read(path)
+                    os.utime(path, None)
+            if result is not None:
+                self._remember(key, result)
+            return result
+
+        def basis(self, structure):
+            """Return the statuses of the most recent result cached for the
+            structure digest, or None."""
+            key = self._latest.get(structure)
+            result = self._mem.get(key) if key is not None else None
+            if result is None and self.directory is not None:
+                files = [os.path.join(self.directory, s) for s in os.listdir(self.directory)
+                    if s.startswith(structure + '-') and s.endswith('.npz')]
+                if files:
+                    result = self._read(max(files, key=os.path.getmtime))
+            return result.stat if result is not None else None
+
+        def store(self, key, lp, mip=False):
+            """Cache the current solution of lp under the fingerprint key and
+            return it as a CachedResult."""
+            m, n = glp_get_num_rows(lp), glp_get_num_cols(lp)
+            stat, prim, dual = _fetch_basic_solution(lp, m, n)
+            result = CachedResult(glp_get_status(lp), glp_get_obj_val(lp), stat, prim, dual,
+                None, None, None)
+            if mip:
+                result = result._replace(mip_status=glp_mip_status(lp),
+                    mip_obj=glp_mip_obj_val(lp), x=_fetch(glp_mip_col_val, lp, n))
+            self._remember(key, result)
+            if self.directory is not None:
+                self._write(key, result)
+            return result
+
+        def solve(self, lp, smcp=None, iocp=None, data=None):
+            """Return the CachedResult of lp, solving it only if no identical
+            problem was cached. The LP relaxation is solved with glp_simplex
+            (parameters smcp, quiet if None) and, if iocp is given and there
+            are integer columns, the MIP with intopt(). data is the
+            ProblemData of lp, if already at hand. A cached result without a MIP solution does not
+            answer a MIP request; lp is then re-solved warm from its basis.
+            Returns None if a solver call fails."""
+            if smcp is None:
+                smcp = _quiet_smcp()
+            if data is None:
+                data = ProblemData.from_prob(lp, names=False)
+            key = fingerprint(data)
+            mip = iocp is not None and glp_get_num_int(lp) > 0
+            result = self.lookup(key)
+            if result is not None and (result.x is not None or not mip):
+                self.hits += 1
+                return result
+            stat = self.basis(key[0])
+            if stat is not None:
+                self.warm += 1
+                m = len(data.row_type)
+                stat = stat.tolist()
+                for i in xrange(m):
+                    glp_set_row_stat(lp, i+1, stat[i])
+                for j in xrange(len(stat) - m):
+                    glp_set_col_stat(lp, j+1, stat[m+j])
+            else:
+                self.misses += 1
+            ret = glp_simplex(lp, smcp)
+            if ret in (GLP_EBADB, GLP_ESING, GLP_ECOND):
+                glp_adv_basis(lp, 0)
+                ret = glp_simplex(lp, smcp)
+            if ret == 0 and mip:
+                ret = intopt(lp, iocp)
+            if ret != 0:
+                return None
+            return self.store(key, lp, mip)
+
+
 #=============================================================================
 # Wrap up all the functions and constants into __all__
 #=============================================================================
@@ -2246,5 +5929,22 @@ __all__ = [x for x in locals().keys() \
         x.startswith('glp') or \
         x.startswith('GLP')]
 
+# pythonic helpers built on top of the wrapping functions
+__all__ += [x for x in (
+    'SensitivityRanges', 'sensitivity',
+    'KKTCheck', 'KKTResult', 'kkt_residuals', 'check_kkt',
+    'ProblemData', 'MathProgCache', 'mpl_data_text', 'mpl_read_data',
+    'intopt', 'check_start', 'MIPResult', 'parallel_intopt', 'ColumnGeneration', 'Benders',
+    'LazyConstraints', 'HeuristicModel', 'simple_rounding', 'diving_rounding',
+    'FeasibilityPump', 'Heuristics', 'PseudoCostBranching', 'NodeSelection',
+    'IncumbentEvent', 'intopt_stream', 'SolutionPool', 'Checkpoint', 'resume',
+    'Postsolve', 'presolve', 'ScalingStats', 'scaling_stats', 'scale_factors', 'scale',
+    'ConditioningReport', 'analyze_conditioning', 'get_matrix',
+    'LinExpr', 'VarBlock', 'Constraint', 'Model', 'RowStream',
+    'set_row_bounds', 'set_col_bounds', 'set_col_kinds', 'set_objective',
+    'delete_rows', 'delete_cols', 'RollingHorizon',
+    'CachedResult', 'fingerprint', 'ResultCache',
+    ) if x in globals()]
+
 if __name__ == "__main__":
     print "Welcome. You are using ctypes-glpk, a Python wrapper for GLPK written by Minh-Tri Pham."
@@ -0,0 +1,118 @@
+# Benders decomposition against the extensive form solved by glp_intopt
+#
+# usage: python -m unittest discover -s tests
+
+import os, sys, unittest
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from ctypes import *
+from glpk import *
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# capacity planning: integer capacities x_j in [0, 10] at cost F_j; in
+# scenario k (probability 1/K) the demand D_k is served by y_j <= x_j at
+# cost Q_j; a shortage beyond the total capacity is infeasible
+F = [5.0, 7.0, 4.0]
+Q = [1.0, 0.5, 2.0]
+D = [8.0, 12.0, 5.0, 15.0]
+J, K = len(F), len(D)
+
+def set_rows(lp, rows):
+    for i, row in enumerate(rows):
+        ind = (c_int * (len(row)+1))(0, *[j for j, v in row])
+        val = (c_double * (len(row)+1))(0.0, *[v for j, v in row])
+        glp_set_mat_row(lp, i+1, len(row), ind, val)
+
+def capacities(lp, first=0):
+    for j in range(J):
+        glp_set_col_bnds(lp, first+j+1, GLP_DB, 0.0, 10.0)
+        glp_set_col_kind(lp, first+j+1, GLP_IV)
+        glp_set_obj_coef(lp, first+j+1, F[j])
+
+def extensive():
+    # x_1..x_J, then y_kj; rows y_kj - x_j <= 0 and sum_j y_kj >= D_k
+    lp = glp_create_prob()
+    glp_add_cols(lp, J + J*K)
+    glp_add_rows(lp, K*(J+1))
+    capacities(lp)
+    rows = []
+    for k in range(K):
+        for j in range(J):
+            y = J + k*J + j + 1
+            glp_set_col_bnds(lp, y, GLP_LO, 0.0, 0.0)
+            glp_set_obj_coef(lp, y, Q[j]/K)
+            glp_set_row_bnds(lp, len(rows)+1, GLP_UP, 0.0, 0.0)
+            rows.append([(y, 1.0), (j+1, -1.0)])
+        glp_set_row_bnds(lp, len(rows)+1, GLP_LO, D[k], 0.0)
+        rows.append([(J + k*J + j + 1, 1.0) for j in range(J)])
+    set_rows(lp, rows)
+    return lp
+
+def decomposed():
+    master = glp_create_prob()
+    glp_add_cols(master, J)
+    capacities(master)
+    subs, links = [], []
+    for k in range(K):
+        sub = glp_create_prob()
+        glp_add_rows(sub, J+1)
+        glp_add_cols(sub, J)
+        for j in range(J):
+            glp_set_row_bnds(sub, j+1, GLP_UP, 0.0, 0.0)
+            glp_set_col_bnds(sub, j+1, GLP_LO, 0.0, 0.0)
+            glp_set_obj_coef(sub, j+1, Q[j]/K)
+        glp_set_row_bnds(sub, J+1, GLP_LO, D[k], 0.0)
+        set_rows(sub, [[(j+1, 1.0)] for j in range(J)] + [[(j+1, 1.0) for j in range(J)]])
+        subs.append(sub)
+        # row j of the subproblem is y_j - x_j <= 0
+        links.append((numpy.arange(J), numpy.arange(J), -numpy.ones(J)))
+    return master, subs, links
+
+def quiet_iocp():
+    parm = glp_iocp()
+    glp_init_iocp(parm)
+    parm.msg_lev = GLP_MSG_OFF
+    return parm
+
+
+class BendersDecomposition(unittest.TestCase):
+
+    def setUp(self):
+        lp = extensive()
+        smcp = glp_smcp()
+        glp_init_smcp(smcp)
+        smcp.msg_lev = GLP_MSG_OFF
+        glp_simplex(lp, smcp)
+        self.assertEqual(glp_intopt(lp, quiet_iocp()), 0)
+        self.obj = glp_mip_obj_val(lp)
+        glp_delete_prob(lp)
+
+    def check(self, processes=None):
+        master, subs, links = decomposed()
+        engine = Benders(master, subs, links, processes=processes)
+        try:
+            self.assertEqual(engine.solve(quiet_iocp()), 0)
+        finally:
+            engine.close()
+        self.assertEqual(glp_mip_status(master), GLP_OPT)
+        self.assertAlmostEqual(glp_mip_obj_val(master), self.obj, 6)
+        # the capacities cover the largest demand
+        x = [glp_mip_col_val(master, j+1) for j in range(J)]
+        self.assertTrue(sum(x) >= max(D) - 1e-6)
+        for lp in [master] + subs:
+            glp_delete_prob(lp)
+
+    def test_rounds(self):
+        self.check()
+
+    def test_workers(self):
+        self.check(processes=2)
+
+if numpy is None:
+    del BendersDecomposition
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+# PseudoCostBranching against glp_intopt on random knapsack problems
+#
+# usage: python -m unittest discover -s tests
+
+import os, sys, unittest
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from ctypes import *
+from glpk import *
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+def knapsack(n, seed, m=2):
+    # maximize v'x subject to W x <= W 1/2, x binary, with m random rows W;
+    # the LP relaxation is solved
+    rng = numpy.random.RandomState(seed)
+    w = rng.randint(10, 60, (m, n)).astype(float)
+    v = w.mean(0) + rng.randint(0, 20, n)
+    lp = glp_create_prob()
+    glp_set_obj_dir(lp, GLP_MAX)
+    glp_add_rows(lp, m)
+    glp_add_cols(lp, n)
+    for j in range(n):
+        glp_set_col_kind(lp, j+1, GLP_BV)
+        glp_set_obj_coef(lp, j+1, v[j])
+    ind = (c_int * (n+1))(0, *range(1, n+1))
+    for i in range(m):
+        glp_set_row_bnds(lp, i+1, GLP_UP, 0.0, w[i].sum()/2)
+        glp_set_mat_row(lp, i+1, n, ind, (c_double * (n+1))(0.0, *w[i]))
+    smcp = glp_smcp()
+    glp_init_smcp(smcp)
+    smcp.msg_lev = GLP_MSG_OFF
+    glp_simplex(lp, smcp)
+    return lp
+
+def quiet_iocp():
+    parm = glp_iocp()
+    glp_init_iocp(parm)
+    parm.msg_lev = GLP_MSG_OFF
+    return parm
+
+def reference(lp):
+    copy = glp_create_prob()
+    try:
+        glp_copy_prob(copy, lp, GLP_OFF)
+        parm = quiet_iocp()
+        parm.presolve = GLP_ON
+        assert glp_intopt(copy, parm) == 0 and glp_mip_status(copy) == GLP_OPT
+        return glp_mip_obj_val(copy)
+    finally:
+        glp_delete_prob(copy)
+
+
+class PseudoCostBranchingTest(unittest.TestCase):
+
+    def check(self, seed, **kw):
+        lp = knapsack(25, seed)
+        try:
+            obj = reference(lp)
+            branching = PseudoCostBranching(lp, **kw)
+            self.assertEqual(intopt(lp, quiet_iocp(), [branching]), 0)
+            self.assertEqual(glp_mip_status(lp), GLP_OPT)
+            self.assertAlmostEqual(glp_mip_obj_val(lp), obj)
+            return branching
+        finally:
+            glp_delete_prob(lp)
+
+    def test_optimum(self):
+        for seed in range(3):
+            branching = self.check(seed)
+            self.assertTrue(branching.tree_size[2] > 1)
+            self.assertTrue((branching.cnt_dn + branching.cnt_up).sum() > 0)
+            pc_dn, pc_up = branching.pseudo_costs()
+            self.assertTrue((pc_dn >= 0).all() and (pc_up >= 0).all())
+
+    def test_iteration_limit(self):
+        # strong branching solves stopped after one iteration only give
+        # estimates
+        for seed in range(3):
+            self.check(seed, strong_iters=1)
+
+    def test_pseudo_costs_only(self):
+        branching = self.check(0, strong_depth=-1)
+        self.assertTrue(branching.scratch is None)
+
+if numpy is None:
+    del PseudoCostBranchingTest
+
+if __name__ == '__main__':
+    unittest.main()
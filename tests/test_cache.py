@@ -0,0 +1,105 @@
+# ResultCache hits, warm starts and eviction
+#
+# usage: python -m unittest discover -s tests
+
+import os, sys, shutil, tempfile, unittest
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from ctypes import *
+from glpk import *
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+def knapsack(cap=7.0, extra=0):
+    # maximize 10 x1 + 13 x2 + 7 x3 + 8 x4 subject to
+    #   3 x1 + 4 x2 + 2 x3 + 3 x4 <= cap, x binary
+    # plus extra free columns, changing the structure; the optimum for
+    # cap = 7 is 23 at x = (1, 1, 0, 0), its LP relaxation 23.5; for cap = 9
+    # it is 30
+    lp = glp_create_prob()
+    glp_set_obj_dir(lp, GLP_MAX)
+    glp_add_rows(lp, 1)
+    glp_add_cols(lp, 4 + extra)
+    glp_set_row_bnds(lp, 1, GLP_UP, 0.0, cap)
+    for j, c in enumerate((10.0, 13.0, 7.0, 8.0)):
+        glp_set_col_kind(lp, j+1, GLP_BV)
+        glp_set_obj_coef(lp, j+1, c)
+    for j in range(5, 5 + extra):
+        glp_set_col_bnds(lp, j, GLP_FX, 0.0, 0.0)
+    ind = (c_int * 5)(0, 1, 2, 3, 4)
+    val = (c_double * 5)(0.0, 3.0, 4.0, 2.0, 3.0)
+    glp_set_mat_row(lp, 1, 4, ind, val)
+    return lp
+
+def quiet_iocp():
+    parm = glp_iocp()
+    glp_init_iocp(parm)
+    parm.msg_lev = GLP_MSG_OFF
+    return parm
+
+
+class ResultCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.probs = []
+
+    def tearDown(self):
+        for lp in self.probs:
+            glp_delete_prob(lp)
+
+    def make(self, *args):
+        lp = knapsack(*args)
+        self.probs.append(lp)
+        return lp
+
+    def test_hit_and_warm(self):
+        cache = ResultCache()
+        r = cache.solve(self.make(), iocp=quiet_iocp())
+        self.assertEqual((cache.hits, cache.warm, cache.misses), (0, 0, 1))
+        self.assertAlmostEqual(r.obj, 23.5)
+        self.assertAlmostEqual(r.mip_obj, 23.0)
+        self.assertEqual(r.x.tolist(), [1.0, 1.0, 0.0, 0.0])
+
+        self.assertTrue(cache.solve(self.make(), iocp=quiet_iocp()) is r)
+        self.assertEqual(cache.hits, 1)
+
+        r = cache.solve(self.make(9.0), iocp=quiet_iocp())
+        self.assertEqual(cache.warm, 1)
+        self.assertAlmostEqual(r.mip_obj, 30.0)
+
+    def test_lp_result_does_not_answer_mip(self):
+        cache = ResultCache()
+        r = cache.solve(self.make())
+        self.assertTrue(r.x is None)
+        r = cache.solve(self.make(), iocp=quiet_iocp())
+        self.assertEqual((cache.hits, cache.warm), (0, 1))
+        self.assertAlmostEqual(r.mip_obj, 23.0)
+
+    def test_eviction(self):
+        cache = ResultCache(maxsize=2)
+        for extra in range(5):
+            cache.solve(self.make(7.0, extra))
+        self.assertEqual(len(cache._mem), 2)
+        self.assertEqual(len(cache._latest), 2)
+        self.assertTrue(cache.basis(fingerprint(ProblemData.from_prob(self.probs[0]))[0])
+            is None)
+
+    def test_directory(self):
+        directory = tempfile.mkdtemp()
+        try:
+            r = ResultCache(directory).solve(self.make(), iocp=quiet_iocp())
+            cache = ResultCache(directory)
+            s = cache.solve(self.make(), iocp=quiet_iocp())
+            self.assertEqual(cache.hits, 1)
+            self.assertAlmostEqual(s.mip_obj, r.mip_obj)
+            numpy.testing.assert_array_equal(s.stat, r.stat)
+        finally:
+            shutil.rmtree(directory)
+
+if numpy is None:
+    del ResultCacheTest
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+# Checkpoint and resume() of an interrupted search
+#
+# usage: python -m unittest discover -s tests
+
+import os, sys, shutil, tempfile, unittest
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from ctypes import *
+from glpk import *
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+def knapsack(n, seed, m=2):
+    # maximize v'x subject to W x <= W 1/2, x binary, with m random rows W;
+    # the LP relaxation is solved
+    rng = numpy.random.RandomState(seed)
+    w = rng.randint(10, 60, (m, n)).astype(float)
+    v = w.mean(0) + rng.randint(0, 20, n)
+    lp = glp_create_prob()
+    glp_set_obj_dir(lp, GLP_MAX)
+    glp_add_rows(lp, m)
+    glp_add_cols(lp, n)
+    for j in range(n):
+        glp_set_col_kind(lp, j+1, GLP_BV)
+        glp_set_obj_coef(lp, j+1, v[j])
+    ind = (c_int * (n+1))(0, *range(1, n+1))
+    for i in range(m):
+        glp_set_row_bnds(lp, i+1, GLP_UP, 0.0, w[i].sum()/2)
+        glp_set_mat_row(lp, i+1, n, ind, (c_double * (n+1))(0.0, *w[i]))
+    smcp = glp_smcp()
+    glp_init_smcp(smcp)
+    smcp.msg_lev = GLP_MSG_OFF
+    glp_simplex(lp, smcp)
+    return lp
+
+def quiet_iocp():
+    parm = glp_iocp()
+    glp_init_iocp(parm)
+    parm.msg_lev = GLP_MSG_OFF
+    return parm
+
+
+class Interrupt(object):
+    # plug-in terminating the search once it has an incumbent and has
+    # branched below the root
+    reasons = (GLP_IBRANCH,)
+
+    def __call__(self, tree, reason):
+        prob = glp_ios_get_prob(tree)
+        if glp_mip_status(prob) == GLP_FEAS and glp_ios_node_level(tree, glp_ios_curr_node(tree)) > 0:
+            glp_ios_terminate(tree)
+
+
+class CheckpointTest(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, 'search')
+        self.probs = []
+
+    def tearDown(self):
+        for lp in self.probs:
+            glp_delete_prob(lp)
+        shutil.rmtree(self.dir)
+
+    def make(self, n=30):
+        lp = knapsack(n, 0)
+        self.probs.append(lp)
+        return lp
+
+    def optimum(self):
+        lp = self.make()
+        self.assertEqual(intopt(lp, quiet_iocp()), 0)
+        return glp_mip_obj_val(lp)
+
+    def test_resume(self):
+        lp = self.make()
+        checkpoint = Checkpoint(lp, self.path, interval=0.0)
+        self.assertEqual(intopt(lp, quiet_iocp(), [Interrupt(), checkpoint]), GLP_ESTOP)
+        checkpoint.write()
+        incumbent = glp_mip_obj_val(lp)
+        f = numpy.load(self.path + '.npz')
+        self.assertEqual(f['size'].tolist(), [2, 30])
+        self.assertTrue('stat' in f.files)
+        self.assertTrue(f['gap'] > 0)
+
+        fresh = self.make()
+        self.assertEqual(resume(fresh, self.path, quiet_iocp()), 0)
+        self.assertEqual(glp_mip_status(fresh), GLP_OPT)
+        self.assertAlmostEqual(glp_mip_obj_val(fresh), self.optimum())
+        self.assertTrue(glp_mip_obj_val(fresh) >= incumbent - 1e-9)
+
+    def test_final(self):
+        lp = self.make()
+        checkpoint = Checkpoint(lp, self.path)
+        self.assertEqual(intopt(lp, quiet_iocp(), [checkpoint]), 0)
+        self.assertFalse(os.path.exists(self.path + '.mip'))
+        checkpoint.write()
+        self.assertAlmostEqual(checkpoint.obj, glp_mip_obj_val(lp))
+
+        # the saved incumbent is read back as it was written
+        fresh = self.make()
+        self.assertEqual(glp_read_mip(fresh, self.path + '.mip'), 0)
+        self.assertAlmostEqual(glp_mip_obj_val(fresh), checkpoint.obj)
+        self.assertEqual([glp_mip_col_val(fresh, j) for j in range(1, 31)], checkpoint.x.tolist())
+
+    def test_size_mismatch(self):
+        lp = self.make()
+        checkpoint = Checkpoint(lp, self.path)
+        checkpoint.write()
+        self.assertRaises(ValueError, resume, self.make(20), self.path)
+
+if numpy is None:
+    del CheckpointTest
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+# ColumnGeneration on a cutting stock master against the full pattern LP
+#
+# usage: python -m unittest discover -s tests
+
+import os, sys, itertools, unittest
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from ctypes import *
+from glpk import *
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# rolls of width W are cut into items of widths WIDTH, DEMAND of each
+W = 10
+WIDTH = [3, 4, 5]
+DEMAND = [20.0, 15.0, 10.0]
+
+def patterns():
+    # all nonzero cutting patterns fitting a roll
+    ranges = [range(W//w + 1) for w in WIDTH]
+    return [a for a in itertools.product(*ranges)
+        if any(a) and sum(k*w for k, w in zip(a, WIDTH)) <= W]
+
+def master(columns):
+    # min sum_p x_p subject to sum_p a_ip x_p >= d_i, one column per pattern
+    lp = glp_create_prob()
+    glp_add_rows(lp, len(WIDTH))
+    for i, d in enumerate(DEMAND):
+        glp_set_row_bnds(lp, i+1, GLP_LO, d, 0.0)
+    glp_add_cols(lp, len(columns))
+    for j, a in enumerate(columns):
+        glp_set_col_bnds(lp, j+1, GLP_LO, 0.0, 0.0)
+        glp_set_obj_coef(lp, j+1, 1.0)
+        nz = [(i+1, float(k)) for i, k in enumerate(a) if k]
+        glp_set_mat_col(lp, j+1, len(nz), (c_int * (len(nz)+1))(0, *[i for i, k in nz]),
+            (c_double * (len(nz)+1))(0.0, *[k for i, k in nz]))
+    return lp
+
+def pricing(duals, cg):
+    # the pattern of most negative reduced cost 1 - duals'a, if any
+    best = max(patterns(), key=lambda a: numpy.dot(duals, a))
+    if 1.0 - numpy.dot(duals, best) > -1e-9:
+        return None
+    rows = [i for i, k in enumerate(best) if k]
+    return 1.0, [0, len(rows)], rows, [float(best[i]) for i in rows]
+
+def full_optimum():
+    lp = master(patterns())
+    try:
+        smcp = glp_smcp()
+        glp_init_smcp(smcp)
+        smcp.msg_lev = GLP_MSG_OFF
+        assert glp_simplex(lp, smcp) == 0
+        return glp_get_obj_val(lp)
+    finally:
+        glp_delete_prob(lp)
+
+
+class ColumnGenerationTest(unittest.TestCase):
+
+    def setUp(self):
+        # start from the patterns cutting a single item as often as possible
+        self.lp = master([tuple(i == k and W//w or 0 for k in range(len(WIDTH)))
+            for i, w in enumerate(WIDTH)])
+
+    def tearDown(self):
+        glp_delete_prob(self.lp)
+
+    def test_optimum(self):
+        cg = ColumnGeneration(self.lp, pricing)
+        self.assertEqual(cg.solve(), 0)
+        self.assertEqual(glp_get_status(self.lp), GLP_OPT)
+        self.assertAlmostEqual(glp_get_obj_val(self.lp), full_optimum())
+        self.assertTrue(cg.iterations > 0)
+        self.assertEqual(glp_get_num_cols(self.lp), 3 + cg.iterations)
+        self.assertTrue(pricing(cg.duals(), cg) is None)
+
+    def test_purge(self):
+        cg = ColumnGeneration(self.lp, pricing, purge_age=2)
+        self.assertEqual(cg.solve(), 0)
+        n = glp_get_num_cols(self.lp)
+        # a single item of width 3 is dominated by the pattern (3, 0, 0)
+        self.assertEqual(cg.add_columns(1.0, [0, 1], [0], [1.0]), n+1)
+        glp_simplex(self.lp, cg.smcp)
+        self.assertEqual(cg.purge(), 0)
+        self.assertEqual(cg.purge(), 1)
+        self.assertEqual(glp_get_num_cols(self.lp), n)
+        self.assertEqual(len(cg.age), n - 3)
+        self.assertAlmostEqual(glp_get_obj_val(self.lp), full_optimum())
+
+    def test_max_iter(self):
+        cg = ColumnGeneration(self.lp, pricing)
+        self.assertEqual(cg.solve(max_iter=1), 0)
+        self.assertEqual((cg.iterations, glp_get_num_cols(self.lp)), (1, 4))
+
+if numpy is None:
+    del ColumnGenerationTest
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+# analyze_conditioning() on a facility model with a big-M linking row
+#
+# usage: python -m unittest discover -s tests
+
+import os, sys, unittest
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from ctypes import *
+from glpk import *
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+def problem():
+    # rows: demand  x1 + x2 >= 3
+    #       link    x1 - 1e7 y <= 0, y binary (big-M)
+    #       budget  0.5 x1 + 2 x2 <= 1e8 (large bound)
+    lp = glp_create_prob()
+    glp_add_rows(lp, 3)
+    glp_add_cols(lp, 3)
+    for i, name in enumerate(('demand', 'link', 'budget')):
+        glp_set_row_name(lp, i+1, name)
+    glp_set_col_name(lp, 1, 'x1')
+    glp_set_col_name(lp, 3, 'y')
+    glp_set_row_bnds(lp, 1, GLP_LO, 3.0, 0.0)
+    glp_set_row_bnds(lp, 2, GLP_UP, 0.0, 0.0)
+    glp_set_row_bnds(lp, 3, GLP_UP, 0.0, 1e8)
+    for j, c in enumerate((1.0, 2.0, 1000.0)):
+        glp_set_col_bnds(lp, j+1, GLP_LO, 0.0, 0.0)
+        glp_set_obj_coef(lp, j+1, c)
+    glp_set_col_kind(lp, 3, GLP_BV)
+    rows = [[(1, 1.0), (2, 1.0)], [(1, 1.0), (3, -1e7)], [(1, 0.5), (2, 2.0)]]
+    for i, row in enumerate(rows):
+        ind = (c_int * (len(row)+1))(0, *[j for j, v in row])
+        val = (c_double * (len(row)+1))(0.0, *[v for j, v in row])
+        glp_set_mat_row(lp, i+1, len(row), ind, val)
+    return lp
+
+
+class ConditioningTest(unittest.TestCase):
+
+    def setUp(self):
+        self.lp = problem()
+
+    def tearDown(self):
+        glp_delete_prob(self.lp)
+
+    def test_report(self):
+        report = analyze_conditioning(self.lp)
+        self.assertEqual((report.min_abs, report.max_abs), (0.5, 1e7))
+        self.assertEqual(report.histograms['matrix'], [(-1, 1), (0, 4), (7, 1)])
+        self.assertEqual(report.histograms['objective'], [(0, 2), (3, 1)])
+        # zero bounds are left out: 3 and 1 (y <= 1), and 1e8
+        self.assertEqual(report.histograms['bounds'], [(0, 2), (8, 1)])
+        numpy.testing.assert_allclose(report.row_range, [1.0, 1e7, 4.0])
+        numpy.testing.assert_allclose(report.col_range, [2.0, 2.0, 1.0])
+        self.assertEqual(report.worst_rows, [('link', 1e7), ('budget', 4.0)])
+        # column 2 is unnamed
+        self.assertEqual(report.worst_cols, [('x1', 2.0), (2, 2.0)])
+        self.assertEqual(report.big_m, [('link', 'y', 1e7)])
+        self.assertEqual(report.big_bounds, [('budget', 1e8)])
+        self.assertTrue('big-M 1e+07 in row link, column y' in str(report))
+
+    def test_options(self):
+        report = analyze_conditioning(self.lp, top=1, big_m=1e9,
+            data=ProblemData.from_prob(self.lp))
+        self.assertEqual(report.worst_rows, [('link', 1e7)])
+        self.assertEqual((report.big_m, report.big_bounds), ([], []))
+
+if numpy is None:
+    del ConditioningTest
+
+if __name__ == '__main__':
+    unittest.main()
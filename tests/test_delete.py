@@ -0,0 +1,61 @@
+# delete_rows() and delete_cols() with masks and number arrays
+#
+# usage: python -m unittest discover -s tests
+
+import os, sys, unittest
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from ctypes import *
+from glpk import *
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class BatchDeletion(unittest.TestCase):
+
+    def setUp(self):
+        # rows and columns named by their original numbers
+        self.lp = glp_create_prob()
+        glp_add_rows(self.lp, 6)
+        glp_add_cols(self.lp, 4)
+        for i in range(1, 7):
+            glp_set_row_name(self.lp, i, 'r%d' % i)
+        for j in range(1, 5):
+            glp_set_col_name(self.lp, j, 'c%d' % j)
+
+    def tearDown(self):
+        glp_delete_prob(self.lp)
+
+    def names(self, get_name, count):
+        return [get_name(self.lp, k) for k in range(1, count+1)]
+
+    def test_rows(self):
+        remap = delete_rows(self.lp, [5, 2, 5])
+        self.assertEqual(remap.tolist(), [0, 1, 0, 2, 3, 0, 4])
+        self.assertEqual(self.names(glp_get_row_name, glp_get_num_rows(self.lp)),
+            ['r1', 'r3', 'r4', 'r6'])
+        data = numpy.arange(1, 7)
+        self.assertEqual(data[remap[1:] > 0].tolist(), [1, 3, 4, 6])
+
+    def test_cols_mask(self):
+        remap = delete_cols(self.lp, numpy.array([True, False, False, True]))
+        self.assertEqual(remap.tolist(), [0, 0, 1, 2, 0])
+        self.assertEqual(self.names(glp_get_col_name, glp_get_num_cols(self.lp)), ['c2', 'c3'])
+
+    def test_nothing(self):
+        self.assertEqual(delete_cols(self.lp, []).tolist(), [0, 1, 2, 3, 4])
+        self.assertEqual(glp_get_num_cols(self.lp), 4)
+
+    def test_errors(self):
+        self.assertRaises(ValueError, delete_rows, self.lp, [0])
+        self.assertRaises(ValueError, delete_rows, self.lp, [7])
+        self.assertRaises(ValueError, delete_cols, self.lp, numpy.ones(3, bool))
+        self.assertEqual(glp_get_num_rows(self.lp), 6)
+
+if numpy is None:
+    del BatchDeletion
+
+if __name__ == '__main__':
+    unittest.main()
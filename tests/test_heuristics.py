@@ -0,0 +1,109 @@
+# Primal heuristics and the Heuristics plug-in on a random knapsack problem
+#
+# usage: python -m unittest discover -s tests
+
+import os, sys, unittest
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from ctypes import *
+from glpk import *
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+def knapsack(n, seed, m=2):
+    # maximize v'x subject to W x <= W 1/2, x binary, with m random rows W;
+    # the LP relaxation is solved
+    rng = numpy.random.RandomState(seed)
+    w = rng.randint(10, 60, (m, n)).astype(float)
+    v = w.mean(0) + rng.randint(0, 20, n)
+    lp = glp_create_prob()
+    glp_set_obj_dir(lp, GLP_MAX)
+    glp_add_rows(lp, m)
+    glp_add_cols(lp, n)
+    for j in range(n):
+        glp_set_col_kind(lp, j+1, GLP_BV)
+        glp_set_obj_coef(lp, j+1, v[j])
+    ind = (c_int * (n+1))(0, *range(1, n+1))
+    for i in range(m):
+        glp_set_row_bnds(lp, i+1, GLP_UP, 0.0, w[i].sum()/2)
+        glp_set_mat_row(lp, i+1, n, ind, (c_double * (n+1))(0.0, *w[i]))
+    smcp = glp_smcp()
+    glp_init_smcp(smcp)
+    smcp.msg_lev = GLP_MSG_OFF
+    glp_simplex(lp, smcp)
+    return lp
+
+def quiet_iocp():
+    parm = glp_iocp()
+    glp_init_iocp(parm)
+    parm.msg_lev = GLP_MSG_OFF
+    return parm
+
+def col_prim(lp):
+    return numpy.array([glp_get_col_prim(lp, j) for j in range(1, glp_get_num_cols(lp)+1)])
+
+
+class HeuristicsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.lp = knapsack(20, 1)
+        self.model = HeuristicModel(self.lp)
+        self.x = col_prim(self.lp)
+
+    def tearDown(self):
+        glp_delete_prob(self.lp)
+
+    def row(self, i):
+        # (0-based column, value) pairs of row i
+        ind = (c_int * 21)()
+        val = (c_double * 21)()
+        k = glp_get_mat_row(self.lp, i, ind, val)
+        return [(ind[t]-1, val[t]) for t in range(1, k+1)]
+
+    def test_model(self):
+        model, x = self.model, self.x
+        self.assertTrue(model.violation(x) > 0)
+        self.assertFalse(model.feasible(x))
+        self.assertTrue(model.feasible(numpy.zeros(20)))
+        self.assertFalse(model.feasible(numpy.ones(20)))
+        y = model.round(x)
+        self.assertEqual(set(y.tolist()) - set([0.0, 1.0]), set())
+        numpy.testing.assert_allclose(model.activity(y),
+            [sum(v*y[j] for j, v in self.row(i)) for i in (1, 2)])
+
+    def test_diving(self):
+        y = diving_rounding(self.x.copy(), self.model)
+        self.assertTrue(y is not None and self.model.feasible(y))
+
+    def test_feasibility_pump(self):
+        y = FeasibilityPump(seed=0)(self.x.copy(), self.model)
+        self.assertTrue(y is not None and self.model.feasible(y))
+
+    def test_plugin(self):
+        # reference optimum and solution from glp_intopt on a copy
+        copy = glp_create_prob()
+        glp_copy_prob(copy, self.lp, GLP_OFF)
+        parm = quiet_iocp()
+        parm.presolve = GLP_ON
+        glp_intopt(copy, parm)
+        obj = glp_mip_obj_val(copy)
+        best = numpy.array([glp_mip_col_val(copy, j) for j in range(1, 21)])
+        glp_delete_prob(copy)
+
+        heur = Heuristics(self.lp)
+        heur.add(lambda x, model: best, max_calls=1)
+        heur.add(diving_rounding)
+        self.assertEqual(intopt(self.lp, quiet_iocp(), [heur]), 0)
+        self.assertEqual(glp_mip_status(self.lp), GLP_OPT)
+        self.assertAlmostEqual(glp_mip_obj_val(self.lp), obj)
+        self.assertEqual(heur.heuristics[0]['calls'], 1)
+        self.assertEqual(heur.heuristics[0]['found'], 1)
+        self.assertAlmostEqual(heur.best, -obj)
+
+if numpy is None:
+    del HeuristicsTest
+
+if __name__ == '__main__':
+    unittest.main()
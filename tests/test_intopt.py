@@ -0,0 +1,115 @@
+# intopt() dispatching glp_intopt callbacks to plug-ins and parm.cb_func
+#
+# usage: python -m unittest discover -s tests
+
+import os, sys, unittest
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from ctypes import *
+from glpk import *
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+def knapsack():
+    # maximize 10 x1 + 13 x2 + 7 x3 + 8 x4 subject to
+    #   3 x1 + 4 x2 + 2 x3 + 3 x4 <= 7, x binary
+    # the LP relaxation is fractional (23.5), the optimum is x = (1, 1, 0, 0)
+    lp = glp_create_prob()
+    glp_set_obj_dir(lp, GLP_MAX)
+    glp_add_rows(lp, 1)
+    glp_add_cols(lp, 4)
+    glp_set_row_bnds(lp, 1, GLP_UP, 0.0, 7.0)
+    for j, (c, a) in enumerate(((10.0, 3.0), (13.0, 4.0), (7.0, 2.0), (8.0, 3.0))):
+        glp_set_col_kind(lp, j+1, GLP_BV)
+        glp_set_obj_coef(lp, j+1, c)
+    ind = (c_int * 5)(0, 1, 2, 3, 4)
+    val = (c_double * 5)(0.0, 3.0, 4.0, 2.0, 3.0)
+    glp_set_mat_row(lp, 1, 4, ind, val)
+    smcp = glp_smcp()
+    glp_init_smcp(smcp)
+    smcp.msg_lev = GLP_MSG_OFF
+    glp_simplex(lp, smcp)
+    return lp
+
+def quiet_iocp():
+    parm = glp_iocp()
+    glp_init_iocp(parm)
+    parm.msg_lev = GLP_MSG_OFF
+    return parm
+
+
+class Recorder(object):
+    # plug-in remembering the reasons it was called for
+    reasons = (GLP_ISELECT, GLP_IPREPRO, GLP_IROWGEN, GLP_IHEUR, GLP_ICUTGEN, GLP_IBRANCH,
+        GLP_IBINGO)
+
+    def __init__(self):
+        self.seen = []
+
+    def __call__(self, tree, reason):
+        self.seen.append(reason)
+
+
+class Failing(object):
+    reasons = (GLP_IHEUR,)
+
+    def __call__(self, tree, reason):
+        raise KeyError('plug-in failure')
+
+
+class IntoptDispatch(unittest.TestCase):
+
+    def setUp(self):
+        self.lp = knapsack()
+
+    def tearDown(self):
+        glp_delete_prob(self.lp)
+
+    def check_optimum(self):
+        self.assertEqual(glp_mip_status(self.lp), GLP_OPT)
+        self.assertAlmostEqual(glp_mip_obj_val(self.lp), 23.0)
+        x = [glp_mip_col_val(self.lp, j) for j in range(1, 5)]
+        self.assertEqual(x, [1.0, 1.0, 0.0, 0.0])
+
+    def test_default_parm(self):
+        self.assertEqual(intopt(self.lp), 0)
+        self.check_optimum()
+
+    def test_plugins(self):
+        plugin = Recorder()
+        self.assertEqual(intopt(self.lp, quiet_iocp(), [plugin]), 0)
+        self.check_optimum()
+        self.assertTrue(GLP_IBRANCH in plugin.seen)
+        self.assertTrue(GLP_ISELECT in plugin.seen)
+
+    def test_user_callback(self):
+        # parm.cb_func is called once per callback after the plug-ins, with
+        # parm.cb_info, and is left in parm
+        plugin, calls = Recorder(), []
+        def user(tree, info):
+            calls.append((glp_ios_reason(tree), info))
+        parm = quiet_iocp()
+        cb_func = glp_iocp_cback_func(user)
+        parm.cb_func = cb_func
+        parm.cb_info = 42
+        self.assertEqual(intopt(self.lp, parm, [plugin]), 0)
+        self.check_optimum()
+        self.assertEqual([reason for reason, info in calls], plugin.seen)
+        self.assertEqual(set(info for reason, info in calls), set([42]))
+        self.assertEqual(cast(parm.cb_func, c_void_p).value, cast(cb_func, c_void_p).value)
+
+    def test_start(self):
+        self.assertEqual(intopt(self.lp, quiet_iocp(), start=[1, 1, 0, 0]), 0)
+        self.check_optimum()
+        self.assertRaises(ValueError, intopt, self.lp, quiet_iocp(), start=[1, 1, 1, 0])
+
+    def test_plugin_error(self):
+        self.assertRaises(KeyError, intopt, self.lp, quiet_iocp(), [Failing()])
+
+if numpy is None:
+    del IntoptDispatch
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+# check_kkt() and kkt_residuals() on an optimal and a perturbed solution
+#
+# usage: python -m unittest discover -s tests
+
+import os, sys, unittest
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from ctypes import *
+from glpk import *
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+def sample():
+    # the problem of sample.py, optimal at z = 733.33
+    lp = glp_create_prob()
+    glp_set_obj_dir(lp, GLP_MAX)
+    glp_add_rows(lp, 3)
+    glp_add_cols(lp, 3)
+    for i, ub in enumerate((100.0, 600.0, 300.0)):
+        glp_set_row_bnds(lp, i+1, GLP_UP, 0.0, ub)
+    for j, c in enumerate((10.0, 6.0, 4.0)):
+        glp_set_col_bnds(lp, j+1, GLP_LO, 0.0, 0.0)
+        glp_set_obj_coef(lp, j+1, c)
+    ind = (c_int * 4)(0, 1, 2, 3)
+    for i, row in enumerate(((1.0, 1.0, 1.0), (10.0, 4.0, 5.0), (2.0, 2.0, 6.0))):
+        glp_set_mat_row(lp, i+1, 3, ind, (c_double * 4)(0.0, *row))
+    smcp = glp_smcp()
+    glp_init_smcp(smcp)
+    smcp.msg_lev = GLP_MSG_OFF
+    assert glp_simplex(lp, smcp) == 0 and glp_get_status(lp) == GLP_OPT
+    return lp
+
+
+class KKTChecks(unittest.TestCase):
+
+    def setUp(self):
+        self.lp = sample()
+
+    def tearDown(self):
+        glp_delete_prob(self.lp)
+
+    def test_optimal(self):
+        self.assertAlmostEqual(glp_get_obj_val(self.lp), 2200.0/3)
+        result = check_kkt(self.lp)
+        for check in result:
+            self.assertEqual(check.quality, 'H')
+            self.assertTrue(check.re_max <= 1e-9)
+        pe, de = kkt_residuals(self.lp)
+        numpy.testing.assert_allclose(pe, 0.0, atol=1e-9)
+        numpy.testing.assert_allclose(de, 0.0, atol=1e-9)
+
+    def test_selected_checks(self):
+        result = check_kkt(self.lp, ('pb', 'cs'))
+        self.assertEqual((result.pe, result.de, result.db), (None, None, None))
+        self.assertEqual(result.pb.quality, 'H')
+        self.assertEqual(result.cs.quality, 'H')
+
+    def test_perturbed_objective(self):
+        # the solution stays, so the dual residual of column 2 is the change
+        glp_set_obj_coef(self.lp, 2, 11.0)
+        pe, de = kkt_residuals(self.lp)
+        numpy.testing.assert_allclose(pe, 0.0, atol=1e-9)
+        numpy.testing.assert_allclose(de, [0.0, 5.0, 0.0], atol=1e-9)
+        result = check_kkt(self.lp, ('de',))
+        self.assertEqual(result.de.ae_ind, 2)
+        self.assertAlmostEqual(result.de.ae_max, 5.0)
+        self.assertEqual(result.de.quality, '?')
+
+    def test_subset(self):
+        glp_set_obj_coef(self.lp, 2, 11.0)
+        pe, de = kkt_residuals(self.lp, rows=[3], cols=[2, 3])
+        numpy.testing.assert_allclose(pe, [0.0], atol=1e-9)
+        numpy.testing.assert_allclose(de, [5.0, 0.0], atol=1e-9)
+        result = check_kkt(self.lp, ('pe', 'de'), sample=2, seed=1)
+        self.assertEqual(result.pe.quality, 'H')
+
+if numpy is None:
+    del KKTChecks
+
+if __name__ == '__main__':
+    unittest.main()
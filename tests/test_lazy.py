@@ -0,0 +1,93 @@
+# LazyConstraints on a weighted independent set of a path, against its
+# dynamic programming optimum
+#
+# usage: python -m unittest discover -s tests
+
+import os, sys, unittest
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from ctypes import *
+from glpk import *
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+def path_optimum(v):
+    # maximum weight of a set of vertices of the path 1..n, no two adjacent
+    take, skip = 0.0, 0.0
+    for w in v:
+        take, skip = skip + w, max(take, skip)
+    return max(take, skip)
+
+def problem(v):
+    # maximize v'x, x binary, without any rows: all the edge constraints
+    # x_j + x_j+1 <= 1 are lazy. They form an interval matrix, so every LP
+    # solution on the way is integral and GLPK never needs its own
+    # heuristics, which do not see the rows added in the tree
+    n = len(v)
+    lp = glp_create_prob()
+    glp_set_obj_dir(lp, GLP_MAX)
+    glp_add_cols(lp, n)
+    for j in range(n):
+        glp_set_col_kind(lp, j+1, GLP_BV)
+        glp_set_obj_coef(lp, j+1, v[j])
+    smcp = glp_smcp()
+    glp_init_smcp(smcp)
+    smcp.msg_lev = GLP_MSG_OFF
+    glp_simplex(lp, smcp)
+    return lp
+
+def quiet_iocp():
+    parm = glp_iocp()
+    glp_init_iocp(parm)
+    parm.msg_lev = GLP_MSG_OFF
+    return parm
+
+
+class LazyConstraintsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.v = numpy.random.RandomState(0).randint(1, 20, 12).astype(float)
+        self.lp = problem(self.v)
+
+    def tearDown(self):
+        glp_delete_prob(self.lp)
+
+    def all_edges(self, x):
+        n = len(x)
+        indices = numpy.vstack((numpy.arange(n-1), numpy.arange(1, n))).T.ravel()
+        return numpy.arange(n)*2, indices, numpy.ones(2*(n-1)), -numpy.inf, 1.0
+
+    def first_violated(self, x):
+        # a single row per call, so that rows are added in several rounds
+        j = numpy.flatnonzero(x[:-1] + x[1:] > 1.5)
+        if not len(j):
+            return None
+        return [0, 2], [j[0], j[0]+1], [1.0, 1.0], -numpy.inf, 1.0
+
+    def check(self, lazy):
+        self.assertEqual(intopt(self.lp, quiet_iocp(), [lazy]), 0)
+        self.assertEqual(glp_mip_status(self.lp), GLP_OPT)
+        self.assertAlmostEqual(glp_mip_obj_val(self.lp), path_optimum(self.v))
+        x = numpy.array([glp_mip_col_val(self.lp, j) for j in range(1, len(self.v)+1)])
+        self.assertTrue((x[:-1] + x[1:] <= 1.0).all())
+        self.assertEqual(glp_get_num_rows(self.lp), 0)
+
+    def test_all_rows(self):
+        lazy = LazyConstraints(self.all_edges)
+        self.check(lazy)
+        # x = 1 at the root violates every row, none is added twice
+        self.assertEqual(lazy.added, len(self.v) - 1)
+
+    def test_rounds(self):
+        lazy = LazyConstraints(self.first_violated, integral_only=True)
+        self.check(lazy)
+        self.assertTrue(lazy.added > 1)
+        self.assertEqual(lazy.calls, lazy.added + 1)
+
+if numpy is None:
+    del LazyConstraintsTest
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+# get_matrix() in every format against glp_get_mat_row
+#
+# usage: python -m unittest discover -s tests
+
+import os, sys, unittest
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from ctypes import *
+from glpk import *
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+def problem(a):
+    # problem object with the constraint matrix a
+    m, n = a.shape
+    lp = glp_create_prob()
+    if m:
+        glp_add_rows(lp, m)
+    if n:
+        glp_add_cols(lp, n)
+    for i in range(m):
+        nz = numpy.flatnonzero(a[i])
+        ind = (c_int * (len(nz)+1))(0, *(nz + 1).tolist())
+        val = (c_double * (len(nz)+1))(0.0, *a[i, nz].tolist())
+        glp_set_mat_row(lp, i+1, len(nz), ind, val)
+    return lp
+
+def dense(result, fmt, shape):
+    # the matrix returned by get_matrix() as a dense array
+    if hasattr(result, 'toarray'):
+        assert result.format == fmt
+        return result.toarray()
+    a = numpy.zeros(shape)
+    if fmt == 'coo':
+        row, col, data = result
+    else:
+        indptr, indices, data = result
+        major = numpy.repeat(numpy.arange(len(indptr) - 1), numpy.diff(indptr))
+        row, col = (indices, major) if fmt == 'csc' else (major, indices)
+    a[row, col] = data
+    return a
+
+
+class GetMatrix(unittest.TestCase):
+
+    def check(self, a):
+        lp = problem(a)
+        try:
+            for fmt in ('csc', 'csr', 'coo'):
+                numpy.testing.assert_array_equal(dense(get_matrix(lp, fmt), fmt, a.shape), a)
+            self.assertRaises(ValueError, get_matrix, lp, 'dense')
+        finally:
+            glp_delete_prob(lp)
+
+    def test_random(self):
+        rng = numpy.random.RandomState(0)
+        a = rng.randn(7, 5)*(rng.rand(7, 5) < 0.4)
+        a[:, 2] = 0.0 # an empty column
+        a[3] = 0.0 # an empty row
+        self.check(a)
+
+    def test_empty(self):
+        self.check(numpy.zeros((3, 2)))
+        self.check(numpy.zeros((0, 0)))
+
+if numpy is None:
+    del GetMatrix
+
+if __name__ == '__main__':
+    unittest.main()
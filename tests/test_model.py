@@ -0,0 +1,84 @@
+# Model, VarBlock and LinExpr arithmetic and building
+#
+# usage: python -m unittest discover -s tests
+
+import os, sys, unittest
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from ctypes import *
+from glpk import *
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class LinExprArithmetic(unittest.TestCase):
+
+    def setUp(self):
+        self.model = Model()
+        self.x = self.model.add_vars(3)
+        self.y = self.model.add_vars()
+
+    def check(self, e, shape, rows):
+        # rows: the dense coefficients of (x0, x1, x2, y) and the constant of
+        # each expression
+        self.assertEqual(e.shape, shape)
+        idx, col, val = e.terms.arrays()
+        dense = numpy.zeros((e.size, 5))
+        numpy.add.at(dense, (idx, col), val)
+        dense[:, 4] = e.const
+        numpy.testing.assert_allclose(dense, numpy.reshape(rows, (-1, 5)))
+
+    def test_scalar_times_array(self):
+        self.check(self.y*numpy.array([2.0]), (1,), [0, 0, 0, 2, 0])
+        self.check(numpy.array([[2.0], [3.0]])*(self.y + 1), (2, 1),
+            [[0, 0, 0, 2, 2], [0, 0, 0, 3, 3]])
+        self.check((self.y + 1)*2.0, (), [0, 0, 0, 2, 2])
+
+    def test_array_times_array(self):
+        self.check(self.x*numpy.array([1.0, 2.0, 3.0]), (3,),
+            [[1, 0, 0, 0, 0], [0, 2, 0, 0, 0], [0, 0, 3, 0, 0]])
+        self.check(self.x*numpy.array([2.0]), (3,),
+            [[2, 0, 0, 0, 0], [0, 2, 0, 0, 0], [0, 0, 2, 0, 0]])
+        self.assertRaises(ValueError, lambda: self.x*numpy.ones((2, 3)))
+        self.assertRaises(ValueError, lambda: self.x*numpy.ones(2))
+
+    def test_add_and_dot(self):
+        self.check(self.x - self.y, (3,),
+            [[1, 0, 0, -1, 0], [0, 1, 0, -1, 0], [0, 0, 1, -1, 0]])
+        self.check(self.x.dot([1.0, 2.0, 3.0]) + 4, (), [1, 2, 3, 0, 4])
+        self.check(self.x.sum(), (), [1, 1, 1, 0, 0])
+
+
+class ModelBuild(unittest.TestCase):
+
+    def test_knapsack(self):
+        # maximize 10 x1 + 13 x2 + 7 x3 + 8 x4 subject to
+        #   3 x1 + 4 x2 + 2 x3 + 3 x4 <= 7, x binary
+        # the optimum is 23 at x = (1, 1, 0, 0)
+        model = Model()
+        x = model.add_vars(4, kind=GLP_BV, name='x')
+        model.add(x.dot([3.0, 4.0, 2.0, 3.0]) <= 7, name='weight')
+        model.maximize(x*numpy.array([10.0, 13.0, 7.0, 8.0]))
+        lp = model.build()
+        try:
+            self.assertEqual((glp_get_num_rows(lp), glp_get_num_cols(lp)), (1, 4))
+            self.assertEqual(glp_get_num_int(lp), 4)
+            self.assertEqual(glp_get_col_name(lp, 2), 'x[1]')
+            self.assertEqual(glp_get_row_name(lp, 1), 'weight')
+            parm = glp_iocp()
+            glp_init_iocp(parm)
+            parm.msg_lev = GLP_MSG_OFF
+            parm.presolve = GLP_ON
+            self.assertEqual(glp_intopt(lp, parm), 0)
+            self.assertAlmostEqual(glp_mip_obj_val(lp), 23.0)
+            self.assertEqual(model.value(lp, x, mip=True).tolist(), [1.0, 1.0, 0.0, 0.0])
+        finally:
+            glp_delete_prob(lp)
+
+if numpy is None:
+    del LinExprArithmetic, ModelBuild
+
+if __name__ == '__main__':
+    unittest.main()
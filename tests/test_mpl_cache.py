@@ -0,0 +1,103 @@
+# MathProgCache hits and misses for model/data file pairs
+#
+# usage: python -m unittest discover -s tests
+
+import os, sys, shutil, tempfile, unittest
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from ctypes import *
+from glpk import *
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+MODEL = """
+set I;
+param c{I};
+param w{I};
+param cap;
+var x{I} binary;
+maximize z: sum{i in I} c[i]*x[i];
+s.t. weight: sum{i in I} w[i]*x[i] <= cap;
+end;
+"""
+
+# the optimum is 23 at x = (1, 1, 0, 0) for cap = 7, 30 for cap = 9
+DATA = """
+data;
+set I := a b c d;
+param c := a 10 b 13 c 7 d 8;
+param w := a 3 b 4 c 2 d 3;
+param cap := %d;
+end;
+"""
+
+def optimum(lp):
+    parm = glp_iocp()
+    glp_init_iocp(parm)
+    parm.msg_lev = GLP_MSG_OFF
+    parm.presolve = GLP_ON
+    assert glp_intopt(lp, parm) == 0
+    return glp_mip_obj_val(lp)
+
+
+class MathProgCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.model = self.write('knapsack.mod', MODEL)
+        self.data = self.write('knapsack.dat', DATA % 7)
+        self.probs = []
+
+    def tearDown(self):
+        for lp in self.probs:
+            glp_delete_prob(lp)
+        shutil.rmtree(self.dir)
+
+    def write(self, name, text):
+        path = os.path.join(self.dir, name)
+        f = open(path, 'w')
+        f.write(text)
+        f.close()
+        return path
+
+    def build(self, cache):
+        lp = cache.build(self.model, self.data)
+        self.probs.append(lp)
+        return lp
+
+    def test_hit(self):
+        cache = MathProgCache()
+        a = self.build(cache)
+        b = self.build(cache)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        self.assertEqual(glp_get_col_name(b, 2), 'x[b]')
+        # the objective is translated as the free row 1
+        self.assertEqual(glp_get_row_name(b, 2), 'weight')
+        self.assertAlmostEqual(optimum(a), 23.0)
+        self.assertAlmostEqual(optimum(b), 23.0)
+
+    def test_changed_data(self):
+        cache = MathProgCache()
+        self.build(cache)
+        # another size, so that the stale hash is detected within the same second
+        self.write('knapsack.dat', DATA % 9 + '\n')
+        lp = self.build(cache)
+        self.assertEqual((cache.hits, cache.misses), (0, 2))
+        self.assertAlmostEqual(optimum(lp), 30.0)
+
+    def test_directory(self):
+        store = os.path.join(self.dir, 'cache')
+        os.mkdir(store)
+        self.build(MathProgCache(store))
+        cache = MathProgCache(store)
+        lp = self.build(cache)
+        self.assertEqual((cache.hits, cache.misses), (1, 0))
+        self.assertAlmostEqual(optimum(lp), 23.0)
+
+if numpy is None:
+    del MathProgCacheTest
+
+if __name__ == '__main__':
+    unittest.main()
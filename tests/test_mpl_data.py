@@ -0,0 +1,90 @@
+# mpl_read_data() and mpl_data_text() feeding MathProg data from Python
+#
+# usage: python -m unittest discover -s tests
+
+import os, sys, shutil, tempfile, unittest
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from ctypes import *
+from glpk import *
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# knapsack over the items I, with the profit and weight in the rows of the
+# table a; the optimum is 23 at x = (1, 1, 0, 0) for the data below
+MODEL = """
+set I;
+param n integer;
+param a{1..2, 1..n};
+param cap, default 7;
+var x{1..n} binary;
+maximize z: sum{j in 1..n} a[1,j]*x[j];
+s.t. weight: sum{j in 1..n} a[2,j]*x[j] <= cap;
+s.t. one{i in I}: x[1] <= 1;
+end;
+"""
+
+TABLE = [[10.0, 13.0, 7.0, 8.0], [3.0, 4.0, 2.0, 3.0]]
+
+
+class MathProgData(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.model = os.path.join(self.dir, 'knapsack.mod')
+        f = open(self.model, 'w')
+        f.write(MODEL)
+        f.close()
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def solve(self, sets, params, chunk_size=4096):
+        tran = glp_mpl_alloc_wksp()
+        lp = glp_create_prob()
+        try:
+            self.assertEqual(glp_mpl_read_model(tran, self.model, 1), 0)
+            self.assertEqual(mpl_read_data(tran, sets, params, chunk_size), 0)
+            self.assertEqual(glp_mpl_generate(tran, None), 0)
+            glp_mpl_build_prob(tran, lp)
+            parm = glp_iocp()
+            glp_init_iocp(parm)
+            parm.msg_lev = GLP_MSG_OFF
+            parm.presolve = GLP_ON
+            self.assertEqual(glp_intopt(lp, parm), 0)
+            names = [glp_get_row_name(lp, i) for i in range(1, glp_get_num_rows(lp)+1)]
+            return glp_mip_obj_val(lp), names
+        finally:
+            glp_delete_prob(lp)
+            glp_mpl_free_wksp(tran)
+
+    def test_array(self):
+        obj, names = self.solve({'I': ['a', "it's", 'c d']},
+            {'n': 4, 'a': numpy.array(TABLE)}, chunk_size=1)
+        self.assertAlmostEqual(obj, 23.0)
+        self.assertEqual(names[2:], ['one[a]', "one['it''s']", "one['c d']"])
+
+    def test_dict(self):
+        a = dict(((i+1, j+1), v) for i, row in enumerate(TABLE) for j, v in enumerate(row))
+        obj, names = self.solve({'I': [1]}, {'n': 4, 'a': a, 'cap': 9})
+        self.assertAlmostEqual(obj, 30.0)
+
+    def test_default(self):
+        # NaN takes the default value of cap
+        obj, names = self.solve({'I': []}, {'n': 4, 'a': numpy.array(TABLE),
+            'cap': numpy.array(numpy.nan)})
+        self.assertAlmostEqual(obj, 23.0)
+
+    def test_text(self):
+        text = mpl_data_text({'I': [('a', 1)]}, {'p': {('a', 1): 2.5}})
+        self.assertEqual(text.splitlines(),
+            ['data;', 'set I :=', '(a,1);', 'param p :=', 'a 1 2.5', ';', 'end;'])
+        self.assertEqual(mpl_data_text(params={'q': float('nan')}), 'data;\nend;\n')
+
+if numpy is None:
+    del MathProgData
+
+if __name__ == '__main__':
+    unittest.main()
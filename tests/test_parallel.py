@@ -0,0 +1,83 @@
+# parallel_intopt() against glp_intopt on random knapsack problems
+#
+# usage: python -m unittest discover -s tests
+
+import os, sys, unittest
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from ctypes import *
+from glpk import *
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+def knapsack(n, seed, m=2):
+    # maximize v'x subject to W x <= W 1/2, x binary, with m random rows W
+    rng = numpy.random.RandomState(seed)
+    w = rng.randint(10, 60, (m, n)).astype(float)
+    v = w.mean(0) + rng.randint(0, 20, n)
+    lp = glp_create_prob()
+    glp_set_obj_dir(lp, GLP_MAX)
+    glp_add_rows(lp, m)
+    glp_add_cols(lp, n)
+    for j in range(n):
+        glp_set_col_kind(lp, j+1, GLP_BV)
+        glp_set_obj_coef(lp, j+1, v[j])
+    ind = (c_int * (n+1))(0, *range(1, n+1))
+    for i in range(m):
+        glp_set_row_bnds(lp, i+1, GLP_UP, 0.0, w[i].sum()/2)
+        glp_set_mat_row(lp, i+1, n, ind, (c_double * (n+1))(0.0, *w[i]))
+    return lp
+
+def quiet_iocp():
+    parm = glp_iocp()
+    glp_init_iocp(parm)
+    parm.msg_lev = GLP_MSG_OFF
+    return parm
+
+def reference(lp):
+    # optimum found by glp_intopt on a copy
+    copy = glp_create_prob()
+    try:
+        glp_copy_prob(copy, lp, GLP_OFF)
+        parm = quiet_iocp()
+        parm.presolve = GLP_ON
+        assert glp_intopt(copy, parm) == 0 and glp_mip_status(copy) == GLP_OPT
+        return glp_mip_obj_val(copy)
+    finally:
+        glp_delete_prob(copy)
+
+
+class ParallelIntopt(unittest.TestCase):
+
+    def test_optimum(self):
+        for seed in range(3):
+            lp = knapsack(20, seed)
+            try:
+                obj = reference(lp)
+                result = parallel_intopt(lp, quiet_iocp(), depth=2, processes=2)
+                self.assertEqual(result.status, GLP_OPT)
+                self.assertAlmostEqual(result.obj, obj)
+                self.assertEqual(set(result.x.tolist()) - set([0.0, 1.0]), set())
+                v = numpy.array([glp_get_obj_coef(lp, j) for j in range(1, 21)])
+                self.assertAlmostEqual(numpy.dot(v, result.x), obj)
+                # lp itself is not solved
+                self.assertEqual(glp_mip_status(lp), GLP_UNDEF)
+            finally:
+                glp_delete_prob(lp)
+
+    def test_infeasible(self):
+        lp = knapsack(10, 0)
+        try:
+            glp_set_row_bnds(lp, 1, GLP_DB, 0.5, 0.75)
+            result = parallel_intopt(lp, quiet_iocp(), depth=1, processes=2)
+            self.assertEqual(result, (GLP_NOFEAS, None, None))
+        finally:
+            glp_delete_prob(lp)
+
+if numpy is None or not hasattr(os, 'fork'):
+    del ParallelIntopt
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+# SolutionPool bookkeeping and the solutions it collects during a search
+#
+# usage: python -m unittest discover -s tests
+
+import os, sys, itertools, unittest
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from ctypes import *
+from glpk import *
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+def knapsack(w, v):
+    # maximize v'x subject to W x <= W 1/2, x binary; the LP relaxation is
+    # solved
+    m, n = w.shape
+    lp = glp_create_prob()
+    glp_set_obj_dir(lp, GLP_MAX)
+    glp_add_rows(lp, m)
+    glp_add_cols(lp, n)
+    for j in range(n):
+        glp_set_col_kind(lp, j+1, GLP_BV)
+        glp_set_obj_coef(lp, j+1, v[j])
+    ind = (c_int * (n+1))(0, *range(1, n+1))
+    for i in range(m):
+        glp_set_row_bnds(lp, i+1, GLP_UP, 0.0, w[i].sum()/2)
+        glp_set_mat_row(lp, i+1, n, ind, (c_double * (n+1))(0.0, *w[i]))
+    smcp = glp_smcp()
+    glp_init_smcp(smcp)
+    smcp.msg_lev = GLP_MSG_OFF
+    glp_simplex(lp, smcp)
+    return lp
+
+def quiet_iocp():
+    parm = glp_iocp()
+    glp_init_iocp(parm)
+    parm.msg_lev = GLP_MSG_OFF
+    return parm
+
+
+class SolutionPoolTest(unittest.TestCase):
+
+    def setUp(self):
+        rng = numpy.random.RandomState(0)
+        self.w = rng.randint(10, 60, (2, 12)).astype(float)
+        self.v = self.w.mean(0) + rng.randint(0, 20, 12)
+        self.lp = knapsack(self.w, self.v)
+        # objective values of all feasible solutions, by enumeration
+        x = numpy.array(list(itertools.product((0.0, 1.0), repeat=12)))
+        feasible = (numpy.dot(x, self.w.T) <= self.w.sum(1)/2 + 1e-9).all(1)
+        self.objs = numpy.sort(numpy.dot(x[feasible], self.v))[::-1]
+
+    def tearDown(self):
+        glp_delete_prob(self.lp)
+
+    def check(self, pool):
+        solutions = pool.solutions()
+        objs = [obj for obj, x in solutions]
+        self.assertTrue(0 < len(solutions) <= pool.k)
+        self.assertEqual(objs, sorted(objs, reverse=True))
+        self.assertAlmostEqual(objs[0], self.objs[0])
+        self.assertEqual(len(set(tuple(x) for obj, x in solutions)), len(solutions))
+        for obj, x in solutions:
+            self.assertAlmostEqual(numpy.dot(self.v, x), obj)
+            self.assertTrue((numpy.dot(self.w, x) <= self.w.sum(1)/2 + 1e-9).all())
+            self.assertTrue(min(abs(self.objs - obj)) < 1e-9)
+        self.assertEqual(len(pool.seen), len(pool))
+
+    def test_add(self):
+        pool = SolutionPool(self.lp, k=2)
+        x = numpy.zeros(12)
+        self.assertTrue(pool.add(1.0, x))
+        self.assertFalse(pool.add(1.0, x + 1e-7))
+        self.assertTrue(pool.add(3.0, x + numpy.eye(12)[0]))
+        self.assertEqual(pool.worst(), -1.0)
+        self.assertTrue(pool.add(2.0, x + numpy.eye(12)[1]))
+        self.assertEqual([obj for obj, y in pool.solutions()], [3.0, 2.0])
+        # neither the evicted nor a rejected solution is remembered
+        self.assertFalse(pool.add(0.5, x + numpy.eye(12)[2]))
+        self.assertEqual(len(pool.seen), 2)
+        self.assertFalse(pool.add(1.0, x))
+
+    def test_incumbents(self):
+        pool = SolutionPool(self.lp, k=5)
+        self.assertEqual(intopt(self.lp, quiet_iocp(), [pool]), 0)
+        self.check(pool)
+
+    def test_fill(self):
+        # GLPK's own heuristics may still prune some of the k best solutions
+        pool = SolutionPool(self.lp, k=5, fill=True)
+        self.assertEqual(intopt(self.lp, quiet_iocp(), [pool]), 0)
+        self.check(pool)
+        self.assertEqual(glp_get_num_rows(self.lp), 2)
+
+    def test_fill_requires_binary(self):
+        glp_set_col_kind(self.lp, 1, GLP_IV)
+        glp_set_col_bnds(self.lp, 1, GLP_DB, 0.0, 2.0)
+        self.assertRaises(ValueError, SolutionPool, self.lp, fill=True)
+
+if numpy is None:
+    del SolutionPoolTest
+
+if __name__ == '__main__':
+    unittest.main()
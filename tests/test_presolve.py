@@ -0,0 +1,107 @@
+# Round trip of presolve() and Postsolve.restore() against glp_simplex
+#
+# usage: python -m unittest discover -s tests
+
+import os, sys, unittest
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from ctypes import *
+from glpk import *
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+def build(x1_ub=None):
+    # the problem of sample.py with a fixed column x4, an empty row and,
+    # if x1_ub is given, the singleton row 2 x1 <= 2 x1_ub; x1 is integer
+    lp = glp_create_prob()
+    glp_set_obj_dir(lp, GLP_MAX)
+    glp_add_rows(lp, 5)
+    glp_add_cols(lp, 4)
+    for i, ub in enumerate((101.0, 600.0, 300.0)):
+        glp_set_row_bnds(lp, i+1, GLP_UP, 0.0, ub)
+    glp_set_row_bnds(lp, 4, GLP_UP, 0.0, x1_ub is None and 1e6 or 2*x1_ub)
+    glp_set_row_bnds(lp, 5, GLP_UP, 0.0, 5.0)
+    for j, c in enumerate((10.0, 6.0, 4.0, 3.0)):
+        glp_set_col_bnds(lp, j+1, GLP_LO, 0.0, 0.0)
+        glp_set_obj_coef(lp, j+1, c)
+    glp_set_col_bnds(lp, 4, GLP_FX, 1.0, 1.0)
+    glp_set_col_kind(lp, 1, GLP_IV)
+    rows = [[(1, 1.0), (2, 1.0), (3, 1.0), (4, 1.0)],
+        [(1, 10.0), (2, 4.0), (3, 5.0)],
+        [(1, 2.0), (2, 2.0), (3, 6.0)],
+        [(1, 2.0)]]
+    for i, row in enumerate(rows):
+        ind = (c_int * (len(row)+1))(0, *[j for j, v in row])
+        val = (c_double * (len(row)+1))(0.0, *[v for j, v in row])
+        glp_set_mat_row(lp, i+1, len(row), ind, val)
+    return lp
+
+def solve(lp):
+    smcp = glp_smcp()
+    glp_init_smcp(smcp)
+    smcp.msg_lev = GLP_MSG_OFF
+    assert glp_simplex(lp, smcp) == 0 and glp_get_status(lp) == GLP_OPT
+    m, n = glp_get_num_rows(lp), glp_get_num_cols(lp)
+    x = numpy.array([glp_get_col_prim(lp, j) for j in range(1, n+1)])
+    y = numpy.array([glp_get_row_dual(lp, i) for i in range(1, m+1)])
+    return glp_get_obj_val(lp), x, y
+
+
+class PresolveRoundTrip(unittest.TestCase):
+
+    def check(self, x1_ub, x, y):
+        lp = build(x1_ub)
+        obj, x0, y0 = solve(lp)
+        numpy.testing.assert_allclose(x0, x, atol=1e-7)
+        numpy.testing.assert_allclose(y0, y, atol=1e-7)
+
+        reduced, post = presolve(ProblemData.from_prob(lp))
+        self.assertTrue(glp_get_num_rows(reduced) < 5)
+        obj_r = solve(reduced)[0]
+        self.assertAlmostEqual(obj_r, obj)
+        X, Y, S = post.solution(reduced)
+        numpy.testing.assert_allclose(X, x0, atol=1e-7)
+        numpy.testing.assert_allclose(Y, y0, atol=1e-7)
+        self.assertEqual((S == GLP_BS).sum(), 5)
+
+        # the restored basis is optimal for the original problem
+        fresh = build(x1_ub)
+        post.warm_start(fresh, S)
+        obj_w, x_w, y_w = solve(fresh)
+        self.assertAlmostEqual(obj_w, obj)
+        numpy.testing.assert_allclose(x_w, x0, atol=1e-7)
+        for p in (lp, reduced, fresh):
+            glp_delete_prob(p)
+
+    def test_inactive_singleton(self):
+        # x = (100/3, 200/3, 0, 1), the integer x1 is not rounded
+        self.check(None, [100/3.0, 200/3.0, 0.0, 1.0], [10/3.0, 2/3.0, 0.0, 0.0, 0.0])
+
+    def test_active_singleton(self):
+        # x1 <= 20 binds, its row takes over the reduced cost of x1
+        self.check(20.0, [20.0, 80.0, 0.0, 1.0], [6.0, 0.0, 0.0, 2.0, 0.0])
+
+    def test_mip_rounding(self):
+        # with mip=True the singleton bound x1 <= 20.5 is rounded to 20,
+        # which is no bound of the original problem: x1 is reported basic
+        # and the row of the singleton basic as well
+        lp = build(20.5)
+        reduced, post = presolve(ProblemData.from_prob(lp), mip=True)
+        solve(reduced)
+        X, Y, S = post.solution(reduced)
+        self.assertAlmostEqual(X[0], 20.0)
+        self.assertEqual(S[3], GLP_BS)
+        self.assertEqual(S[5], GLP_BS)
+        reduced_lp, post = presolve(ProblemData.from_prob(lp))
+        solve(reduced_lp)
+        self.assertAlmostEqual(post.solution(reduced_lp)[0][0], 20.5)
+        for p in (lp, reduced, reduced_lp):
+            glp_delete_prob(p)
+
+if numpy is None:
+    del PresolveRoundTrip
+
+if __name__ == '__main__':
+    unittest.main()
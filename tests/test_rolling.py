@@ -0,0 +1,85 @@
+# RollingHorizon windows against the same windows built from scratch
+#
+# usage: python -m unittest discover -s tests
+
+import os, sys, unittest
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from ctypes import *
+from glpk import *
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# lot sizing: in period t, production p_t in [0, CAP] at cost COST[t] and
+# stock s_t at cost HOLD balance s_t-1 + p_t - s_t = DEMAND[t]; the first
+# period of a window starts without stock
+COST = [1.0, 3.0, 2.0, 4.0, 1.0, 5.0, 2.0, 3.0]
+CAP, HOLD = 10.0, 0.5
+DEMAND = [6.0, 7.0, 5.0, 8.0, 4.5, 9.0, 6.0, 3.0]
+WINDOW = 3
+
+def add_period(rh, t, kind):
+    # columns p_t, s_t and the balance row of period t
+    p, s = rh.add_cols(t, 2, [COST[t], HOLD], 0.0, [CAP, float('inf')], [kind, GLP_CV])
+    prev = rh.cols(t-1)
+    if len(prev):
+        cols, data = [prev[1], p, s], [1.0, 1.0, -1.0]
+    else:
+        cols, data = [p, s], [1.0, -1.0]
+    rh.add_rows(t, [0, len(cols)], cols, data, DEMAND[t], DEMAND[t])
+
+def quiet_iocp():
+    parm = glp_iocp()
+    glp_init_iocp(parm)
+    parm.msg_lev = GLP_MSG_OFF
+    return parm
+
+
+class RollingHorizonTest(unittest.TestCase):
+
+    def window(self, first, kind, iocp):
+        # optimum of periods first..first+WINDOW-1 in a problem of their own
+        rh = RollingHorizon()
+        try:
+            for t in range(first, first + WINDOW):
+                add_period(rh, t, kind)
+            self.assertEqual(rh.solve(iocp), 0)
+            return glp_mip_obj_val(rh.lp) if iocp else glp_get_obj_val(rh.lp)
+        finally:
+            glp_delete_prob(rh.lp)
+
+    def roll(self, kind=GLP_CV, iocp=None):
+        rh = RollingHorizon()
+        try:
+            for t in range(WINDOW):
+                add_period(rh, t, kind)
+            for first in range(len(COST) - WINDOW + 1):
+                if first:
+                    row_remap, col_remap = rh.expire(first - 1)
+                    self.assertEqual(row_remap.tolist(), [0, 0, 1, 2])
+                    self.assertEqual(col_remap.tolist(), [0, 0, 0, 1, 2, 3, 4])
+                    add_period(rh, first + WINDOW - 1, kind)
+                self.assertEqual(rh.rows(first).tolist(), [1])
+                self.assertEqual(rh.cols(first + WINDOW - 1).tolist(), [5, 6])
+                self.assertEqual(rh.solve(iocp), 0)
+                obj = glp_mip_obj_val(rh.lp) if iocp else glp_get_obj_val(rh.lp)
+                self.assertAlmostEqual(obj, self.window(first, kind, iocp))
+            self.assertEqual(rh.solves, len(COST) - WINDOW + 1)
+            return rh
+        finally:
+            glp_delete_prob(rh.lp)
+
+    def test_lp(self):
+        rh = self.roll()
+        self.assertEqual(rh.cold_starts, 0)
+
+    def test_mip(self):
+        self.roll(GLP_IV, quiet_iocp())
+
+if numpy is None:
+    del RollingHorizonTest
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+# RowStream appending rows in chunks, read back with glp_get_mat_row
+#
+# usage: python -m unittest discover -s tests
+
+import os, sys, unittest
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from ctypes import *
+from glpk import *
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+BOUNDS = [((None, 5.0), GLP_UP), ((1.0, 1.0), GLP_FX), ((None, None), GLP_FR),
+    ((0.0, float('inf')), GLP_LO), ((1.0, 2.0), GLP_DB)]
+
+def rows(count, n):
+    # row r has the columns r % n + 1, ..., n with coefficients r + j
+    for r in range(count):
+        cols = range(r % n + 1, n+1)
+        yield BOUNDS[r % len(BOUNDS)][0], cols, [float(r + j) for j in cols]
+
+
+class RowStreamTest(unittest.TestCase):
+
+    def setUp(self):
+        self.lp = glp_create_prob()
+        glp_add_cols(self.lp, 6)
+        glp_add_rows(self.lp, 1)
+
+    def tearDown(self):
+        glp_delete_prob(self.lp)
+
+    def check(self, count):
+        ind = (c_int * 7)()
+        val = (c_double * 7)()
+        self.assertEqual(glp_get_num_rows(self.lp), count + 1)
+        self.assertEqual(glp_get_mat_row(self.lp, 1, ind, val), 0)
+        for r, (bounds, cols, values) in enumerate(rows(count, 6)):
+            i = r + 2
+            k = glp_get_mat_row(self.lp, i, ind, val)
+            self.assertEqual(sorted(zip(ind[1:k+1], val[1:k+1])), zip(cols, values))
+            lb, ub = bounds
+            self.assertEqual(glp_get_row_type(self.lp, i), BOUNDS[r % len(BOUNDS)][1])
+            if lb is not None and lb != -float('inf'):
+                self.assertEqual(glp_get_row_lb(self.lp, i), lb)
+            if ub is not None and ub != float('inf'):
+                self.assertEqual(glp_get_row_ub(self.lp, i), ub)
+
+    def test_extend(self):
+        # three full chunks and a partial one, the buffers growing past the
+        # nz_hint of one entry per row
+        stream = RowStream(self.lp, chunk_size=3, nz_hint=1)
+        self.assertEqual(stream.extend(rows(11, 6)), 11)
+        self.check(11)
+
+    def test_append(self):
+        stream = RowStream(self.lp, chunk_size=4)
+        for row in rows(6, 6):
+            stream.append(*row)
+        self.assertEqual((stream.added, stream.count), (4, 2))
+        self.assertEqual(glp_get_num_rows(self.lp), 5)
+        stream.flush()
+        stream.flush()
+        self.check(6)
+
+if numpy is None:
+    del RowStreamTest
+
+if __name__ == '__main__':
+    unittest.main()
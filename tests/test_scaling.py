@@ -0,0 +1,88 @@
+# scale_factors() and scale() on a badly scaled rank-one matrix
+#
+# usage: python -m unittest discover -s tests
+
+import os, sys, unittest
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from ctypes import *
+from glpk import *
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# a_ij = U_i V_j, spanning twelve orders of magnitude, so that it is
+# perfectly scaled by r_i = 1/U_i, s_j = 1/V_j
+U = [1e-3, 1.0, 1e3]
+V = [1e-3, 1e-1, 1e1, 1e3]
+
+def problem():
+    # minimize sum_j x_j subject to A x >= U*10, x >= 0
+    lp = glp_create_prob()
+    glp_add_rows(lp, len(U))
+    glp_add_cols(lp, len(V))
+    for i, u in enumerate(U):
+        glp_set_row_bnds(lp, i+1, GLP_LO, 10.0*u, 0.0)
+    ind = (c_int * (len(U)+1))(0, *range(1, len(U)+1))
+    for j, v in enumerate(V):
+        glp_set_col_bnds(lp, j+1, GLP_LO, 0.0, 0.0)
+        glp_set_obj_coef(lp, j+1, 1.0)
+        glp_set_mat_col(lp, j+1, len(U), ind, (c_double * (len(U)+1))(0.0, *[u*v for u in U]))
+    return lp
+
+def csc():
+    a = numpy.outer(U, V)
+    return numpy.arange(len(V)+1)*len(U), numpy.tile(numpy.arange(len(U)), len(V)), a.T.ravel()
+
+
+class ScalingTest(unittest.TestCase):
+
+    def test_stats(self):
+        stats = scaling_stats(*(csc() + (len(U),)))
+        self.assertAlmostEqual(stats.ratio, 1e12, delta=1e-3*1e12)
+        self.assertAlmostEqual(stats.row_ratio, 1e6, delta=1e-3*1e6)
+        self.assertAlmostEqual(stats.col_ratio, 1e6, delta=1e-3*1e6)
+
+    def test_factors(self):
+        indptr, rows, data = csc()
+        for method in ('gm', 'eq', 'cr'):
+            r, s = scale_factors(indptr, rows, data, len(U), method, round2=False)
+            stats = scaling_stats(indptr, rows, data, len(U), r, s)
+            self.assertAlmostEqual(stats.ratio, 1.0, 6, method)
+            r, s = scale_factors(indptr, rows, data, len(U), method)
+            numpy.testing.assert_array_equal(numpy.log2(r), numpy.round(numpy.log2(r)))
+            numpy.testing.assert_array_equal(numpy.log2(s), numpy.round(numpy.log2(s)))
+            # factors rounded to powers of two are each off by at most sqrt(2)
+            self.assertTrue(scaling_stats(indptr, rows, data, len(U), r, s).ratio <= 4.0)
+        self.assertRaises(ValueError, scale_factors, indptr, rows, data, len(U), 'xx')
+
+    def test_scale(self):
+        smcp = glp_smcp()
+        glp_init_smcp(smcp)
+        smcp.msg_lev = GLP_MSG_OFF
+        lp = problem()
+        try:
+            glp_simplex(lp, smcp)
+            obj = glp_get_obj_val(lp)
+            glp_unscale_prob(lp)
+            before, after = scale(lp, 'cr')
+            self.assertAlmostEqual(before.ratio, 1e12, delta=1e-3*1e12)
+            self.assertTrue(after.ratio <= 4.0)
+            r = numpy.array([glp_get_rii(lp, i) for i in range(1, len(U)+1)])
+            s = numpy.array([glp_get_sjj(lp, j) for j in range(1, len(V)+1)])
+            scaled = numpy.outer(r*U, s*V)
+            self.assertTrue((scaled >= 0.25).all() and (scaled <= 4.0).all())
+            glp_adv_basis(lp, 0)
+            self.assertEqual(glp_simplex(lp, smcp), 0)
+            self.assertAlmostEqual(glp_get_obj_val(lp), obj)
+            # the factors in place are those reported as before
+            self.assertEqual(scale(lp, 'cr', data=ProblemData.from_prob(lp))[0], after)
+        finally:
+            glp_delete_prob(lp)
+
+if numpy is None:
+    del ScalingTest
+
+if __name__ == '__main__':
+    unittest.main()
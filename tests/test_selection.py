@@ -0,0 +1,95 @@
+# NodeSelection against glp_intopt on random knapsack problems
+#
+# usage: python -m unittest discover -s tests
+
+import os, sys, unittest
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from ctypes import *
+from glpk import *
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+def knapsack(n, seed, m=2):
+    # maximize v'x subject to W x <= W 1/2, x binary, with m random rows W;
+    # the LP relaxation is solved
+    rng = numpy.random.RandomState(seed)
+    w = rng.randint(10, 60, (m, n)).astype(float)
+    v = w.mean(0) + rng.randint(0, 20, n)
+    lp = glp_create_prob()
+    glp_set_obj_dir(lp, GLP_MAX)
+    glp_add_rows(lp, m)
+    glp_add_cols(lp, n)
+    for j in range(n):
+        glp_set_col_kind(lp, j+1, GLP_BV)
+        glp_set_obj_coef(lp, j+1, v[j])
+    ind = (c_int * (n+1))(0, *range(1, n+1))
+    for i in range(m):
+        glp_set_row_bnds(lp, i+1, GLP_UP, 0.0, w[i].sum()/2)
+        glp_set_mat_row(lp, i+1, n, ind, (c_double * (n+1))(0.0, *w[i]))
+    smcp = glp_smcp()
+    glp_init_smcp(smcp)
+    smcp.msg_lev = GLP_MSG_OFF
+    glp_simplex(lp, smcp)
+    return lp
+
+def quiet_iocp():
+    parm = glp_iocp()
+    glp_init_iocp(parm)
+    parm.msg_lev = GLP_MSG_OFF
+    return parm
+
+def reference(lp):
+    copy = glp_create_prob()
+    try:
+        glp_copy_prob(copy, lp, GLP_OFF)
+        parm = quiet_iocp()
+        parm.presolve = GLP_ON
+        assert glp_intopt(copy, parm) == 0 and glp_mip_status(copy) == GLP_OPT
+        return glp_mip_obj_val(copy)
+    finally:
+        glp_delete_prob(copy)
+
+
+class NodeSelectionTest(unittest.TestCase):
+
+    def check(self, seed, pseudo_costs=False, **kw):
+        lp = knapsack(25, seed)
+        try:
+            obj = reference(lp)
+            plugins = []
+            if pseudo_costs:
+                plugins.append(PseudoCostBranching(lp, strong_depth=1))
+            selection = NodeSelection(lp, plugins and plugins[0] or None, **kw)
+            plugins.append(selection)
+            self.assertEqual(intopt(lp, quiet_iocp(), plugins), 0)
+            self.assertEqual(glp_mip_status(lp), GLP_OPT)
+            self.assertAlmostEqual(glp_mip_obj_val(lp), obj)
+            return selection
+        finally:
+            glp_delete_prob(lp)
+
+    def test_best_estimate(self):
+        for seed in range(3):
+            selection = self.check(seed, dive=0)
+            self.assertTrue(selection.rebuilds >= 1)
+            self.assertTrue(len(selection.estimate) > 0)
+
+    def test_diving(self):
+        for seed in range(3):
+            self.check(seed)
+
+    def test_pseudo_costs(self):
+        for seed in range(3):
+            self.check(seed, pseudo_costs=True)
+
+    def test_max_active(self):
+        self.check(0, dive=0, max_active=2)
+
+if numpy is None:
+    del NodeSelectionTest
+
+if __name__ == '__main__':
+    unittest.main()
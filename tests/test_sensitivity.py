@@ -0,0 +1,83 @@
+# sensitivity() on the problem of sample.py, against ranges worked out by hand
+#
+# usage: python -m unittest discover -s tests
+
+import os, sys, unittest
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from ctypes import *
+from glpk import *
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+inf = float('inf')
+nan = float('nan')
+
+def build():
+    # maximize 10 x1 + 6 x2 + 4 x3 subject to
+    #   p: x1 + x2 + x3 <= 100, q: 10 x1 + 4 x2 + 5 x3 <= 600,
+    #   r: 2 x1 + 2 x2 + 6 x3 <= 300, x >= 0
+    # optimum x = (100/3, 200/3, 0), p and q active, r basic
+    lp = glp_create_prob()
+    glp_set_obj_dir(lp, GLP_MAX)
+    glp_add_rows(lp, 3)
+    glp_add_cols(lp, 3)
+    for i, ub in enumerate((100.0, 600.0, 300.0)):
+        glp_set_row_bnds(lp, i+1, GLP_UP, 0.0, ub)
+    for j, c in enumerate((10.0, 6.0, 4.0)):
+        glp_set_col_bnds(lp, j+1, GLP_LO, 0.0, 0.0)
+        glp_set_obj_coef(lp, j+1, c)
+    ia = (c_int * 10)(0, 1, 1, 1, 2, 2, 2, 3, 3, 3)
+    ja = (c_int * 10)(0, 1, 2, 3, 1, 2, 3, 1, 2, 3)
+    ar = (c_double * 10)(0, 1, 1, 1, 10, 4, 5, 2, 2, 6)
+    glp_load_matrix(lp, 9, ia, ja, ar)
+    smcp = glp_smcp()
+    glp_init_smcp(smcp)
+    smcp.msg_lev = GLP_MSG_OFF
+    glp_simplex(lp, smcp)
+    return lp
+
+
+class SensitivityRanging(unittest.TestCase):
+
+    def setUp(self):
+        self.lp = build()
+
+    def tearDown(self):
+        glp_delete_prob(self.lp)
+
+    def check(self, s):
+        # the basis stays optimal while c1 in [6, 15] and c2 in [4, 10];
+        # x3 enters once its cost exceeds 4 - d3 = 20/3
+        numpy.testing.assert_allclose(s.cost_lo, [6.0, 4.0, -inf])
+        numpy.testing.assert_allclose(s.cost_hi, [15.0, 10.0, 20/3.0])
+        # p may move in [60, 150] (x2, then x1 and r reach a bound), q in
+        # [400, 1000] (x1, then x2), r is basic
+        numpy.testing.assert_allclose(s.row_lo, [60.0, 400.0, nan])
+        numpy.testing.assert_allclose(s.row_hi, [150.0, 1000.0, nan])
+        # x3 may be raised to 25 before r is active; x1, x2 are basic
+        numpy.testing.assert_allclose(s.col_lo, [nan, nan, -inf])
+        numpy.testing.assert_allclose(s.col_hi, [nan, nan, 25.0])
+
+    def test_ranges(self):
+        self.check(sensitivity(self.lp))
+
+    def test_processes(self):
+        self.check(sensitivity(self.lp, processes=2))
+
+    def test_not_optimal(self):
+        # p: x1 + x2 + x3 >= 1000 contradicts q
+        glp_set_row_bnds(self.lp, 1, GLP_LO, 1000.0, 0.0)
+        smcp = glp_smcp()
+        glp_init_smcp(smcp)
+        smcp.msg_lev = GLP_MSG_OFF
+        glp_simplex(self.lp, smcp)
+        self.assertRaises(RuntimeError, sensitivity, self.lp)
+
+if numpy is None:
+    del SensitivityRanging
+
+if __name__ == '__main__':
+    unittest.main()
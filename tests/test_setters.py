@@ -0,0 +1,69 @@
+# Batched setters against the per-element GLPK getters
+#
+# usage: python -m unittest discover -s tests
+
+import os, sys, unittest
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from ctypes import *
+from glpk import *
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+inf = float('inf')
+
+def bounds(t, lb, ub):
+    # (type, lb, ub) with None for the bounds the type does not have, whose
+    # value depends on the GLPK version
+    return (t, lb if t in (GLP_LO, GLP_DB, GLP_FX) else None,
+        ub if t in (GLP_UP, GLP_DB, GLP_FX) else None)
+
+
+class BatchedSetters(unittest.TestCase):
+
+    def setUp(self):
+        self.lp = glp_create_prob()
+        glp_add_rows(self.lp, 5)
+        glp_add_cols(self.lp, 4)
+
+    def tearDown(self):
+        glp_delete_prob(self.lp)
+
+    def rows(self):
+        return [bounds(glp_get_row_type(self.lp, i), glp_get_row_lb(self.lp, i),
+            glp_get_row_ub(self.lp, i)) for i in range(1, 6)]
+
+    def test_row_bounds(self):
+        lb = numpy.array([-inf, 1.0, -inf, 0.0, 1.0])
+        ub = numpy.array([5.0, 1.0, inf, inf, 2.0])
+        set_row_bounds(self.lp, None, None, lb, ub)
+        self.assertEqual(self.rows(), [(GLP_UP, None, 5.0), (GLP_FX, 1.0, 1.0),
+            (GLP_FR, None, None), (GLP_LO, 0.0, None), (GLP_DB, 1.0, 2.0)])
+        # a subset, with explicit types and broadcast scalars
+        set_row_bounds(self.lp, [2, 4], GLP_DB, -1.0, [3.0, 4.0])
+        self.assertEqual(self.rows()[1:4:2], [(GLP_DB, -1.0, 3.0), (GLP_DB, -1.0, 4.0)])
+
+    def test_col_bounds(self):
+        set_col_bounds(self.lp, numpy.array([4, 1]), None, 0.0, [inf, 7.0])
+        self.assertEqual([bounds(glp_get_col_type(self.lp, j), glp_get_col_lb(self.lp, j),
+            glp_get_col_ub(self.lp, j)) for j in (1, 4)], [(GLP_DB, 0.0, 7.0), (GLP_LO, 0.0, None)])
+        self.assertRaises(ValueError, set_col_bounds, self.lp, [1, 2], None, 0.0, [1.0, 2.0, 3.0])
+
+    def test_kinds(self):
+        set_col_kinds(self.lp, None, [GLP_IV, GLP_CV, GLP_IV, GLP_CV])
+        self.assertEqual(glp_get_num_int(self.lp), 2)
+        set_col_kinds(self.lp, [2, 4], GLP_IV)
+        self.assertEqual([glp_get_col_kind(self.lp, j) for j in range(1, 5)], [GLP_IV]*4)
+
+    def test_objective(self):
+        set_objective(self.lp, None, numpy.arange(4.0), 2.5)
+        set_objective(self.lp, [3], -1.0)
+        self.assertEqual([glp_get_obj_coef(self.lp, j) for j in range(5)], [2.5, 0.0, 1.0, -1.0, 3.0])
+
+if numpy is None:
+    del BatchedSetters
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+# intopt_stream() events, early termination and errors
+#
+# usage: python -m unittest discover -s tests
+
+import os, sys, unittest
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from ctypes import *
+from glpk import *
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+def knapsack(n, seed, m=2):
+    # maximize v'x subject to W x <= W 1/2, x binary, with m random rows W;
+    # the LP relaxation is solved
+    rng = numpy.random.RandomState(seed)
+    w = rng.randint(10, 60, (m, n)).astype(float)
+    v = w.mean(0) + rng.randint(0, 20, n)
+    lp = glp_create_prob()
+    glp_set_obj_dir(lp, GLP_MAX)
+    glp_add_rows(lp, m)
+    glp_add_cols(lp, n)
+    for j in range(n):
+        glp_set_col_kind(lp, j+1, GLP_BV)
+        glp_set_obj_coef(lp, j+1, v[j])
+    ind = (c_int * (n+1))(0, *range(1, n+1))
+    for i in range(m):
+        glp_set_row_bnds(lp, i+1, GLP_UP, 0.0, w[i].sum()/2)
+        glp_set_mat_row(lp, i+1, n, ind, (c_double * (n+1))(0.0, *w[i]))
+    smcp = glp_smcp()
+    glp_init_smcp(smcp)
+    smcp.msg_lev = GLP_MSG_OFF
+    glp_simplex(lp, smcp)
+    return lp
+
+def quiet_iocp():
+    parm = glp_iocp()
+    glp_init_iocp(parm)
+    parm.msg_lev = GLP_MSG_OFF
+    return parm
+
+def reference(lp):
+    copy = glp_create_prob()
+    try:
+        glp_copy_prob(copy, lp, GLP_OFF)
+        parm = quiet_iocp()
+        parm.presolve = GLP_ON
+        assert glp_intopt(copy, parm) == 0 and glp_mip_status(copy) == GLP_OPT
+        return glp_mip_obj_val(copy)
+    finally:
+        glp_delete_prob(copy)
+
+
+class Failing(object):
+    reasons = (GLP_IBRANCH,)
+
+    def __call__(self, tree, reason):
+        raise KeyError('plug-in failure')
+
+
+class IntoptStream(unittest.TestCase):
+
+    def setUp(self):
+        self.lp = knapsack(30, 0)
+        self.v = numpy.array([glp_get_obj_coef(self.lp, j) for j in range(1, 31)])
+
+    def tearDown(self):
+        glp_delete_prob(self.lp)
+
+    def test_events(self):
+        obj = reference(self.lp)
+        events = list(intopt_stream(self.lp, quiet_iocp()))
+        self.assertTrue(len(events) >= 1)
+        objs = [e.obj for e in events]
+        self.assertEqual(objs, sorted(set(objs)))
+        for e in events:
+            self.assertAlmostEqual(numpy.dot(self.v, e.x), e.obj)
+            self.assertTrue(e.gap >= 0.0)
+        # the gap is the one at the time each incumbent was found
+        gaps = [e.gap for e in events]
+        self.assertEqual(gaps, sorted(gaps, reverse=True))
+        last = events[-1]
+        self.assertAlmostEqual(last.obj, obj)
+        self.assertEqual(glp_mip_status(self.lp), GLP_OPT)
+        x = numpy.array([glp_mip_col_val(self.lp, j) for j in range(1, 31)])
+        numpy.testing.assert_array_equal(last.x, x)
+
+    def test_break(self):
+        for event in intopt_stream(self.lp, quiet_iocp()):
+            break
+        self.assertTrue(glp_mip_status(self.lp) in (GLP_FEAS, GLP_OPT))
+        self.assertTrue(glp_mip_obj_val(self.lp) >= event.obj - 1e-9)
+
+    def test_error(self):
+        stream = intopt_stream(self.lp, quiet_iocp(), [Failing()])
+        self.assertRaises(KeyError, list, stream)
+
+if numpy is None:
+    del IntoptStream
+
+if __name__ == '__main__':
+    unittest.main()